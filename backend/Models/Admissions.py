@@ -0,0 +1,71 @@
+import enum
+from datetime import datetime
+from extensions import db
+from Models.Beds import Bed
+from Models.Users import User
+from Models.Wards import Ward
+
+
+class AdmissionEventTypeEnum(enum.Enum):
+    ADMIT = "ADMIT"
+    TRANSFER = "TRANSFER"
+    DISCHARGE = "DISCHARGE"
+
+
+class Admission(db.Model):
+    """
+    A patient's stay, open while discharged_at is NULL. ward_id/bed_id are
+    where the patient is now; the way there is kept in AdmissionEvent.
+    """
+    __tablename__ = 'admission'
+    __table_args__ = (
+        # a patient is admitted once at a time and a bed holds one patient
+        db.Index('uq_admission_patient_id_open', 'patient_id', unique=True,
+                 postgresql_where=db.text('discharged_at IS NULL')),
+        db.Index('uq_admission_bed_id_open', 'bed_id', unique=True,
+                 postgresql_where=db.text('discharged_at IS NULL')),
+        db.Index('ix_admission_ward_id_discharged_at', 'ward_id', 'discharged_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    patient_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    ward_id = db.Column(db.Integer, db.ForeignKey('ward.id'), nullable=False)
+    bed_id = db.Column(db.Integer, db.ForeignKey('bed.id'), nullable=True)
+    admitted_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    reason = db.Column(db.Text, nullable=True)
+    admitted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    discharged_at = db.Column(db.DateTime, nullable=True)
+
+    patient = db.relationship('User', foreign_keys=[patient_id], lazy=True)
+    ward = db.relationship('Ward', lazy=True)
+    bed = db.relationship('Bed', lazy=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    FILTER_FIELDS = ['patient_id', 'ward_id', 'bed_id']
+    SORT_FIELDS = ['id', 'admitted_at', 'discharged_at', 'created_at']
+    DATE_RANGE_FIELD = 'admitted_at'
+
+
+class AdmissionEvent(db.Model):
+    """
+    Append only history of admissions, transfers and discharges.
+    """
+    __tablename__ = 'admission_event'
+
+    id = db.Column(db.Integer, primary_key=True)
+    admission_id = db.Column(db.Integer, db.ForeignKey('admission.id', ondelete="CASCADE"), nullable=False, index=True)
+    event_type = db.Column(db.Enum(AdmissionEventTypeEnum), nullable=False)
+    from_ward_id = db.Column(db.Integer, db.ForeignKey('ward.id'), nullable=True)
+    to_ward_id = db.Column(db.Integer, db.ForeignKey('ward.id'), nullable=True)
+    from_bed_id = db.Column(db.Integer, db.ForeignKey('bed.id'), nullable=True)
+    to_bed_id = db.Column(db.Integer, db.ForeignKey('bed.id'), nullable=True)
+    performed_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    note = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    admission = db.relationship('Admission', backref=db.backref('events', order_by='AdmissionEvent.id'), lazy=True)
+
+    FILTER_FIELDS = ['admission_id', 'event_type']
+    SORT_FIELDS = ['id', 'created_at']
@@ -1,8 +1,14 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import DDL, event, func
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import validates
 from extensions import db
 from Models.Users import User
 
+DEFAULT_DURATION_MINUTES = 30
+MAX_DURATION_MINUTES = 8 * 60
+
+
 class Appointment(db.Model):
     __tablename__ = 'appointment'
     id = db.Column(db.Integer, primary_key=True)
@@ -10,15 +16,29 @@ class Appointment(db.Model):
     patient_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     doctor_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     appointment_date = db.Column(db.DateTime, nullable=False)
+    end_time = db.Column(db.DateTime, nullable=False)
     status = db.Column(db.String(50), default="Scheduled")
     notes = db.Column(db.Text, nullable=True)
 
     patient = db.relationship('User', foreign_keys=[patient_id], lazy=True)
     doctor = db.relationship('User', foreign_keys=[doctor_id], lazy=True)
 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # A doctor can not have two active appointments overlapping in time (needs btree_gist).
+    __table_args__ = (
+        ExcludeConstraint(
+            (doctor_id, '='),
+            (func.tsrange(appointment_date, end_time), '&&'),
+            name='ex_appointment_doctor_overlap',
+            using='gist',
+            where=db.text("status <> 'Cancelled'"),
+        ),
+        db.Index('ix_appointment_doctor_id_appointment_date', 'doctor_id', 'appointment_date'),
+        db.Index('ix_appointment_patient_id_appointment_date', 'patient_id', 'appointment_date'),
+    )
+
     @validates("status")
     def validate_status(self, key, value):
         allowed = ["Scheduled", "Completed", "Cancelled"]
@@ -26,10 +46,64 @@ class Appointment(db.Model):
             raise ValueError(f"{key} must be one of {allowed}")
         return value
 
+    @validates("appointment_date", "end_time")
+    def validate_datetime(self, key, value):
+        if isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(str(value))
+        except ValueError:
+            raise ValueError(f"{key} must be an ISO datetime")
+
     REQUIRED_FIELDS = ['patient_id', 'doctor_id', 'appointment_date']
+    FILTER_FIELDS = ['patient_id', 'doctor_id', 'status']
+    SORT_FIELDS = ['id', 'appointment_date', 'created_at']
+    DATE_RANGE_FIELD = 'appointment_date'
 
     def __init__(self, **kwargs):
         missing = [field for field in self.REQUIRED_FIELDS if not kwargs.get(field)]
         if missing:
             raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+        duration = kwargs.pop('duration_minutes', None)
         super().__init__(**kwargs)
+        if not self.end_time or duration:
+            self.set_duration(duration or DEFAULT_DURATION_MINUTES)
+        self.check_times()
+
+    def set_duration(self, minutes):
+        if not isinstance(minutes, int) or minutes < 1:
+            raise ValueError("duration_minutes must be a positive integer")
+        self.end_time = self.appointment_date + timedelta(minutes=minutes)
+
+    def check_times(self):
+        if self.end_time <= self.appointment_date:
+            raise ValueError("end_time must be after appointment_date")
+        if self.end_time - self.appointment_date > timedelta(minutes=MAX_DURATION_MINUTES):
+            raise ValueError(f"An appointment can not be longer than {MAX_DURATION_MINUTES} minutes")
+
+    def find_conflict(self):
+        """
+        Return an active appointment of the same doctor overlapping this one.
+        Appointments are at most MAX_DURATION_MINUTES long, so only a bounded
+        range of (doctor_id, appointment_date) has to be looked at.
+        """
+        if self.status == "Cancelled":
+            return None
+        query = Appointment.query.filter(
+            Appointment.doctor_id == self.doctor_id,
+            Appointment.status != "Cancelled",
+            Appointment.appointment_date < self.end_time,
+            Appointment.appointment_date > self.appointment_date - timedelta(minutes=MAX_DURATION_MINUTES),
+            Appointment.end_time > self.appointment_date,
+        )
+        if self.id:
+            query = query.filter(Appointment.id != self.id)
+        with db.session.no_autoflush:
+            return query.first()
+
+
+event.listen(
+    Appointment.__table__, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS btree_gist').execute_if(dialect='postgresql'),
+)
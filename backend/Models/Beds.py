@@ -0,0 +1,45 @@
+from datetime import datetime
+from sqlalchemy.orm import validates
+from extensions import db
+from Models.Wards import Ward
+
+
+class Bed(db.Model):
+    __tablename__ = 'bed'
+    __table_args__ = (
+        db.UniqueConstraint('ward_id', 'label', name='uq_bed_ward_id_label'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    ward_id = db.Column(db.Integer, db.ForeignKey('ward.id'), nullable=False)
+    label = db.Column(db.String(50), nullable=False)
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
+
+    ward = db.relationship('Ward', backref='beds', lazy=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    REQUIRED_FIELDS = ["ward_id", "label"]
+    FILTER_FIELDS = ['ward_id', 'is_active']
+    SORT_FIELDS = ['id', 'label', 'created_at']
+
+    @validates("label")
+    def validate_label(self, key, value):
+        if not value or not isinstance(value, str) or not value.strip():
+            raise ValueError(f"{key} must be a non-empty string")
+        return value.strip()
+
+    @validates("ward_id")
+    def validate_ward_id(self, key, value):
+        if not isinstance(value, int):
+            raise ValueError(f"{key} must be a number")
+        if not Ward.query.get(value):
+            raise ValueError("Ward not found")
+        return value
+
+    def __init__(self, **kwargs):
+        missing = [f for f in self.REQUIRED_FIELDS if f not in kwargs or kwargs[f] is None]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+        super().__init__(**kwargs)
@@ -46,6 +46,8 @@ class Department(db.Model):
         return value
 
     REQUIRED_FIELDS = ["name", "created_by"]
+    FILTER_FIELDS = ['name', 'created_by']
+    SORT_FIELDS = ['id', 'name', 'created_at']
 
     def __init__(self, **kwargs):
         missing = [field for field in self.REQUIRED_FIELDS if not kwargs.get(field)]
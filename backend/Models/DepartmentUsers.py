@@ -28,7 +28,7 @@ class DepartmentUser(db.Model):
         return value
 
     @validates('user_id')
-    def validate_department_id(self, key, value):
+    def validate_user_id(self, key, value):
         if not value or not isinstance(value, int):
             raise ValueError(f"{key} must be a number")
 
@@ -39,6 +39,8 @@ class DepartmentUser(db.Model):
         return value
 
     REQUIRED_FIELDS = ['department_id', 'user_id']
+    FILTER_FIELDS = ['department_id', 'user_id']
+    SORT_FIELDS = ['id', 'created_at']
 
     def __init__(self, **kwargs):
         missing_fields = [field for field in self.REQUIRED_FIELDS if field not in kwargs]
@@ -15,6 +15,8 @@ class Feedback(db.Model):
     user = db.relationship('User')
 
     REQUIRED_FIELDS = ['message', 'user_id']
+    FILTER_FIELDS = ['user_id', 'rating']
+    SORT_FIELDS = ['id', 'created_at']
 
     def __init__(self, **kwargs):
         missing = [field for field in self.REQUIRED_FIELDS if field not in kwargs]
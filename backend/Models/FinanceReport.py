@@ -5,15 +5,21 @@ from extensions import db
 
 class FinanceReport(db.Model):
     __tablename__ = 'finance_report'
+    __table_args__ = (
+        db.UniqueConstraint('period', 'report_date', name='uq_finance_report_period_report_date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     report_date = db.Column(db.DateTime, nullable=False)
     summary = db.Column(JSONB, nullable=False)  # {"total_invoices": ..., "total_amount": ...}
+    period = db.Column(db.String(10), nullable=True)  # day/month for generated reports, NULL when posted by hand
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     REQUIRED_FIELDS = ['report_date', 'summary']
+    FILTER_FIELDS = ['period']
+    SORT_FIELDS = ['id', 'report_date', 'created_at']
 
     def __init__(self, **kwargs):
         missing = [field for field in self.REQUIRED_FIELDS if field not in kwargs]
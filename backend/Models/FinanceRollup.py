@@ -0,0 +1,31 @@
+from datetime import datetime
+from extensions import db
+
+PERIODS = ('day', 'month')
+DIMENSIONS = ('all', 'status', 'creator', 'department')
+
+
+class FinanceRollup(db.Model):
+    """
+    Invoice count and total per day/month, overall and broken down by status,
+    creator and department. Kept up to date by Services/FinanceRollup.py as
+    invoices are written; dimension_key is '' for the 'all' dimension.
+    """
+    __tablename__ = 'finance_rollup'
+    __table_args__ = (
+        db.UniqueConstraint('period', 'period_start', 'dimension', 'dimension_key', name='uq_finance_rollup_bucket'),
+        db.Index('ix_finance_rollup_period_dimension_period_start', 'period', 'dimension', 'period_start'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    period = db.Column(db.String(10), nullable=False)
+    period_start = db.Column(db.Date, nullable=False)
+    dimension = db.Column(db.String(20), nullable=False)
+    dimension_key = db.Column(db.String(50), nullable=False, default='')
+    invoice_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    FILTER_FIELDS = ['period', 'dimension', 'dimension_key']
+    SORT_FIELDS = ['id', 'period_start']
+    DATE_RANGE_FIELD = 'period_start'
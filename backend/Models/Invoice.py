@@ -1,6 +1,8 @@
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import validates
 from extensions import db
+from Models.Department import Department
 from Models.Orders import Orders
 from Models.Users import User
 
@@ -9,18 +11,39 @@ class Invoice(db.Model):
     __tablename__ = 'invoice'
 
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
     total_amount = db.Column(db.Float, nullable=False)
     status = db.Column(db.String(50), default="pending")
 
     created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # creator's department when the invoice was raised, for the finance rollups
+    department_id = db.Column(db.Integer, db.ForeignKey('department.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     order = db.relationship('Orders', foreign_keys=[order_id])
     creator = db.relationship('User', foreign_keys=[created_by])
 
     REQUIRED_FIELDS = ['order_id', 'total_amount', 'created_by']
+    FILTER_FIELDS = ['order_id', 'status', 'created_by', 'department_id']
+    SORT_FIELDS = ['id', 'total_amount', 'created_at']
+
+    # the finance rollups bucket invoices by created_at and add up total_amount
+    @validates("created_at")
+    def validate_created_at(self, key, value):
+        if value is None or isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(str(value))
+        except ValueError:
+            raise ValueError(f"{key} must be an ISO datetime")
+
+    @validates("total_amount")
+    def validate_total_amount(self, key, value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{key} must be a number")
 
     def __init__(self, **kwargs):
         missing = [field for field in self.REQUIRED_FIELDS if field not in kwargs]
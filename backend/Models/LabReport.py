@@ -7,7 +7,7 @@ class LabReport(db.Model):
     __tablename__ = 'lab_report'
 
     id = db.Column(db.Integer, primary_key=True)
-    request_id = db.Column(db.Integer, db.ForeignKey('lab_request.id'), nullable=False)
+    request_id = db.Column(db.Integer, db.ForeignKey('lab_request.id'), nullable=False, index=True)
     report_data = db.Column(db.JSON, nullable=False)
     reported_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
@@ -17,6 +17,8 @@ class LabReport(db.Model):
     lab_request = db.relationship('LabRequest', foreign_keys=[request_id])
 
     REQUIRED_FIELDS = ['request_id', 'report_data', 'reported_by']
+    FILTER_FIELDS = ['request_id', 'reported_by']
+    SORT_FIELDS = ['id', 'created_at']
 
     def __init__(self, **kwargs):
         missing = [field for field in self.REQUIRED_FIELDS if not kwargs.get(field)]
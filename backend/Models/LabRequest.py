@@ -3,17 +3,27 @@ from extensions import db
 from Models.Users import User
 from Models.LabTest import LabTest
 
+PENDING = "pending"
+IN_PROGRESS = "in_progress"
 
 class LabRequest(db.Model):
     __tablename__ = 'lab_request'
+    __table_args__ = (
+        # the worklist queue: only pending rows, in arrival order
+        db.Index('ix_lab_request_pending', 'created_at', 'id', postgresql_where=db.text("status = 'pending'")),
+        db.Index('ix_lab_request_claimed_by_status', 'claimed_by', 'status'),
+        db.Index('ix_lab_request_patient_id_created_at', 'patient_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     patient_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     test_id = db.Column(db.Integer, db.ForeignKey('lab_test.id'), nullable=False)
     requested_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # doctor/staff
-    status = db.Column(db.String(50), nullable=False, default="pending")
+    status = db.Column(db.String(50), nullable=False, default=PENDING)
+    claimed_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)  # lab technician
+    claimed_at = db.Column(db.DateTime, nullable=True)
 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     patient = db.relationship('User', foreign_keys=[patient_id])
@@ -21,6 +31,8 @@ class LabRequest(db.Model):
     requester = db.relationship('User', foreign_keys=[requested_by])
 
     REQUIRED_FIELDS = ['patient_id', 'test_id', 'requested_by']
+    FILTER_FIELDS = ['patient_id', 'test_id', 'requested_by', 'status', 'claimed_by']
+    SORT_FIELDS = ['id', 'created_at']
 
     def __init__(self, **kwargs):
         missing = [field for field in self.REQUIRED_FIELDS if not kwargs.get(field)]
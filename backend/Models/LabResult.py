@@ -0,0 +1,30 @@
+from extensions import db
+from Models.LabReport import LabReport
+
+
+class LabResult(db.Model):
+    """
+    One analyte of a lab report, extracted from report_data["data"] so results
+    can be queried per patient and analyte. Rebuilt whenever the report changes.
+    """
+    __tablename__ = 'lab_result'
+    __table_args__ = (
+        # patient trends: one index range scan per (patient, analyte)
+        db.Index('ix_lab_result_patient_id_analyte_observed_at', 'patient_id', 'analyte', 'observed_at',
+                 postgresql_include=['value_numeric', 'value_text', 'unit']),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    report_id = db.Column(db.Integer, db.ForeignKey('lab_report.id', ondelete="CASCADE"), nullable=False, index=True)
+    patient_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    test_id = db.Column(db.Integer, db.ForeignKey('lab_test.id'), nullable=False)
+    analyte = db.Column(db.String(100), nullable=False)  # normalized key, e.g. "creatinine"
+    name = db.Column(db.String(100), nullable=False)  # key as written in the report
+    value_numeric = db.Column(db.Float, nullable=True)
+    value_text = db.Column(db.String(255), nullable=True)
+    unit = db.Column(db.String(50), nullable=True)
+    observed_at = db.Column(db.DateTime, nullable=False)
+
+    FILTER_FIELDS = ['report_id', 'patient_id', 'test_id', 'analyte']
+    SORT_FIELDS = ['id', 'observed_at']
+    DATE_RANGE_FIELD = 'observed_at'
@@ -18,6 +18,8 @@ class LabTest(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     REQUIRED_FIELDS = ['name', 'price']
+    FILTER_FIELDS = ['name', 'is_available']
+    SORT_FIELDS = ['id', 'name', 'price', 'created_at']
 
     @validates('name')
     def validate_name(self, key, name):
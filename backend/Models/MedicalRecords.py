@@ -7,15 +7,21 @@ from Models.Users import User  # <<< Add this import!
 
 class MedicalRecords(db.Model):
     __tablename__ = 'medical_records'
+    __table_args__ = (
+        db.Index('ix_medical_records_user_id_created_at', 'user_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     notes = db.Column(db.String(100), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     user = db.relationship('User', backref='medical_records', lazy=True)
 
+    FILTER_FIELDS = ['user_id']
+    SORT_FIELDS = ['id', 'created_at']
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -14,6 +14,8 @@ class Medicine(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     REQUIRED_FIELDS = ['name']
+    FILTER_FIELDS = ['name', 'manufacturer']
+    SORT_FIELDS = ['id', 'name', 'created_at']
 
     @validates('name')
     def validate_name(self, key, value):
@@ -0,0 +1,20 @@
+from datetime import datetime
+from extensions import db
+from Models.Medicine import Medicine
+
+
+class MedicineBalance(db.Model):
+    """
+    On hand quantity per medicine, kept up to date from the stock movements.
+    """
+    __tablename__ = 'medicine_balance'
+
+    id = db.Column(db.Integer, primary_key=True)
+    medicine_id = db.Column(db.Integer, db.ForeignKey('medicine.id', ondelete="CASCADE"), nullable=False, unique=True)
+    on_hand = db.Column(db.Integer, nullable=False, default=0, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+    medicine = db.relationship('Medicine', lazy=True)
+
+    FILTER_FIELDS = ['medicine_id']
+    SORT_FIELDS = ['id', 'medicine_id', 'on_hand', 'updated_at']
@@ -1,23 +1,54 @@
 from datetime import datetime
+
+from sqlalchemy.orm import validates
+
 from extensions import db
 from Models.Medicine import Medicine
 
 
 class MedicineStock(db.Model):
     __tablename__ = 'medicine_stock'
+    __table_args__ = (
+        db.Index('ix_medicine_stock_medicine_id_expiry_date', 'medicine_id', 'expiry_date'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     medicine_id = db.Column(db.Integer, db.ForeignKey('medicine.id'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
     batch_no = db.Column(db.String(50), nullable=False)
-    expiry_date = db.Column(db.Date, nullable=False)
+    expiry_date = db.Column(db.Date, nullable=False, index=True)
     price = db.Column(db.Float, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     medicine = db.relationship('Medicine', backref='stocks', lazy=True)
 
     REQUIRED_FIELDS = ['medicine_id', 'quantity', 'batch_no', 'expiry_date', 'price']
+    FILTER_FIELDS = ['medicine_id', 'batch_no']
+    SORT_FIELDS = ['id', 'expiry_date', 'created_at']
+
+    @staticmethod
+    def _integer(key, value):
+        # the ledger does arithmetic on these, so "5" from a form is turned into 5 here
+        if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+            value = int(value)
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f"{key} must be a number")
+        return value
+
+    @validates("quantity")
+    def validate_quantity(self, key, value):
+        value = self._integer(key, value)
+        if value < 0:
+            raise ValueError(f"{key} can not be negative")
+        return value
+
+    @validates("medicine_id")
+    def validate_medicine_id(self, key, value):
+        value = self._integer(key, value)
+        if not Medicine.query.get(value):
+            raise ValueError(f"Medicine ID {value} not found")
+        return value
 
     def __init__(self, **kwargs):
         missing = [f for f in self.REQUIRED_FIELDS if f not in kwargs or kwargs[f] is None]
@@ -7,18 +7,24 @@ from Models.Users import User  # <<< Add this import!
 
 class Orders(db.Model):
     __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('ix_orders_user_id_created_at', 'user_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     received_date = db.Column(db.Date, nullable=True)
     taken_by = db.Column(db.String(50), nullable=True)
     taken_by_phone_no = db.Column(db.String(50), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     user = db.relationship('User', backref='orders', lazy=True)
     items = db.relationship('PurchaseOrder', back_populates='order', cascade="all, delete-orphan")
 
+    FILTER_FIELDS = ['user_id']
+    SORT_FIELDS = ['id', 'received_date', 'created_at']
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
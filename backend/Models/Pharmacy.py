@@ -10,6 +10,9 @@ class Pharmacy(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    FILTER_FIELDS = ['name']
+    SORT_FIELDS = ['id', 'name', 'created_at']
+
     @validates("name")
     def validate_name(self, key, value):
         if not value or not isinstance(value, str) or not value.strip():
@@ -21,6 +21,8 @@ class PurchaseOrder(db.Model):
     medicine = db.relationship('Medicine', backref='purchase_orders', lazy=True)
 
     REQUIRED_FIELDS = ['medicine_id', 'quantity', 'order_date']
+    FILTER_FIELDS = ['order_id', 'medicine_id']
+    SORT_FIELDS = ['id', 'order_date', 'created_at']
 
     def __init__(self, **kwargs):
         missing = [f for f in self.REQUIRED_FIELDS if f not in kwargs or kwargs[f] is None]
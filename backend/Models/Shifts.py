@@ -41,6 +41,8 @@ class Shifts(db.Model):
         return value
 
     REQUIRED_FIELDS = ['start_time', 'end_time', 'name']
+    FILTER_FIELDS = ['name']
+    SORT_FIELDS = ['id', 'name', 'start_time']
 
     def __init__(self, **kwargs):
         missed = [field for field in self.REQUIRED_FIELDS if field not in kwargs]
@@ -0,0 +1,29 @@
+from datetime import datetime
+from extensions import db
+from Models.MedicineStock import MedicineStock
+from Models.PurchaseOrder import PurchaseOrder
+
+
+class StockAllocation(db.Model):
+    __tablename__ = 'stock_allocation'
+
+    id = db.Column(db.Integer, primary_key=True)
+    purchase_order_id = db.Column(db.Integer, db.ForeignKey('purchase_order.id'), nullable=False, index=True)
+    medicine_stock_id = db.Column(db.Integer, db.ForeignKey('medicine_stock.id'), nullable=False, index=True)
+    quantity = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    purchase_order = db.relationship('PurchaseOrder', backref='allocations', lazy=True)
+    # batches with allocations can not be deleted (see MedicineStocks.delete), never null the reference
+    medicine_stock = db.relationship('MedicineStock', lazy=True,
+                                     backref=db.backref('allocations', lazy=True, passive_deletes='all'))
+
+    REQUIRED_FIELDS = ['purchase_order_id', 'medicine_stock_id', 'quantity']
+    FILTER_FIELDS = ['purchase_order_id', 'medicine_stock_id']
+    SORT_FIELDS = ['id', 'created_at']
+
+    def __init__(self, **kwargs):
+        missing = [f for f in self.REQUIRED_FIELDS if f not in kwargs or kwargs[f] is None]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+        super().__init__(**kwargs)
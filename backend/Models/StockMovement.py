@@ -0,0 +1,50 @@
+import enum
+from datetime import datetime
+from extensions import db
+from Models.Medicine import Medicine
+from Models.MedicineStock import MedicineStock
+from Models.PurchaseOrder import PurchaseOrder
+
+
+class MovementTypeEnum(enum.Enum):
+    RECEIPT = "RECEIPT"
+    DISPENSE = "DISPENSE"
+    RETURN = "RETURN"
+    ADJUSTMENT = "ADJUSTMENT"
+    EXPIRY_WRITE_OFF = "EXPIRY_WRITE_OFF"
+
+
+class StockMovement(db.Model):
+    """
+    Append only ledger of every change to a batch's quantity. Rows are never
+    updated or deleted; the batch_no is copied so the history stays readable
+    after a batch is removed.
+    """
+    __tablename__ = 'stock_movement'
+    __table_args__ = (
+        db.Index('ix_stock_movement_medicine_id_created_at', 'medicine_id', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    medicine_id = db.Column(db.Integer, db.ForeignKey('medicine.id'), nullable=False)
+    medicine_stock_id = db.Column(db.Integer, db.ForeignKey('medicine_stock.id', ondelete="SET NULL"),
+                                  nullable=True, index=True)
+    purchase_order_id = db.Column(db.Integer, db.ForeignKey('purchase_order.id', ondelete="SET NULL"),
+                                  nullable=True, index=True)
+    batch_no = db.Column(db.String(50), nullable=True)
+    movement_type = db.Column(db.Enum(MovementTypeEnum), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)  # signed, negative when stock leaves
+    note = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    medicine = db.relationship('Medicine', lazy=True)
+
+    REQUIRED_FIELDS = ['medicine_id', 'movement_type', 'quantity']
+    FILTER_FIELDS = ['medicine_id', 'medicine_stock_id', 'purchase_order_id', 'movement_type']
+    SORT_FIELDS = ['id', 'created_at']
+
+    def __init__(self, **kwargs):
+        missing = [f for f in self.REQUIRED_FIELDS if f not in kwargs or kwargs[f] is None]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+        super().__init__(**kwargs)
@@ -0,0 +1,32 @@
+from datetime import datetime
+from extensions import db
+
+
+class StockScanState(db.Model):
+    """
+    Watermarks of the stock alert scanner, one row per scanner.
+    """
+    __tablename__ = 'stock_scan_state'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False, unique=True)
+    last_stock_updated_at = db.Column(db.DateTime, nullable=True)
+    last_balance_updated_at = db.Column(db.DateTime, nullable=True)
+    expiry_horizon = db.Column(db.Date, nullable=True)
+    last_run_at = db.Column(db.DateTime, nullable=True)
+
+
+class StockAlert(db.Model):
+    """
+    Open alerts, so a condition is only notified once until it clears.
+    reference_id is the medicine id for LOW_STOCK and the batch id for NEAR_EXPIRY.
+    """
+    __tablename__ = 'stock_alert'
+    __table_args__ = (
+        db.UniqueConstraint('alert_type', 'reference_id', name='uq_stock_alert_type_reference'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    alert_type = db.Column(db.String(20), nullable=False)
+    reference_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -19,6 +19,8 @@ class SupportTicket(db.Model):
     assignee = db.relationship('User', foreign_keys=[assigned_to])
 
     REQUIRED_FIELDS = ['subject', 'description', 'user_id']
+    FILTER_FIELDS = ['status', 'user_id', 'assigned_to']
+    SORT_FIELDS = ['id', 'created_at']
 
     def __init__(self, **kwargs):
         missing = [field for field in self.REQUIRED_FIELDS if field not in kwargs]
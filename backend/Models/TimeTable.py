@@ -1,29 +1,33 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from sqlalchemy.orm import validates
 
 from Models.Shifts import Shifts
 from Models.Users import User
+from Utils.ReferenceCache import shifts
 from extensions import db
 
 
 class TimeTable(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'date', name='uq_time_table_user_date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     shift_id = db.Column(db.Integer, db.ForeignKey('shifts.id'), nullable=False)
-    user_id = db.Column(db.Interger, db.ForeignKey('user.id'), nullable=False)
-    date = db.Column(db.DateTime, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, on_update=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     @validates('shift_id')
     def validate_shift_id(self, key, value):
         if not value or not isinstance(value, int):
             raise ValueError(f"{key} must be a number")
 
-        shift = Shifts.query.get(value)
-        if not shift:
+        if not shifts.get(value):
             raise ValueError("Shift not found")
 
         return value
@@ -39,14 +43,20 @@ class TimeTable(db.Model):
 
         return value
 
-    @validates('data')
-    def validate_user_id(self, key, value):
-        if not value or not isinstance(value, datetime):
-            raise ValueError(f"{key} must be a datetime")
-
-        return value
+    @validates('date')
+    def validate_date(self, key, value):
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        try:
+            return date.fromisoformat(str(value)[:10])
+        except ValueError:
+            raise ValueError(f"{key} must be a date (YYYY-MM-DD)")
 
     REQUIRED_FIELDS = ['shift_id', 'user_id', 'date']
+    FILTER_FIELDS = ['user_id', 'shift_id', 'date']
+    SORT_FIELDS = ['id', 'date']
 
     def __init__(self, **kwargs):
         missed = [field for field in self.REQUIRED_FIELDS if field not in kwargs]
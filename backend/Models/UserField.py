@@ -1,6 +1,6 @@
 import enum
 from sqlalchemy.orm import validates
-from Models.UserType import UserType
+from Utils.ReferenceCache import user_types
 from extensions import db
 
 
@@ -25,7 +25,7 @@ class UserField(db.Model):
         except Exception:
             raise ValueError("user_type must be an integer")
 
-        if not UserType.query.get(value):
+        if not user_types.get(value):
             raise ValueError(f"user_type {value} does not exist in UserType table")
 
         return value
@@ -61,6 +61,8 @@ class UserField(db.Model):
             raise ValueError(f"field_type must be a string or FieldTypeEnum ({list(FieldTypeEnum._member_names_)})")
 
     REQUIRED_FIELDS = ['field_type', 'user_type', 'field_name']
+    FILTER_FIELDS = ['user_type', 'field_type', 'is_mandatory']
+    SORT_FIELDS = ['id']
 
     def __init__(self, **kwargs):
         missing_fields = [field for field in self.REQUIRED_FIELDS if field not in kwargs]
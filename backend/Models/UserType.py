@@ -16,6 +16,8 @@ class UserType(db.Model):
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     REQUIRED_FIELDS = ['type']
+    FILTER_FIELDS = ['type', 'is_active']
+    SORT_FIELDS = ['id', 'type', 'created_at']
 
     @validates('type', 'description')
     def validate_type(self, key, value):
@@ -1,9 +1,10 @@
 import enum
 from datetime import datetime
 from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import or_
 from sqlalchemy.orm import validates
 
-from Models.UserType import UserType
+from Utils.ReferenceCache import shifts, user_types
 from extensions import db
 from Models.UserExtraFields import UserExtraFields  # Import directly at the top
 
@@ -16,6 +17,10 @@ class GenderEnum(enum.Enum):
 
 class User(db.Model):
     __tablename__ = 'user'
+    __table_args__ = (
+        db.Index('uq_user_username_active', 'username', unique=True, postgresql_where=db.text('is_active')),
+        db.Index('uq_user_email_active', 'email', unique=True, postgresql_where=db.text('is_active')),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -40,7 +45,7 @@ class User(db.Model):
 
     extra_fields = db.relationship("UserExtraFields", backref="user_parent", uselist=False)
 
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     @validates('gender')
@@ -91,7 +96,7 @@ class User(db.Model):
             raise ValueError("user_type_id must be an integer")
 
         # Check if user_type_id exists
-        if not UserType.query.get(value):
+        if not user_types.get(value):
             raise ValueError(f"user_type_id {value} does not exist in UserType table")
 
         return value
@@ -104,8 +109,10 @@ class User(db.Model):
             except Exception:
                 raise ValueError("shift_id must be an integer or None")
 
-        # ✅ safer: look up user_type directly if needed
-        user_type = self.user_type or UserType.query.get(self.user_type_id)
+            if not shifts.get(shift_id):
+                raise ValueError(f"shift_id {shift_id} does not exist in Shifts table")
+
+        user_type = user_types.get(self.user_type_id)
 
         if user_type:
             if user_type.type.lower() == 'patient' and shift_id is not None:
@@ -125,25 +132,16 @@ class User(db.Model):
     def validate_username(self, key, value):
         if not value or not isinstance(value, str) or not value.strip():
             raise ValueError("username must be a non-empty string")
-        value = value.strip()
-
-        existing_user = User.query.filter_by(username=value, is_active=True).first()
-        if existing_user and (not self.id or existing_user.id != self.id):
-            raise ValueError("username must be unique")
-
-        return value
+        # uniqueness among active users is enforced by uq_user_username_active,
+        # see check_unique_identity for a friendly pre-check
+        return value.strip()
 
     @validates('email')
     def validate_email(self, key, value):
         if not value or not isinstance(value, str) or not value.strip():
             raise ValueError("email must be a non-empty string")
-        value = value.strip()
-
-        existing_user = User.query.filter_by(email=value, is_active=True).first()
-        if existing_user and (not self.id or existing_user.id != self.id):
-            raise ValueError("email must be unique")
-
-        return value
+        # uniqueness among active users is enforced by uq_user_email_active
+        return value.strip()
 
     @validates('name', 'password')
     def validate_non_empty_strings(self, key, value):
@@ -153,6 +151,8 @@ class User(db.Model):
 
     REQUIRED_FIELDS = ['name', 'phone_no', 'date_of_birth', 'age', 'gender',
                        'address', 'username', 'email', 'password', 'user_type_id']
+    FILTER_FIELDS = ['user_type_id', 'is_active', 'gender', 'shift_id', 'username', 'email']
+    SORT_FIELDS = ['id', 'name', 'created_at']
 
     def __init__(self, **kwargs):
         missing = [field for field in self.REQUIRED_FIELDS if not kwargs.get(field)]
@@ -160,3 +160,32 @@ class User(db.Model):
             raise ValueError(f"Missing required fields: {', '.join(missing)}")
 
         super().__init__(**kwargs)
+
+    @classmethod
+    def find_taken_identities(cls, usernames, emails, exclude_ids=()):
+        """
+        Return the (usernames, emails) already used by active users in a single query.
+        """
+        usernames, emails = set(usernames), set(emails)
+        if not usernames and not emails:
+            return set(), set()
+
+        query = db.session.query(cls.id, cls.username, cls.email).filter(
+            cls.is_active.is_(True),
+            or_(cls.username.in_(usernames), cls.email.in_(emails)),
+        )
+        exclude_ids = [user_id for user_id in exclude_ids if user_id]
+        if exclude_ids:
+            query = query.filter(cls.id.notin_(exclude_ids))
+
+        with db.session.no_autoflush:
+            rows = query.all()
+        return ({row.username for row in rows if row.username in usernames},
+                {row.email for row in rows if row.email in emails})
+
+    def check_unique_identity(self):
+        taken_usernames, taken_emails = User.find_taken_identities([self.username], [self.email], [self.id])
+        if taken_usernames:
+            raise ValueError("username must be unique")
+        if taken_emails:
+            raise ValueError("email must be unique")
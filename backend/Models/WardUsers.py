@@ -39,6 +39,8 @@ class WardUser(db.Model):
         return value
 
     REQUIRED_FIELDS = ['ward_id', 'user_id']
+    FILTER_FIELDS = ['ward_id', 'user_id']
+    SORT_FIELDS = ['id', 'created_at']
 
     def __init__(self, **kwargs):
         missing = [field for field in self.REQUIRED_FIELDS if not kwargs.get(field)]
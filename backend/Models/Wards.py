@@ -6,11 +6,19 @@ from Models.Users import User
 
 class Ward(db.Model):
     __tablename__ = 'ward'
+    __table_args__ = (
+        db.CheckConstraint('occupied >= 0 AND occupied <= capacity', name='ck_ward_occupied_within_capacity'),
+        # free beds per department straight from the index (index only scan)
+        db.Index('ix_ward_department_id_occupancy', 'department_id',
+                 postgresql_include=['id', 'name', 'capacity', 'occupied']),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False, unique=True)
     ward_type = db.Column(db.String(100), nullable=False)
     capacity = db.Column(db.Integer, nullable=False)
+    # open admissions, only changed by Services/Admissions.py
+    occupied = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     creator = db.relationship('User', foreign_keys=[created_by], lazy=True)
@@ -22,6 +30,8 @@ class Ward(db.Model):
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     REQUIRED_FIELDS = ["name", "ward_type", "capacity", "created_by", "department_id"]
+    FILTER_FIELDS = ['department_id', 'ward_type', 'created_by']
+    SORT_FIELDS = ['id', 'name', 'created_at']
 
     @validates("name")
     def validate_name(self, key, value):
@@ -43,6 +53,8 @@ class Ward(db.Model):
     def validate_capacity(self, key, value):
         if not isinstance(value, int):
             raise ValueError(f"{key} must be an integer")
+        if value < (self.occupied or 0):
+            raise ValueError(f"{key} can not be lower than the {self.occupied} occupied beds")
         return value
 
     @validates("department_id")
@@ -57,4 +69,5 @@ class Ward(db.Model):
         missing = [f for f in self.REQUIRED_FIELDS if f not in kwargs or kwargs[f] is None]
         if missing:
             raise ValueError(f"Missing required fields: {', '.join(missing)}")
+        kwargs.pop('occupied', None)
         super().__init__(**kwargs)
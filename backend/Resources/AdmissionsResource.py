@@ -0,0 +1,116 @@
+from flask import request
+from flask_restful import Resource
+from sqlalchemy.exc import IntegrityError
+
+from Models.Admissions import Admission
+from Serializers.AdmissionSerializer import admission_serializer, admission_serializers
+from Services.Admissions import NoFreeBed, admit, discharge, transfer
+from Utils.Pagination import list_response
+from extensions import db
+
+
+def integrity_response(ie):
+    if 'uq_admission_patient_id_open' in str(ie.orig):
+        return {"error": "Patient is already admitted"}, 409
+    if 'uq_admission_bed_id_open' in str(ie.orig):
+        return {"error": "Bed is already occupied"}, 409
+    return {"error": str(ie.orig)}, 400
+
+
+class Admissions(Resource):
+    def get(self):
+        try:
+            query = Admission.query
+            # current patients only: ?active=true
+            active = request.args.get('active')
+            if active:
+                if active.lower() in ('true', '1', 'yes'):
+                    query = query.filter(Admission.discharged_at.is_(None))
+                else:
+                    query = query.filter(Admission.discharged_at.isnot(None))
+            return list_response(Admission, admission_serializers, query), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+    def post(self):
+        try:
+            json_data = request.get_json(force=True)
+            if not json_data:
+                return {"error": "No input data provided"}, 400
+
+            patient_id = json_data.get("patient_id")
+            ward_id = json_data.get("ward_id")
+            bed_id = json_data.get("bed_id")
+            if not isinstance(patient_id, int) or not isinstance(ward_id, int):
+                return {"error": "patient_id and ward_id must be numbers"}, 400
+            if bed_id is not None and not isinstance(bed_id, int):
+                return {"error": "bed_id must be a number"}, 400
+
+            admission = admit(patient_id, ward_id, bed_id,
+                              admitted_by=json_data.get("admitted_by"), reason=json_data.get("reason"))
+            db.session.commit()
+            return admission_serializer.dump(admission), 201
+
+        except LookupError as le:
+            db.session.rollback()
+            return {"error": str(le)}, 404
+        except NoFreeBed as nf:
+            db.session.rollback()
+            return {"error": str(nf)}, 409
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except IntegrityError as ie:
+            db.session.rollback()
+            return integrity_response(ie)
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+    def put(self):
+        # {"id": 1, "action": "transfer", "ward_id": 2, "bed_id": 5} or {"id": 1, "action": "discharge"}
+        try:
+            json_data = request.get_json(force=True)
+            admission_id = json_data.get("id")
+            if not admission_id:
+                return {"error": "Admission ID is required"}, 400
+
+            action = json_data.get("action")
+            if action == "transfer":
+                ward_id = json_data.get("ward_id")
+                bed_id = json_data.get("bed_id")
+                if ward_id is not None and not isinstance(ward_id, int):
+                    return {"error": "ward_id must be a number"}, 400
+                if bed_id is not None and not isinstance(bed_id, int):
+                    return {"error": "bed_id must be a number"}, 400
+                admission = transfer(admission_id, ward_id, bed_id,
+                                     performed_by=json_data.get("performed_by"), note=json_data.get("note"))
+            elif action == "discharge":
+                admission = discharge(admission_id, performed_by=json_data.get("performed_by"),
+                                      note=json_data.get("note"))
+            else:
+                return {"error": "action must be one of ['transfer', 'discharge']"}, 400
+
+            db.session.commit()
+            return admission_serializer.dump(admission), 200
+
+        except LookupError as le:
+            db.session.rollback()
+            return {"error": str(le)}, 404
+        except NoFreeBed as nf:
+            db.session.rollback()
+            return {"error": str(nf)}, 409
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except IntegrityError as ie:
+            db.session.rollback()
+            return integrity_response(ie)
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
@@ -1,14 +1,35 @@
+from datetime import date, datetime, timedelta
+
 from flask import request
 from flask_restful import Resource
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 from Models.Appointments import Appointment
+from Models.Users import User
 from Serializers.AppointmentSerializer import appointment_serializer, appointment_serializers
+from Services.Availability import MAX_DAYS, free_slots
+from Utils.Pagination import apply_filters, list_response
 from extensions import db
 
+
+def conflict_response(conflict):
+    return {"error": "Doctor already has an appointment at this time",
+            "conflict": appointment_serializer.dump(conflict)}, 409
+
+
+def integrity_response(ie):
+    if 'ex_appointment_doctor_overlap' in str(ie.orig):
+        return {"error": "Doctor already has an appointment at this time"}, 409
+    return {"error": str(ie.orig)}, 400
+
+
 class Appointments(Resource):
     def get(self):
         try:
-            return appointment_serializers.dump(Appointment.query.all()), 200
+            return list_response(Appointment, appointment_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -17,12 +38,18 @@ class Appointments(Resource):
         try:
             data = request.get_json(force=True)
             appointment = Appointment(**data)
+            conflict = appointment.find_conflict()
+            if conflict:
+                return conflict_response(conflict)
             db.session.add(appointment)
             db.session.commit()
             return appointment_serializer.dump(appointment), 201
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
         except IntegrityError as ie:
             db.session.rollback()
-            return {"error": str(ie.orig)}, 400
+            return integrity_response(ie)
         except Exception as e:
             db.session.rollback()
             print(e)
@@ -35,11 +62,30 @@ class Appointments(Resource):
             appointment = Appointment.query.get(appointment_id)
             if not appointment:
                 return {"error": "Appointment not found"}, 404
+
+            # moving an appointment keeps its length unless a new end or duration is given
+            duration = data.pop("duration_minutes", None)
+            if duration is None and "end_time" not in data:
+                duration = int((appointment.end_time - appointment.appointment_date).total_seconds() // 60)
             for key, value in data.items():
                 if hasattr(appointment, key):
                     setattr(appointment, key, value)
+            if "end_time" not in data:
+                appointment.set_duration(duration)
+            appointment.check_times()
+
+            conflict = appointment.find_conflict()
+            if conflict:
+                db.session.rollback()
+                return conflict_response(conflict)
             db.session.commit()
             return appointment_serializer.dump(appointment), 200
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except IntegrityError as ie:
+            db.session.rollback()
+            return integrity_response(ie)
         except Exception as e:
             print(e)
             db.session.rollback()
@@ -58,3 +104,83 @@ class Appointments(Resource):
             print(e)
             db.session.rollback()
             return {"error": "Internal server error"}, 500
+
+
+class AppointmentAvailability(Resource):
+    def get(self):
+        try:
+            doctor_id = request.args.get('doctor_id', type=int)
+            if not doctor_id:
+                return {"error": "doctor_id is required"}, 400
+
+            duration = request.args.get('duration', 30, type=int)
+            days = request.args.get('days', 1, type=int)
+            start_date = request.args.get('date')
+            start_date = date.fromisoformat(start_date) if start_date else date.today()
+
+            # ?next=true: the first free slot from now on, looking MAX_DAYS ahead
+            if request.args.get('next', '').lower() in ('true', '1', 'yes'):
+                slots = free_slots(doctor_id, date.today(), MAX_DAYS, duration, not_before=datetime.now(), limit=1)
+                return {"doctor_id": doctor_id, "duration": duration,
+                        "next_free": slots[0] if slots else None}, 200
+
+            return {"doctor_id": doctor_id, "duration": duration, "date": start_date.isoformat(), "days": days,
+                    "slots": free_slots(doctor_id, start_date, days, duration)}, 200
+
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+
+class AppointmentCalendar(Resource):
+    def get(self):
+        # compact day/week view: flat rows with names only, grouped by day
+        try:
+            if not request.args.get('doctor_id') and not request.args.get('patient_id'):
+                return {"error": "doctor_id or patient_id is required"}, 400
+
+            view = request.args.get('view', 'day')
+            if view not in ('day', 'week'):
+                return {"error": "view must be day or week"}, 400
+
+            day = request.args.get('date')
+            day = date.fromisoformat(day) if day else date.today()
+            if view == 'week':
+                day -= timedelta(days=day.weekday())
+            days = 1 if view == 'day' else 7
+            start = datetime.combine(day, datetime.min.time())
+            end = start + timedelta(days=days)
+
+            doctor, patient = aliased(User), aliased(User)
+            query = (select(Appointment.id, Appointment.appointment_date, Appointment.end_time,
+                            Appointment.status, Appointment.doctor_id, doctor.name.label('doctor_name'),
+                            Appointment.patient_id, patient.name.label('patient_name'))
+                     .join(doctor, doctor.id == Appointment.doctor_id)
+                     .join(patient, patient.id == Appointment.patient_id)
+                     .where(Appointment.appointment_date >= start, Appointment.appointment_date < end)
+                     .order_by(Appointment.appointment_date, Appointment.id))
+            rows = db.session.execute(apply_filters(query, Appointment)).all()
+
+            calendar = {(day + timedelta(days=offset)).isoformat(): [] for offset in range(days)}
+            for row in rows:
+                calendar[row.appointment_date.date().isoformat()].append({
+                    "id": row.id,
+                    "start": row.appointment_date.isoformat(),
+                    "end": row.end_time.isoformat(),
+                    "status": row.status,
+                    "doctor_id": row.doctor_id,
+                    "doctor_name": row.doctor_name,
+                    "patient_id": row.patient_id,
+                    "patient_name": row.patient_name,
+                })
+
+            return {"view": view, "from": start.isoformat(), "to": end.isoformat(),
+                    "days": [{"date": key, "appointments": value} for key, value in calendar.items()]}, 200
+
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
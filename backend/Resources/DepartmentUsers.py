@@ -3,35 +3,42 @@ from flask_restful import Resource
 
 from Models.DepartmentUsers import DepartmentUser
 from Serializers.DepartmentUserSerializers import department_user_serializers, department_user_serializer
+from Services.DutyRoster import duty_roster
+from Utils.Pagination import list_response
 from extensions import db
 
 
 class DepartmentUsers(Resource):
     def get(self):
         try:
-            return department_user_serializers.dump(DepartmentUser.query.all())
+            return list_response(DepartmentUser, department_user_serializers)
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
-            return {"error": "Internal error occurred"}
+            return {"error": "Internal error occurred"}, 500
 
     def post(self):
         try:
             json_data = request.get_json(force=True)
             if not json_data:
-                return ValueError("error", "No data sent"), 400
+                return {"error": "No data sent"}, 400
 
             department_user = DepartmentUser(**json_data)
 
             db.session.add(department_user)
             db.session.commit()
+            duty_roster.invalidate_members()
 
-            return department_user_serializer.load(department_user)
+            return department_user_serializer.dump(department_user), 201
 
         except ValueError as ve:
+            db.session.rollback()
             print(ve)
-            return {"error", str(ve)}
+            return {"error": str(ve)}, 400
 
         except Exception as e:
+            db.session.rollback()
             print(e)
-            return {"error", "Internal error occurred"}, 500
+            return {"error": "Internal error occurred"}, 500
         
\ No newline at end of file
@@ -3,12 +3,17 @@ from flask_restful import Resource
 from sqlalchemy.exc import IntegrityError
 from Models.Department import Department
 from Serializers.DepartmentSerializers import department_serializers, department_serializer
+from Utils.ConditionalGet import conditional_get
+from Utils.Pagination import list_response
 from extensions import db
 
 class Departments(Resource):
+    @conditional_get(Department, department_serializers)
     def get(self):
         try:
-            return department_serializers.dump(Department.query.all()), 200
+            return list_response(Department, department_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from flask import Response, request, stream_with_context
+from flask_restful import Resource
+
+from Services.Export import EXPORTS, FORMATS, export_query, stream_export
+
+
+class Export(Resource):
+    def get(self, resource):
+        # /export/invoices?format=ndjson&gzip=true&from=2026-01-01&status=PAID
+        try:
+            model = EXPORTS.get(resource)
+            if not model:
+                return {"error": f"resource must be one of {sorted(EXPORTS)}"}, 404
+
+            data_format = request.args.get('format', 'csv')
+            if data_format not in FORMATS:
+                return {"error": f"format must be one of {sorted(FORMATS)}"}, 400
+            compress = request.args.get('gzip', '').lower() in ('true', '1', 'yes')
+
+            # build the query up front so bad filters are a 400, not a broken stream
+            export_query(model, request.args)
+
+            filename = f"{resource}-{datetime.utcnow():%Y%m%d%H%M%S}.{data_format}" + ('.gz' if compress else '')
+            return Response(
+                stream_with_context(stream_export(model, request.args, data_format, compress)),
+                mimetype='application/gzip' if compress else FORMATS[data_format],
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            )
+
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
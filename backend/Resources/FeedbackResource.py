@@ -2,11 +2,15 @@ from flask import request
 from flask_restful import Resource
 from Models.Feedback import Feedback
 from Serializers.FeedbackSerializer import feedback_serializer, feedback_serializers
+from Utils.Pagination import list_response
 from extensions import db
 
 class Feedbacks(Resource):
     def get(self):
-        return feedback_serializers.dump(Feedback.query.all()), 200
+        try:
+            return list_response(Feedback, feedback_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
 
     def post(self):
         json_data = request.get_json(force=True)
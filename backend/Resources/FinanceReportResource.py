@@ -1,13 +1,22 @@
+from datetime import date
+
 from flask import request
 from flask_restful import Resource
 from Models.FinanceReport import FinanceReport
+from Models.FinanceRollup import DIMENSIONS, PERIODS
 from Serializers.FinanceReportSerializer import finance_report_serializer, finance_report_serializers
+from Serializers.FinanceRollupSerializer import finance_rollup_serializers
+from Services.FinanceRollup import generate_report, rollups
+from Utils.Pagination import list_response
 from extensions import db
 
 
 class FinanceReports(Resource):
     def get(self):
-        return finance_report_serializers.dump(FinanceReport.query.all()), 200
+        try:
+            return list_response(FinanceReport, finance_report_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
 
     def post(self):
         json_data = request.get_json(force=True)
@@ -36,3 +45,48 @@ class FinanceReports(Resource):
         db.session.delete(report)
         db.session.commit()
         return {"message": "FinanceReport deleted successfully"}, 200
+
+
+class FinanceRollups(Resource):
+    def get(self):
+        # ?period=month&from=2026-01-01&to=2026-07-01&dimension=status
+        try:
+            period = request.args.get("period", "day")
+            if period not in PERIODS:
+                return {"error": f"period must be one of {list(PERIODS)}"}, 400
+            dimension = request.args.get("dimension")
+            if dimension and dimension not in DIMENSIONS:
+                return {"error": f"dimension must be one of {list(DIMENSIONS)}"}, 400
+
+            start = request.args.get("from")
+            end = request.args.get("to")
+            rows = rollups(period,
+                           date.fromisoformat(start[:10]) if start else None,
+                           date.fromisoformat(end[:10]) if end else None,
+                           dimension)
+            return finance_rollup_serializers.dump(rows), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+
+class FinanceReportGeneration(Resource):
+    def post(self):
+        # {"period": "month", "date": "2026-10-01"} builds the report of that month from the rollups
+        try:
+            json_data = request.get_json(force=True) or {}
+            day = json_data.get("date")
+            day = date.fromisoformat(str(day)[:10]) if day else date.today()
+
+            report = generate_report(json_data.get("period", "day"), day)
+            db.session.commit()
+            return finance_report_serializer.dump(report), 201
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
@@ -0,0 +1,84 @@
+from flask import request
+from flask_restful import Resource
+from sqlalchemy.exc import IntegrityError
+
+from Models.MedicineBalance import MedicineBalance
+from Models.StockMovement import StockMovement
+from Serializers.MedicineBalanceSerializer import medicine_balance_serializers
+from Serializers.MedicineStockSerializer import medicine_stock_serializer
+from Serializers.StockMovementSerializer import stock_movement_serializers
+from Services.InventoryLedger import adjust_stock, write_off_expired
+from Utils.Pagination import coerce_value, list_response
+from extensions import db
+
+
+class InventoryBalances(Resource):
+    def get(self):
+        try:
+            query = MedicineBalance.query
+            # low stock report: ?max_on_hand=10
+            max_on_hand = request.args.get('max_on_hand')
+            if max_on_hand:
+                query = query.filter(MedicineBalance.on_hand <= coerce_value(MedicineBalance.on_hand, max_on_hand))
+            return list_response(MedicineBalance, medicine_balance_serializers, query), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+
+class InventoryMovements(Resource):
+    def get(self):
+        try:
+            return list_response(StockMovement, stock_movement_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+    def post(self):
+        # manual adjustment of a batch, e.g. after a stock take
+        try:
+            json_data = request.get_json(force=True)
+            if not json_data:
+                return {"error": "No input data provided"}, 400
+
+            stock_id = json_data.get("medicine_stock_id")
+            quantity = json_data.get("quantity")
+            if not stock_id or not isinstance(quantity, int) or not quantity:
+                return {"error": "medicine_stock_id and a non zero integer quantity are required"}, 400
+
+            stock = adjust_stock(stock_id, quantity, json_data.get("note"))
+            db.session.commit()
+            return medicine_stock_serializer.dump(stock), 201
+
+        except LookupError as le:
+            db.session.rollback()
+            return {"error": str(le)}, 404
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except IntegrityError as ie:
+            db.session.rollback()
+            return {"error": str(ie.orig)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+
+class ExpiryWriteOffs(Resource):
+    def post(self):
+        try:
+            movements = write_off_expired()
+            db.session.commit()
+            return {
+                "written_off_batches": len(movements),
+                "written_off_units": -sum(movement["quantity"] for movement in movements),
+            }, 200
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
@@ -1,45 +1,95 @@
 from flask import request
 from flask_restful import Resource
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from Models.Invoice import Invoice
 from Models.Users import User
 from Serializers.InvoiceSerializer import invoice_serializer, invoice_serializers
+from Services.FinanceRollup import department_for, invoice_snapshot, record_invoice_changes
+from Utils.Pagination import list_response
 from extensions import db
 
 
+def _locked_invoice(invoice_id):
+    # the snapshot taken before a change must be of the locked row, or two
+    # concurrent edits would both take the same amount out of the rollups
+    if invoice_id is None:
+        return None
+    return db.session.execute(
+        select(Invoice).where(Invoice.id == invoice_id).with_for_update()
+    ).scalar_one_or_none()
+
+
 class Invoices(Resource):
     def get(self):
-        return invoice_serializers.dump(Invoice.query.all()), 200
+        try:
+            return list_response(Invoice, invoice_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
 
     def post(self):
-        json_data = request.get_json(force=True)
-        if not User.query.get(json_data.get("patient_id")):
-            return {"error": "Patient not found"}, 404
-        if not User.query.get(json_data.get("created_by")):
-            return {"error": "Creator not found"}, 404
+        try:
+            json_data = request.get_json(force=True)
+            if not User.query.get(json_data.pop("patient_id", None)):
+                return {"error": "Patient not found"}, 404
+            if not User.query.get(json_data.get("created_by")):
+                return {"error": "Creator not found"}, 404
 
-        invoice = Invoice(**json_data)
-        db.session.add(invoice)
-        db.session.commit()
-        return invoice_serializer.dump(invoice), 201
+            invoice = Invoice(**json_data)
+            if not invoice.department_id:
+                invoice.department_id = department_for(invoice.created_by)
+            db.session.add(invoice)
+            db.session.flush()
+            record_invoice_changes([(None, invoice_snapshot(invoice))])
+            db.session.commit()
+            return invoice_serializer.dump(invoice), 201
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except IntegrityError as ie:
+            db.session.rollback()
+            return {"error": str(ie.orig)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
 
     def put(self):
-        json_data = request.get_json(force=True)
-        invoice_id = json_data.get("id")
-        invoice = Invoice.query.get(invoice_id)
-        if not invoice:
-            return {"error": "Invoice not found"}, 404
-
-        for key, value in json_data.items():
-            if hasattr(invoice, key):
-                setattr(invoice, key, value)
-        db.session.commit()
-        return invoice_serializer.dump(invoice), 200
+        try:
+            json_data = request.get_json(force=True)
+            invoice = _locked_invoice(json_data.get("id"))
+            if not invoice:
+                return {"error": "Invoice not found"}, 404
+
+            before = invoice_snapshot(invoice)
+            for key, value in json_data.items():
+                if hasattr(invoice, key):
+                    setattr(invoice, key, value)
+            db.session.flush()
+            record_invoice_changes([(before, invoice_snapshot(invoice))])
+            db.session.commit()
+            return invoice_serializer.dump(invoice), 200
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except IntegrityError as ie:
+            db.session.rollback()
+            return {"error": str(ie.orig)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
 
     def delete(self):
-        invoice_id = request.args.get("id")
-        invoice = Invoice.query.get(invoice_id)
-        if not invoice:
-            return {"error": "Invoice not found"}, 404
-        db.session.delete(invoice)
-        db.session.commit()
-        return {"message": "Invoice deleted successfully"}, 200
+        try:
+            invoice = _locked_invoice(request.args.get("id", type=int))
+            if not invoice:
+                return {"error": "Invoice not found"}, 404
+            record_invoice_changes([(invoice_snapshot(invoice), None)])
+            db.session.delete(invoice)
+            db.session.commit()
+            return {"message": "Invoice deleted successfully"}, 200
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
@@ -3,34 +3,60 @@ from flask_restful import Resource
 from Models.LabReport import LabReport
 from Models.LabRequest import LabRequest
 from Serializers.LabReportSerializers import lab_report_serializer, lab_report_serializers
+from Services.LabResults import sync_results, trend
+from Utils.Pagination import list_response, parse_range
 from extensions import db
 
 
 class LabReports(Resource):
     def get(self):
-        return lab_report_serializers.dump(LabReport.query.all()), 200
+        try:
+            return list_response(LabReport, lab_report_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
 
     def post(self):
-        json_data = request.get_json(force=True)
-        if not LabRequest.query.get(json_data.get("request_id")):
-            return {"error": "LabRequest not found"}, 404
+        try:
+            json_data = request.get_json(force=True)
+            if not LabRequest.query.get(json_data.get("request_id")):
+                return {"error": "LabRequest not found"}, 404
 
-        lab_report = LabReport(**json_data)
-        db.session.add(lab_report)
-        db.session.commit()
-        return lab_report_serializer.dump(lab_report), 201
+            lab_report = LabReport(**json_data)
+            db.session.add(lab_report)
+            db.session.flush()
+            sync_results([lab_report])
+            db.session.commit()
+            return lab_report_serializer.dump(lab_report), 201
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
 
     def put(self):
-        json_data = request.get_json(force=True)
-        report_id = json_data.get("id")
-        lab_report = LabReport.query.get(report_id)
-        if not lab_report:
-            return {"error": "LabReport not found"}, 404
-        for key, value in json_data.items():
-            if hasattr(lab_report, key):
-                setattr(lab_report, key, value)
-        db.session.commit()
-        return lab_report_serializer.dump(lab_report), 200
+        try:
+            json_data = request.get_json(force=True)
+            report_id = json_data.get("id")
+            lab_report = LabReport.query.get(report_id)
+            if not lab_report:
+                return {"error": "LabReport not found"}, 404
+            for key, value in json_data.items():
+                if hasattr(lab_report, key):
+                    setattr(lab_report, key, value)
+            db.session.flush()
+            if "report_data" in json_data or "request_id" in json_data:
+                sync_results([lab_report])
+            db.session.commit()
+            return lab_report_serializer.dump(lab_report), 200
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
 
     def delete(self):
         report_id = request.args.get("id")
@@ -40,3 +66,23 @@ class LabReports(Resource):
         db.session.delete(lab_report)
         db.session.commit()
         return {"message": "LabReport deleted successfully"}, 200
+
+
+class LabResultTrend(Resource):
+    def get(self):
+        try:
+            patient_id = request.args.get("patient_id", type=int)
+            analyte = request.args.get("analyte", "").strip()
+            if not patient_id or not analyte:
+                return {"error": "patient_id and analyte are required"}, 400
+
+            return {
+                "patient_id": patient_id,
+                "analyte": analyte,
+                "points": trend(patient_id, analyte, parse_range(request.args, 'from'), parse_range(request.args, 'to')),
+            }, 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
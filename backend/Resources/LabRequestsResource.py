@@ -1,44 +1,49 @@
 from flask import request
 from flask_restful import Resource
-from Models.LabRequest import LabRequest
-from Models.Users import User
-from Models.LabTest import LabTest
+from sqlalchemy.exc import IntegrityError
+from Models.LabRequest import PENDING, LabRequest
 from Serializers.LabRequestSerializers import lab_request_serializer, lab_request_serializers
+from Services.LabOrders import create_requests, parse_panel
+from Services.LabWorklist import claim, worklist
+from Utils.Pagination import list_response
 from extensions import db
 
 
 class LabRequests(Resource):
     def get(self):
-        return lab_request_serializers.dump(LabRequest.query.all()), 200
+        try:
+            return list_response(LabRequest, lab_request_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
 
     def post(self):
-        json_data = request.get_json(force=True)
-        # Validate foreign keys
-        if not User.query.get(json_data.get("patient_id")):
-            return {"error": "Patient not found"}, 404
-        if not User.query.get(json_data.get("requested_by")):
-            return {"error": "Requester not found"}, 404
-
-        print("hi")
-
-        if type(json_data.get("test_id")) is list:
-            test_ids = json_data.get("test_id")
-            del json_data["test_id"]
-            for test in test_ids:
-                if not LabTest.query.get(test):
-                    return {"error": "LabTest not found"}, 404
-                print(test, json_data)
-                lab_request = LabRequest(**json_data, test_id=test)
-                db.session.add(lab_request)
-            db.session.commit()
-            return lab_request_serializer.dump(lab_request), 201
-        else:
-            if not LabTest.query.get(json_data.get("test_id")):
-                return {"error": "LabTest not found"}, 404
-            lab_request = LabRequest(**json_data)
-            db.session.add(lab_request)
+        try:
+            json_data = request.get_json(force=True)
+            if not json_data:
+                return {"error": "No input data provided"}, 400
+
+            pairs = parse_panel(json_data)
+            lab_requests = create_requests(json_data.get("requested_by"), pairs, lab_request_serializers)
             db.session.commit()
-            return lab_request_serializer.dump(lab_request), 201
+
+            # a single test keeps the old single object response
+            if len(lab_requests) == 1 and isinstance(json_data.get("test_id"), int):
+                return lab_request_serializer.dump(lab_requests[0]), 201
+            return lab_request_serializers.dump(lab_requests), 201
+
+        except LookupError as le:
+            db.session.rollback()
+            return {"error": str(le)}, 404
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except IntegrityError as ie:
+            db.session.rollback()
+            return {"error": str(ie.orig)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
 
     def put(self):
         json_data = request.get_json(force=True)
@@ -49,6 +54,10 @@ class LabRequests(Resource):
         for key, value in json_data.items():
             if hasattr(lab_request, key):
                 setattr(lab_request, key, value)
+        # handing a request back to the queue drops the claim
+        if lab_request.status == PENDING:
+            lab_request.claimed_by = None
+            lab_request.claimed_at = None
         db.session.commit()
         return lab_request_serializer.dump(lab_request), 200
 
@@ -60,3 +69,46 @@ class LabRequests(Resource):
         db.session.delete(lab_request)
         db.session.commit()
         return {"message": "LabRequest deleted successfully"}, 200
+
+
+class LabWorklist(Resource):
+    def get(self):
+        try:
+            return worklist(request.args), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+
+class LabRequestClaims(Resource):
+    def post(self):
+        # {"technician_id": 7, "count": 5, "test_ids": [1, 2]}
+        try:
+            json_data = request.get_json(force=True)
+            if not json_data:
+                return {"error": "No input data provided"}, 400
+
+            technician_id = json_data.get("technician_id")
+            if not isinstance(technician_id, int):
+                return {"error": "technician_id must be a number"}, 400
+            test_ids = json_data.get("test_ids")
+            if test_ids is not None and (not isinstance(test_ids, list)
+                                         or not all(isinstance(test_id, int) for test_id in test_ids)):
+                return {"error": "test_ids must be a list of numbers"}, 400
+
+            claimed = claim(technician_id, json_data.get("count", 1), test_ids)
+            db.session.commit()
+            return {"claimed": claimed}, 200
+
+        except LookupError as le:
+            db.session.rollback()
+            return {"error": str(le)}, 404
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
@@ -2,14 +2,19 @@ from flask import request
 from flask_restful import Resource
 from Models.LabTest import LabTest
 from Serializers.LabTestSerializers import lab_test_serializer, lab_test_serializers
+from Utils.ConditionalGet import conditional_get
+from Utils.Pagination import list_response
 from extensions import db
 from sqlalchemy.exc import IntegrityError
 
 
 class LabTests(Resource):
+    @conditional_get(LabTest, lab_test_serializers)
     def get(self):
         try:
-            return lab_test_serializers.dump(LabTest.query.all()), 200
+            return list_response(LabTest, lab_test_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
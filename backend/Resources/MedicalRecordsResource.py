@@ -8,13 +8,16 @@ from Models.Medicine import Medicine
 from Models.Users import User
 from Serializers.MedicalRecordsSerializer import medical_records_serializers, medical_records_serializer
 from Serializers.PurchaseOrderSerializer import purchase_order_serializer, purchase_order_serializers
+from Utils.Pagination import list_response
 from extensions import db
 
 
 class MedicalRecordsResource(Resource):
     def get(self):
         try:
-            return medical_records_serializers.dump(MedicalRecords.query.all()), 200
+            return list_response(MedicalRecords, medical_records_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
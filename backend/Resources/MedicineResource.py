@@ -3,13 +3,18 @@ from flask_restful import Resource
 from sqlalchemy.exc import IntegrityError
 from Models.Medicine import Medicine
 from Serializers.MedicineSerializer import medicine_serializer, medicine_serializers
+from Utils.ConditionalGet import conditional_get
+from Utils.Pagination import list_response
 from extensions import db
 
 
 class Medicines(Resource):
+    @conditional_get(Medicine, medicine_serializers)
     def get(self):
         try:
-            return medicine_serializers.dump(Medicine.query.all()), 200
+            return list_response(Medicine, medicine_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -1,16 +1,23 @@
 from flask import request
 from flask_restful import Resource
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from Models.MedicineStock import MedicineStock
 from Models.Medicine import Medicine
+from Models.StockAllocation import StockAllocation
+from Models.StockMovement import MovementTypeEnum
 from Serializers.MedicineStockSerializer import medicine_stock_serializer, medicine_stock_serializers
+from Services.InventoryLedger import record_movements
+from Utils.Pagination import list_response
 from extensions import db
 
 
 class MedicineStocks(Resource):
     def get(self):
         try:
-            return medicine_stock_serializers.dump(MedicineStock.query.all()), 200
+            return list_response(MedicineStock, medicine_stock_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -28,6 +35,11 @@ class MedicineStocks(Resource):
 
             stock = MedicineStock(**json_data)
             db.session.add(stock)
+            db.session.flush()
+            record_movements([{
+                "medicine_id": stock.medicine_id, "medicine_stock_id": stock.id, "batch_no": stock.batch_no,
+                "movement_type": MovementTypeEnum.RECEIPT, "quantity": stock.quantity,
+            }])
             db.session.commit()
             return medicine_stock_serializer.dump(stock), 201
 
@@ -43,32 +55,83 @@ class MedicineStocks(Resource):
             return {"error": "Internal error occurred"}, 500
 
     def put(self):
-        json_data = request.get_json(force=True)
-        stock_id = json_data.get("id")
-        if not stock_id:
-            return {"error": "Stock ID required"}, 400
+        try:
+            json_data = request.get_json(force=True)
+            if not json_data:
+                return {"error": "No input data provided"}, 400
+
+            stock_id = json_data.get("id")
+            if not stock_id:
+                return {"error": "Stock ID required"}, 400
 
-        stock = MedicineStock.query.get(stock_id)
-        if not stock:
-            return {"error": "Stock not found"}, 404
+            # lock the batch so a dispense committed meanwhile is not overwritten
+            # and the ledger delta below is taken from the current quantity
+            stock = db.session.execute(
+                select(MedicineStock).where(MedicineStock.id == stock_id).with_for_update()
+            ).scalar_one_or_none()
+            if not stock:
+                return {"error": "Stock not found"}, 404
 
-        for key, value in json_data.items():
-            if hasattr(stock, key):
-                setattr(stock, key, value)
-        db.session.commit()
-        return medicine_stock_serializer.dump(stock), 200
+            # quantity and medicine_id are coerced to ints by the model validators
+            before = (stock.medicine_id, stock.quantity)
+            for key, value in json_data.items():
+                if key != "id" and hasattr(stock, key):
+                    setattr(stock, key, value)
+            db.session.flush()
+
+            # in place edits are recorded as adjustments against the old and new medicine
+            if (stock.medicine_id, stock.quantity) != before:
+                record_movements([
+                    {"medicine_id": before[0], "medicine_stock_id": stock.id, "batch_no": stock.batch_no,
+                     "movement_type": MovementTypeEnum.ADJUSTMENT, "quantity": -before[1]},
+                    {"medicine_id": stock.medicine_id, "medicine_stock_id": stock.id, "batch_no": stock.batch_no,
+                     "movement_type": MovementTypeEnum.ADJUSTMENT, "quantity": stock.quantity},
+                ] if stock.medicine_id != before[0] else [
+                    {"medicine_id": stock.medicine_id, "medicine_stock_id": stock.id, "batch_no": stock.batch_no,
+                     "movement_type": MovementTypeEnum.ADJUSTMENT, "quantity": stock.quantity - before[1]},
+                ])
+            db.session.commit()
+            return medicine_stock_serializer.dump(stock), 200
+
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except IntegrityError as ie:
+            db.session.rollback()
+            return {"error": str(ie.orig)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
 
     def delete(self):
-        json_data = request.get_json(force=True)
-        stock_id = json_data.get("id")
-        # stock_id = request.args.get("id")
-        if not stock_id:
-            return {"error": "Stock ID required"}, 400
-
-        stock = MedicineStock.query.get(stock_id)
-        if not stock:
-            return {"error": "Stock not found"}, 404
-
-        db.session.delete(stock)
-        db.session.commit()
-        return {"message": "Stock deleted successfully"}, 200
+        try:
+            json_data = request.get_json(force=True)
+            stock_id = json_data.get("id")
+            # stock_id = request.args.get("id")
+            if not stock_id:
+                return {"error": "Stock ID required"}, 400
+
+            stock = MedicineStock.query.get(stock_id)
+            if not stock:
+                return {"error": "Stock not found"}, 404
+
+            # dispensed batches are kept for the allocations (and order costs) that point at them
+            if db.session.query(StockAllocation.id).filter_by(medicine_stock_id=stock.id).first():
+                return {"error": "Stock has been dispensed and can not be deleted, adjust its quantity instead"}, 409
+
+            record_movements([{
+                "medicine_id": stock.medicine_id, "medicine_stock_id": stock.id, "batch_no": stock.batch_no,
+                "movement_type": MovementTypeEnum.ADJUSTMENT, "quantity": -stock.quantity, "note": "Batch deleted",
+            }])
+            db.session.delete(stock)
+            db.session.commit()
+            return {"message": "Stock deleted successfully"}, 200
+
+        except IntegrityError as ie:
+            db.session.rollback()
+            return {"error": str(ie.orig)}, 409
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
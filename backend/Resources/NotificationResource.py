@@ -2,11 +2,15 @@ from flask import request
 from flask_restful import Resource
 from Models.Notification import Notification
 from Serializers.NotificationSerializer import notification_serializer, notification_serializers
+from Utils.Pagination import list_response
 from extensions import db
 
 class Notifications(Resource):
     def get(self):
-        return notification_serializers.dump(Notification.query.all()), 200
+        try:
+            return list_response(Notification, notification_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
 
     def post(self):
         json_data = request.get_json(force=True)
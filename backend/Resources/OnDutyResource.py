@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from flask import request
+from flask_restful import Resource
+
+from Services.DutyRoster import duty_roster
+
+
+class OnDuty(Resource):
+    def get(self):
+        try:
+            at = request.args.get('at')
+            at = datetime.fromisoformat(at) if at else datetime.now()
+            ward_id = request.args.get('ward_id', type=int)
+            department_id = request.args.get('department_id', type=int)
+
+            users = duty_roster.on_duty(at, ward_id=ward_id, department_id=department_id)
+            return {
+                "at": at.isoformat(),
+                "ward_id": ward_id,
+                "department_id": department_id,
+                "users": [user._asdict() for user in users],
+            }, 200
+
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
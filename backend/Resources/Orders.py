@@ -1,21 +1,111 @@
 from flask import request
 from flask_restful import Resource
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.exc import IntegrityError
 
 from Models.Invoice import Invoice
-from Models.MedicineStock import MedicineStock
 from Models.Orders import Orders
 from Models.PurchaseOrder import PurchaseOrder
 from Models.Medicine import Medicine
 from Serializers.OrdersSerializer import order_serializers, order_serializer
 from Serializers.PurchaseOrderSerializer import purchase_order_serializer, purchase_order_serializers
+from Services.FinanceRollup import department_for, invoice_snapshot, record_invoice_changes, set_order_total
+from Services.StockAllocation import allocate, allocate_items, allocated_cost, release
+from Utils.Pagination import coerce_value, list_response
 from extensions import db
 
 
+def parse_items(items_data):
+    """
+    Validate the cart and return a list of {medicine_id, quantity, order_date}.
+    """
+    if not isinstance(items_data, list):
+        raise ValueError("items must be a list")
+
+    items = []
+    for item in items_data:
+        if not isinstance(item, dict):
+            raise ValueError("each item must be an object")
+        missing = [f for f in PurchaseOrder.REQUIRED_FIELDS if item.get(f) is None]
+        if missing:
+            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+        items.append({
+            "medicine_id": coerce_value(PurchaseOrder.medicine_id, item["medicine_id"]),
+            "quantity": coerce_value(PurchaseOrder.quantity, item["quantity"]),
+            "order_date": coerce_value(PurchaseOrder.order_date, str(item["order_date"])),
+        })
+        if items[-1]["quantity"] < 1:
+            raise ValueError("quantity must be greater than 0")
+    return items
+
+
+def check_medicines(items):
+    """
+    Check every medicine of the cart exists with a single query.
+    """
+    medicine_ids = {item["medicine_id"] for item in items}
+    found = set(db.session.execute(select(Medicine.id).where(Medicine.id.in_(medicine_ids))).scalars())
+    for medicine_id in sorted(medicine_ids):
+        if medicine_id not in found:
+            raise LookupError(f"Medicine ID {medicine_id} not found")
+
+
+def insert_items(order_id, items):
+    """
+    Insert the cart with one multi-row INSERT and allocate stock for it.
+    """
+    if not items:
+        return []
+    item_ids = db.session.execute(
+        insert(PurchaseOrder).returning(PurchaseOrder.id, sort_by_parameter_order=True),
+        [{**item, "order_id": order_id} for item in items],
+    ).scalars().all()
+    allocate([(item_id, item["medicine_id"], item["quantity"]) for item_id, item in zip(item_ids, items)])
+    return item_ids
+
+
+def sync_items(order_id, items):
+    """
+    Diff the order's current items against the new cart: items are matched on
+    medicine_id, changed ones are updated, missing ones deleted and the rest
+    inserted, each with a single statement. Stock is only re-allocated for the
+    lines that changed.
+    """
+    existing = {}
+    for row in db.session.execute(
+            select(PurchaseOrder.id, PurchaseOrder.medicine_id, PurchaseOrder.quantity, PurchaseOrder.order_date)
+            .where(PurchaseOrder.order_id == order_id).order_by(PurchaseOrder.id)):
+        existing.setdefault(row.medicine_id, []).append(row)
+
+    to_insert, to_update = [], []
+    for item in items:
+        matches = existing.get(item["medicine_id"])
+        if not matches:
+            to_insert.append(item)
+            continue
+        row = matches.pop(0)
+        if (row.quantity, row.order_date) != (item["quantity"], item["order_date"]):
+            to_update.append({"id": row.id, "quantity": item["quantity"], "order_date": item["order_date"]})
+
+    to_delete = [row.id for rows in existing.values() for row in rows]
+
+    release(to_delete + [item["id"] for item in to_update])
+    if to_delete:
+        db.session.execute(delete(PurchaseOrder).where(PurchaseOrder.id.in_(to_delete))
+                           .execution_options(synchronize_session=False))
+    if to_update:
+        db.session.execute(update(PurchaseOrder), to_update)
+        allocate_items([item["id"] for item in to_update])
+    insert_items(order_id, to_insert)
+    db.session.expire_all()
+
+
 class OrdersResource(Resource):
     def get(self):
         try:
-            return order_serializers.dump(Orders.query.all()), 200
+            return list_response(Orders, order_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -34,47 +124,30 @@ class OrdersResource(Resource):
             if not user_id or not items_data:
                 return {"error": "Missing user_id or items"}, 400
 
+            items = parse_items(items_data)
+            check_medicines(items)
+
             # Create the main order record
             order = Orders(user_id=user_id, received_date=received_date)
             db.session.add(order)
             db.session.flush()  # Get order.id before committing
-            total_amount = 0
-
-            # Create purchase order items
-            for item in items_data:
-                medicine_id = item.get("medicine_id")
-                quantity = item.get("quantity")
-                order_date = item.get("order_date")
-
-                medicine = Medicine.query.get(medicine_id)
-
-                medicine_stock = MedicineStock.query.filter_by(medicine_id=medicine_id).first()
-
-                total_amount += medicine_stock.quantity * medicine_stock.price
-
-                if not medicine:
-                    db.session.rollback()
-                    return {"error": f"Medicine ID {medicine_id} not found"}, 404
-
-                print("jo")
-
-                purchase_item = PurchaseOrder(
-                    order_id=order.id,
-                    medicine_id=medicine_id,
-                    quantity=quantity,
-                    order_date=order_date
-                )
-                db.session.add(purchase_item)
 
-            print("hgjk")
+            # Create purchase order items and allocate their stock
+            insert_items(order.id, items)
 
-            invoice = Invoice(order_id=order.id, total_amount=total_amount, created_by=json_data.get("created_by"))
-            print(invoice)
+            created_by = json_data.get("created_by")
+            invoice = Invoice(order_id=order.id, total_amount=allocated_cost(order.id),
+                              created_by=created_by, department_id=department_for(created_by))
             db.session.add(invoice)
+            db.session.flush()
+            record_invoice_changes([(None, invoice_snapshot(invoice))])
 
             db.session.commit()
             return order_serializer.dump(order), 201
 
+        except LookupError as le:
+            db.session.rollback()
+            return {"error": str(le)}, 404
         except ValueError as ve:
             db.session.rollback()
             return {"error": str(ve)}, 400
@@ -101,34 +174,29 @@ class OrdersResource(Resource):
             order.user_id = json_data.get("user_id", order.user_id)
             order.received_date = json_data.get("received_date", order.received_date)
             order.taken_by = json_data.get("taken_by", order.taken_by)
-            order.taken_by_phone_no = json_data.get("received_date", order.taken_by_phone_no)
-
-            items_data = json_data.get("items", [])
-
-            # Clear old items
-            PurchaseOrder.query.filter_by(order_id=order.id).delete()
-
-            # Add new items
-            for item in items_data:
-                medicine_id = item.get("medicine_id")
-                quantity = item.get("quantity")
-                order_date = item.get("order_date")
+            order.taken_by_phone_no = json_data.get("taken_by_phone_no", order.taken_by_phone_no)
 
-                if not Medicine.query.get(medicine_id):
-                    db.session.rollback()
-                    return {"error": f"Medicine ID {medicine_id} not found"}, 404
+            if "items" in json_data:
+                items = parse_items(json_data.get("items") or [])
+                if items:
+                    check_medicines(items)
+                db.session.flush()
+                sync_items(order.id, items)
 
-                new_item = PurchaseOrder(
-                    order_id=order.id,
-                    medicine_id=medicine_id,
-                    quantity=quantity,
-                    order_date=order_date
-                )
-                db.session.add(new_item)
+                set_order_total(order.id, allocated_cost(order.id))
 
             db.session.commit()
             return order_serializer.dump(order), 200
 
+        except LookupError as le:
+            db.session.rollback()
+            return {"error": str(le)}, 404
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+        except IntegrityError as ie:
+            db.session.rollback()
+            return {"error": str(ie.orig)}, 400
         except Exception as e:
             db.session.rollback()
             print(e)
@@ -144,6 +212,7 @@ class OrdersResource(Resource):
             if not order:
                 return {"error": "Order not found"}, 404
 
+            release([item.id for item in order.items])
             PurchaseOrder.query.filter_by(order_id=order.id).delete()
 
             db.session.delete(order)
@@ -0,0 +1,21 @@
+from flask import request
+from flask_restful import Resource
+from sqlalchemy import select
+
+from Models.Users import User
+from Services.PatientTimeline import timeline
+from extensions import db
+
+
+class PatientTimeline(Resource):
+    def get(self, patient_id):
+        # ?limit=50&cursor=...&types=lab_request,lab_report
+        try:
+            if db.session.execute(select(User.id).where(User.id == patient_id)).scalar() is None:
+                return {"error": "Patient not found"}, 404
+            return timeline(patient_id, request.args), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
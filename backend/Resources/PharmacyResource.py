@@ -3,13 +3,16 @@ from flask_restful import Resource
 from sqlalchemy.exc import IntegrityError
 from extensions import db
 from Models.Pharmacy import Pharmacy
-from Serializers.PharmacySerializer import pharmacy_serializer, pharmacy_serializers\
+from Serializers.PharmacySerializer import pharmacy_serializer, pharmacy_serializers
+from Utils.Pagination import list_response
 
 # Pharmacy Resource
 class Pharmacies(Resource):
     def get(self):
         try:
-            return pharmacy_serializers.dump(Pharmacy.query.all()), 200
+            return list_response(Pharmacy, pharmacy_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
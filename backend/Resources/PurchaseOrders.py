@@ -4,13 +4,17 @@ from sqlalchemy.exc import IntegrityError
 from Models.PurchaseOrder import PurchaseOrder
 from Models.Medicine import Medicine
 from Serializers.PurchaseOrderSerializer import purchase_order_serializer, purchase_order_serializers
+from Services.StockAllocation import allocate_items, release
+from Utils.Pagination import list_response
 from extensions import db
 
 
 class PurchaseOrders(Resource):
     def get(self):
         try:
-            return purchase_order_serializers.dump(PurchaseOrder.query.all()), 200
+            return list_response(PurchaseOrder, purchase_order_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -27,6 +31,8 @@ class PurchaseOrders(Resource):
 
             order = PurchaseOrder(**json_data)
             db.session.add(order)
+            db.session.flush()
+            allocate_items([order.id])
             db.session.commit()
             return purchase_order_serializer.dump(order), 201
 
@@ -51,9 +57,21 @@ class PurchaseOrders(Resource):
         if not order:
             return {"error": "Order not found"}, 404
 
+        reallocate = any(key in json_data for key in ('medicine_id', 'quantity'))
+        if reallocate:
+            release([order.id])
+
         for key, value in json_data.items():
             if hasattr(order, key):
                 setattr(order, key, value)
+
+        if reallocate:
+            db.session.flush()
+            try:
+                allocate_items([order.id])
+            except ValueError as ve:
+                db.session.rollback()
+                return {"error": str(ve)}, 400
         db.session.commit()
         return purchase_order_serializer.dump(order), 200
 
@@ -66,6 +84,7 @@ class PurchaseOrders(Resource):
         if not order:
             return {"error": "Order not found"}, 404
 
+        release([order.id])
         db.session.delete(order)
         db.session.commit()
         return {"message": "Order deleted successfully"}, 200
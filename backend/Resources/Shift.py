@@ -3,13 +3,17 @@ from flask_restful import Resource
 
 from Models.Shifts import Shifts
 from Serializers.ShiftsSerializers import shifts_serializer, shifts_serializers
+from Utils.ReferenceCache import shifts
+from Utils.Pagination import list_response
 from extensions import db
 
 
 class Shift(Resource):
     def get(self):
         try:
-            return shifts_serializers.dump(Shifts.query.all())
+            return list_response(Shifts, shifts_serializers)
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -25,6 +29,7 @@ class Shift(Resource):
 
             db.session.add(shift)
             db.session.commit()
+            shifts.invalidate()
 
             return shifts_serializer.load(shift)
 
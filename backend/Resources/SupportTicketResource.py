@@ -2,11 +2,15 @@ from flask import request
 from flask_restful import Resource
 from Models.SupportTicket import SupportTicket
 from Serializers.SupportTicketSerializer import support_ticket_serializer, support_ticket_serializers
+from Utils.Pagination import list_response
 from extensions import db
 
 class SupportTickets(Resource):
     def get(self):
-        return support_ticket_serializers.dump(SupportTicket.query.all()), 200
+        try:
+            return list_response(SupportTicket, support_ticket_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
 
     def post(self):
         json_data = request.get_json(force=True)
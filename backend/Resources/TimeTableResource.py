@@ -1,20 +1,100 @@
+from datetime import datetime
+
 from flask import request
 from flask_restful import Resource
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from Models.Shifts import Shifts
 from Models.TimeTable import TimeTable
 from Models.Users import User
 from Serializers.TimeTableSerializer import time_table_serializers
+from Services.DutyRoster import duty_roster
+from Utils.Pagination import list_response
+from Utils.ReferenceCache import shifts
 from extensions import db
 
+ROSTER_CHUNK_SIZE = 1000
+ROSTER_DATE_FORMATS = ('%Y-%m-%d', '%d-%m-%Y')
+
+
+def parse_roster_date(value):
+    for date_format in ROSTER_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD")
+
+
+def parse_roster(json_data):
+    """
+    Flatten {date: {"time_table": [{"user_ids": [...], "shift_id": id}]}} into
+    {(user_id, date): shift_id}. A user listed twice for a day keeps the last
+    shift; the number of such duplicates is returned alongside.
+    """
+    if not isinstance(json_data, dict):
+        raise ValueError("Payload not well formed")
+
+    rows, duplicates = {}, 0
+    for key, values in json_data.items():
+        day = parse_roster_date(key)
+        time_table = values.get('time_table') if isinstance(values, dict) else None
+        if not time_table or not isinstance(time_table, list):
+            raise ValueError("Payload not well formed")
+
+        for entry in time_table:
+            user_ids = entry.get('user_ids') if isinstance(entry, dict) else None
+            shift_id = entry.get('shift_id') if isinstance(entry, dict) else None
+            if not user_ids or not isinstance(user_ids, list) or not isinstance(shift_id, int) \
+                    or not all(isinstance(user_id, int) for user_id in user_ids):
+                raise ValueError("Payload not well formed")
+
+            for user_id in user_ids:
+                if (user_id, day) in rows:
+                    duplicates += 1
+                rows[(user_id, day)] = shift_id
+    return rows, duplicates
+
+
+def validate_roster(rows):
+    user_ids = {user_id for user_id, _ in rows}
+    found = set(db.session.execute(select(User.id).where(User.id.in_(user_ids))).scalars())
+    missing = sorted(user_ids - found)
+    if missing:
+        raise ValueError(f"Users not found: {', '.join(map(str, missing))}")
+
+    missing = sorted({shift_id for shift_id in rows.values() if not shifts.get(shift_id)})
+    if missing:
+        raise ValueError(f"Shifts not found: {', '.join(map(str, missing))}")
+
+
+def write_roster(rows):
+    """
+    Upsert the roster on (user_id, date) with multi-row INSERT ... ON CONFLICT
+    statements, so uploading the same roster again only rewrites the shifts.
+    """
+    now = datetime.utcnow()
+    values = [{"user_id": user_id, "date": day, "shift_id": shift_id, "created_at": now, "updated_at": now}
+              for (user_id, day), shift_id in sorted(rows.items())]
+
+    for start in range(0, len(values), ROSTER_CHUNK_SIZE):
+        statement = pg_insert(TimeTable).values(values[start:start + ROSTER_CHUNK_SIZE])
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=[TimeTable.user_id, TimeTable.date],
+            set_={"shift_id": statement.excluded.shift_id, "updated_at": statement.excluded.updated_at},
+        ))
+    return len(values)
+
 
 class TimeTableResource(Resource):
     def get(self):
         try:
-            return time_table_serializers.dump(TimeTable.query.all())
+            return list_response(TimeTable, time_table_serializers)
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
-            return {"error": "Internal error occurred"}, 200
+            return {"error": "Internal error occurred"}, 500
 
     def post(self):
         try:
@@ -24,21 +104,10 @@ class TimeTableResource(Resource):
                 return {"error": "No data sent"}, 400
 
             # json_data = {
-            #     "1-9-2024": {
+            #     "2024-09-01": {
             #         "time_table": [
             #             {
-            #                 "users": [1, 2, 3],
-            #                 "shift_id": 1
-            #             },
-            #             {
-            #                 "users": [4, 5, 6],
-            #                 "shift_id": 2
-            #             },
-            #         ]
-            #     },"2-9-2024": {
-            #         "time_table": [
-            #             {
-            #                 "users": [1, 2, 3],
+            #                 "user_ids": [1, 2, 3],
             #                 "shift_id": 1
             #             },
             #             {
@@ -46,52 +115,17 @@ class TimeTableResource(Resource):
             #                 "shift_id": 2
             #             },
             #         ]
-            #     }
+            #     },
+            #     "2024-09-02": {...}
             # }
 
-            final_object = []
-            for key, values in json_data.items():
-                if not values['time_table'] or isinstance(values['time_table'], list):
-                    raise ValueError(f"Payload not well formed")
-
-                users_list = []
-                shifts = []
-                for timetable in values['time_table']:
-                    if not timetable['user_ids'] or not isinstance(timetable['user_ids'], dict) or not timetable['shift_id'] or not isinstance(timetable['shift_id'], int):
-                        raise ValueError("Payload not well formed")
-
-                    users_list.append(timetable['user_ids'])
-                    shifts.append(timetable['shift_id'])
-                    for user_id in timetable['user_ids']:
-                        final_object.append({
-                            "date": key,
-                            "user_id": user_id,
-                            "shift_id": timetable['shift_id']
-                        })
-
-                # if (user_id for user_id in users_list if users_list.count(user_id) > 1):
-                #     raise ValueError("Payload not well formed")
-                # if (shift_id for shift_id in shifts if users_list.count(shift_id) > 1):
-                #     raise ValueError("Payload not well formed")
-
-                users = User.query.filter(User.id.in_(set(users_list))).all()
-
-                if len(users) != len(users_list):
-                    raise ValueError("One of the user not found")
-
-                shifts_data = Shifts.query.filter(Shifts.id.in_(set(shifts))).all()
-
-                if len(shifts_data) != len(shifts):
-                    raise ValueError("One of the shift not found")
-
-            for record in final_object:
-                inserted_record = TimeTable(record)
-
-                db.session.add(inserted_record)
-
+            rows, duplicates = parse_roster(json_data)
+            validate_roster(rows)
+            written = write_roster(rows)
             db.session.commit()
+            duty_roster.invalidate_days({day for _, day in rows})
 
-            return {}
+            return {"rows": written, "duplicates": duplicates}, 201
         except ValueError as ve:
             db.session.rollback()
             print(ve)
@@ -100,4 +134,4 @@ class TimeTableResource(Resource):
         except Exception as e:
             db.session.rollback()
             print(e)
-            return {"error": "Internal error occurred"}, 500
\ No newline at end of file
+            return {"error": "Internal error occurred"}, 500
@@ -3,19 +3,45 @@ from flask_restful import Resource
 from sqlalchemy.exc import IntegrityError
 
 from Models.UserField import UserField
-from Models.UserExtraFields import UserExtraFields
-from Models.Users import User
 from Serializers.UserFieldSerializers import user_field_serializers, user_field_serializer
+from Services.UserFieldMigration import BACKGROUND_THRESHOLD, apply_field_change, count_type_users, \
+    field_has_values, get_migration, list_migrations, start_background_migration
+from Utils.Pagination import list_response
 from extensions import db
 
 
+def run_field_changes(changes):
+    """
+    Apply (user_type_id, operation, *args) changes to the users' extra fields.
+    Small user types are changed inline in the current transaction, the rest
+    are returned so they can be started as background migrations after commit.
+    """
+    deferred = []
+    for user_type_id, operation, *args in changes:
+        if count_type_users(user_type_id) > BACKGROUND_THRESHOLD:
+            deferred.append((user_type_id, operation, *args))
+        else:
+            apply_field_change(user_type_id, operation, *args)
+    return deferred
+
+
+def field_response(user_field, deferred, status):
+    if not deferred:
+        return user_field_serializer.dump(user_field), status
+
+    migrations = [start_background_migration(*change) for change in deferred]
+    return {**user_field_serializer.dump(user_field), "migrations": migrations}, 202
+
+
 class UserFields(Resource):
     def get(self):
         try:
-            return user_field_serializers.dump(UserField.query.all()), 200
+            return list_response(UserField, user_field_serializers), 200
 
         except IntegrityError as ie:
             return {"error": "Database integrity error: " + str(ie.orig)}, 400
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -32,23 +58,10 @@ class UserFields(Resource):
             db.session.flush()
 
             # ✅ Add this field for all users of that user_type
-            user_type_id = json_data.get("user_type")
-            users = User.query.filter_by(user_type_id=user_type_id, is_active=True).all()
-
-            for user in users:
-                user_extra_fields_data = UserExtraFields.query.filter_by(user_id=user.id).first()
-                if user_extra_fields_data:
-                    setattr(user_extra_fields_data, 'fields_data', {**user_extra_fields_data.fields_data, json_data.get('field_name'): None})
-                else:
-                    extra_field = UserExtraFields(
-                        user_id=user.id,
-                        # field_id=user_field_data.id,
-                        fields_data={json_data.get('field_name'): None}
-                    )
-                    db.session.add(extra_field)
+            deferred = run_field_changes([(user_field_data.user_type, 'add', user_field_data.field_name)])
 
             db.session.commit()
-            return user_field_serializer.dump(user_field_data), 201
+            return field_response(user_field_data, deferred, 201)
 
         except ValueError as ve:
             db.session.rollback()
@@ -75,35 +88,23 @@ class UserFields(Resource):
             if not user_field:
                 return {"error": "Field not found"}, 404
 
-            user_type_id = json_data.get("user_type")
-            users = User.query.filter_by(user_type_id=user_type_id, is_active=True).all()
-
-            print(users)
-
-            for user in users:
-                user_extra_fields_data = UserExtraFields.query.filter_by(user_id=user.id).first()
-                if user_extra_fields_data:
-                    extra_fields_data = user_extra_fields_data.fields_data
-                    if user_field.field_name in extra_fields_data:
-                        del extra_fields_data[user_field.field_name]
-                    setattr(user_extra_fields_data, 'fields_data',
-                            {**extra_fields_data})
-                else:
-                    extra_field = UserExtraFields(
-                        user_id=user.id,
-                        # field_id=user_field_data.id,
-                        fields_data={json_data.get('field_name'): None}
-                    )
-                    db.session.add(extra_field)
+            old_user_type, old_field_name = user_field.user_type, user_field.field_name
 
             # ✅ Update all editable fields
             for key, value in json_data.items():
                 if hasattr(user_field, key):
                     setattr(user_field, key, value)
 
+            changes = []
+            if user_field.user_type != old_user_type:
+                changes = [(old_user_type, 'remove', old_field_name),
+                           (user_field.user_type, 'add', user_field.field_name)]
+            elif user_field.field_name != old_field_name:
+                changes = [(old_user_type, 'rename', old_field_name, user_field.field_name)]
+            deferred = run_field_changes(changes)
 
             db.session.commit()
-            return user_field_serializer.dump(user_field), 200
+            return field_response(user_field, deferred, 200)
 
         except ValueError as ve:
             db.session.rollback()
@@ -130,16 +131,17 @@ class UserFields(Resource):
             if not user_field:
                 return {"error": "Field not found"}, 404
 
-            users = User.query.filter_by(user_type_id=user_field.user_type).all()
-            for user in users:
-                user_extra_fields_data = UserExtraFields.query.filter_by(user_id=user.id).first()
-                if user_extra_fields_data and user_extra_fields_data.fields_data:
-                    return {"error": "Cannot delete as this field is linked to user(s)"}, 400
+            if field_has_values(user_field.user_type, user_field.field_name):
+                return {"error": "Cannot delete as this field is linked to user(s)"}, 400
 
-            UserField.query.filter_by(id=field_id).delete()
+            deferred = run_field_changes([(user_field.user_type, 'remove', user_field.field_name)])
 
             db.session.delete(user_field)
             db.session.commit()
+
+            migrations = [start_background_migration(*change) for change in deferred]
+            if migrations:
+                return {"message": "Field deleted successfully", "migrations": migrations}, 202
             return {"message": "Field deleted successfully"}, 200
 
         except IntegrityError as ie:
@@ -149,3 +151,15 @@ class UserFields(Resource):
             db.session.rollback()
             print(e)
             return {"error": "Internal server error"}, 500
+
+
+class UserFieldMigrations(Resource):
+    def get(self):
+        migration_id = request.args.get("id")
+        if not migration_id:
+            return list_migrations(), 200
+
+        migration = get_migration(migration_id)
+        if not migration:
+            return {"error": "Migration not found"}, 404
+        return migration, 200
@@ -6,15 +6,21 @@ import logging
 from Models.UserType import UserType
 from Models.Users import User
 from Serializers.UserTypeSerializer import user_type_serializers, user_type_serializer
+from Utils.ConditionalGet import conditional_get
+from Utils.Pagination import list_response
+from Utils.ReferenceCache import user_types
 from extensions import db
 
 logger = logging.getLogger(__name__)
 
 class UserTypes(Resource):
+    @conditional_get(UserType, user_type_serializers)
     def get(self):
         try:
-            user_types = UserType.query.filter_by(is_active=True).all()
-            return user_type_serializers.dump(user_types), 200
+            query = UserType.query.filter_by(is_active=True)
+            return list_response(UserType, user_type_serializers, query), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             logger.exception("Error fetching user types")
             return {"error": "Internal error occurred"}, 500
@@ -28,6 +34,7 @@ class UserTypes(Resource):
             new_user_type = UserType(**json_data)
             db.session.add(new_user_type)
             db.session.commit()
+            user_types.invalidate()
 
             return user_type_serializer.dump(new_user_type), 201
 
@@ -62,6 +69,7 @@ class UserTypes(Resource):
                     setattr(user_type, key, value)
 
             db.session.commit()
+            user_types.invalidate()
             return user_type_serializer.dump(user_type), 200
 
         except ValueError as ve:
@@ -93,6 +101,7 @@ class UserTypes(Resource):
 
             user_type.is_active = False
             db.session.commit()
+            user_types.invalidate()
 
             return {"message": "User type deactivated successfully"}, 200
 
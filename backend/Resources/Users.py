@@ -1,3 +1,5 @@
+import csv
+
 import requests
 from flask import request
 from flask_restful import Resource
@@ -8,6 +10,9 @@ from Models.UserExtraFields import UserExtraFields
 from Models.UserField import UserField
 from Models.Users import User
 from Serializers.UserSerializers import user_serializers, user_serializer
+from Services.DutyRoster import duty_roster
+from Services.UserImport import UserImporter, read_rows
+from Utils.Pagination import list_response
 from extensions import db
 
 
@@ -15,7 +20,6 @@ class Users(Resource):
     def get(self):
         try:
             user_id = request.args.get('user_id', type=int)
-            user_type_id = request.args.get('user_type_id')
 
             if user_id:
                 user = User.query.get(user_id)
@@ -23,14 +27,11 @@ class Users(Resource):
                     return {"error": "User not found"}, 404
                 return user_serializers.dump(user), 200
 
-            if user_type_id:
-                users = User.query.filter_by(user_type_id=user_type_id).all()
-                return user_serializers.dump(users, many=True), 200
-
-            # If no filters, return all users
-            users = User.query.all()
-            return user_serializers.dump(users), 200
+            # user_type_id and the other FILTER_FIELDS are applied by list_response
+            return list_response(User, user_serializers), 200
 
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except IntegrityError as ie:
             return {"error": "Database integrity error: " + str(ie.orig)}, 400
         except Exception as e:
@@ -49,6 +50,7 @@ class Users(Resource):
             json_data['password'] = "Password124"
 
             user = User(**json_data)
+            user.check_unique_identity()
             db.session.add(user)
             db.session.flush()
 
@@ -66,6 +68,7 @@ class Users(Resource):
             ))
 
             db.session.commit()
+            duty_roster.invalidate_days()
             return user_serializer.dump(user), 201
 
         except ValueError as ve:
@@ -97,7 +100,9 @@ class Users(Resource):
                 if hasattr(user, key) and key != "extra_fields":
                     setattr(user, key, value)
 
+            user.check_unique_identity()
             db.session.commit()
+            duty_roster.invalidate_days()
 
             extra_fields_data = json_data.pop('extra_fields', {})
 
@@ -177,4 +182,27 @@ class Users(Resource):
         except Exception as e:
             db.session.rollback()
             print(e)
-            return {"error": "Internal server error", "details": str(e)}, 500
\ No newline at end of file
+            return {"error": "Internal server error", "details": str(e)}, 500
+
+class UsersBulk(Resource):
+    def post(self):
+        try:
+            data_format = request.args.get('format')
+            if not data_format:
+                data_format = 'csv' if 'csv' in (request.content_type or '') else 'ndjson'
+            if data_format not in ('csv', 'ndjson'):
+                return {"error": "format must be csv or ndjson"}, 400
+
+            report = UserImporter().run(read_rows(request.stream, data_format))
+            return report, 201 if report["inserted"] and not report["failed"] else 200
+
+        except UnicodeDecodeError:
+            db.session.rollback()
+            return {"error": "Input must be UTF-8 encoded"}, 400
+        except csv.Error as ce:
+            db.session.rollback()
+            return {"error": "Invalid CSV: " + str(ce)}, 400
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal server error"}, 500
@@ -3,13 +3,17 @@ from flask_restful import Resource
 
 from Models.WardUsers import WardUser
 from Serializers.WardUserSerializers import ward_user_serializers, ward_user_serializer
+from Services.DutyRoster import duty_roster
+from Utils.Pagination import list_response
 from extensions import db
 
 
 class WardUsers(Resource):
     def get(self):
         try:
-            return ward_user_serializers.dump(WardUser.query.all()), 200
+            return list_response(WardUser, ward_user_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -19,18 +23,21 @@ class WardUsers(Resource):
             json_data = request.get_json(force=True)
 
             if not json_data:
-                return {"error", "No data sent"}, 400
+                return {"error": "No data sent"}, 400
 
             ward_user = WardUser(**json_data)
 
             db.session.add(ward_user)
             db.session.commit()
+            duty_roster.invalidate_members()
 
-            return ward_user_serializer.load(ward_user), 201
+            return ward_user_serializer.dump(ward_user), 201
         except ValueError as ve:
+            db.session.rollback()
             print(ve)
             return {"error": str(ve)}, 400
 
         except Exception as e:
+            db.session.rollback()
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -1,14 +1,23 @@
 from flask import request
 from flask_restful import Resource
 from sqlalchemy.exc import IntegrityError
+from Models.Admissions import Admission
+from Models.Beds import Bed
 from Models.Wards import Ward
+from Serializers.BedSerializer import bed_serializer, bed_serializers
 from Serializers.WardSerializer import ward_serializer, ward_serializers
+from Services.Admissions import occupancy
+from Utils.ConditionalGet import conditional_get
+from Utils.Pagination import list_response
 from extensions import db
 
 class Wards(Resource):
+    @conditional_get(Ward, ward_serializers)
     def get(self):
         try:
-            return ward_serializers.dump(Ward.query.all()), 200
+            return list_response(Ward, ward_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
         except Exception as e:
             print(e)
             return {"error": "Internal error occurred"}, 500
@@ -50,7 +59,8 @@ class Wards(Resource):
                 return {"error": "Ward not found"}, 404
 
             for key, value in json_data.items():
-                if hasattr(ward, key):
+                # occupied is only moved by admissions, transfers and discharges
+                if hasattr(ward, key) and key != "occupied":
                     setattr(ward, key, value)
 
             db.session.commit()
@@ -91,3 +101,83 @@ class Wards(Resource):
             db.session.rollback()
             print(e)
             return {"error": "Internal error occurred"}, 500
+
+
+class WardOccupancy(Resource):
+    def get(self):
+        try:
+            return occupancy(request.args.get("department_id", type=int)), 200
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+
+class Beds(Resource):
+    def get(self):
+        try:
+            return list_response(Bed, bed_serializers), 200
+        except ValueError as ve:
+            return {"error": str(ve)}, 400
+        except Exception as e:
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+    def post(self):
+        try:
+            json_data = request.get_json(force=True)
+            if not json_data:
+                return {"error": "No input data provided"}, 400
+
+            bed = Bed(**json_data)
+            db.session.add(bed)
+            db.session.commit()
+
+            return bed_serializer.dump(bed), 201
+
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+
+        except IntegrityError as ie:
+            db.session.rollback()
+            return {"error": f"Database integrity error: {str(ie.orig)}"}, 400
+
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
+
+    def put(self):
+        try:
+            json_data = request.get_json(force=True)
+            bed_id = json_data.get("id")
+            if not bed_id:
+                return {"error": "Bed ID is required"}, 400
+
+            bed = Bed.query.get(bed_id)
+            if not bed:
+                return {"error": "Bed not found"}, 404
+
+            moved = json_data.get("ward_id", bed.ward_id) != bed.ward_id
+            if moved and Admission.query.filter_by(bed_id=bed.id, discharged_at=None).first():
+                return {"error": "Bed is occupied, transfer the patient first"}, 409
+
+            for key, value in json_data.items():
+                if hasattr(bed, key):
+                    setattr(bed, key, value)
+
+            db.session.commit()
+            return bed_serializer.dump(bed), 200
+
+        except ValueError as ve:
+            db.session.rollback()
+            return {"error": str(ve)}, 400
+
+        except IntegrityError as ie:
+            db.session.rollback()
+            return {"error": f"Database integrity error: {str(ie.orig)}"}, 400
+
+        except Exception as e:
+            db.session.rollback()
+            print(e)
+            return {"error": "Internal error occurred"}, 500
@@ -0,0 +1,22 @@
+from extensions import ma
+from Models.Admissions import Admission, AdmissionEvent
+
+class AdmissionEventSerializer(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = AdmissionEvent
+        load_instance = True
+        include_fk = True
+
+
+class AdmissionSerializer(ma.SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['events']
+
+    class Meta:
+        model = Admission
+        load_instance = True
+        include_fk = True
+
+    events = ma.Nested(AdmissionEventSerializer, many=True, dump_only=True)
+
+admission_serializer = AdmissionSerializer()
+admission_serializers = AdmissionSerializer(many=True)
@@ -0,0 +1,11 @@
+from extensions import ma
+from Models.Beds import Bed
+
+class BedSerializer(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = Bed
+        load_instance = True
+        include_fk = True
+
+bed_serializer = BedSerializer()
+bed_serializers = BedSerializer(many=True)
@@ -3,6 +3,8 @@ from Serializers.UserSerializers import user_serializer
 from extensions import ma
 
 class DepartmentSerializer(ma.SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['creator']
+
     class Meta:
         model = Department
         load_instance = True
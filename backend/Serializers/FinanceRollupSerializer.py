@@ -0,0 +1,15 @@
+from extensions import ma
+from Models.FinanceRollup import FinanceRollup
+
+
+class FinanceRollupSerializer(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = FinanceRollup
+        load_instance = True
+        exclude = ('id',)
+
+    total_amount = ma.Float()
+
+
+finance_rollup_serializer = FinanceRollupSerializer()
+finance_rollup_serializers = FinanceRollupSerializer(many=True)
@@ -5,6 +5,8 @@ from Models.Invoice import Invoice
 
 
 class InvoiceSerializer(ma.SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['creator', 'order']
+
     creator = ma.Nested(user_serializer, dump_only=True)
     order = ma.Nested(order_serializer, dump_only=True)
 
@@ -6,6 +6,8 @@ from Models.LabReport import LabReport
 
 
 class LabReportSerializer(ma.SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['lab_request']
+
     lab_request = fields.Nested(LabRequestSerializer, many=False)
 
     class Meta:
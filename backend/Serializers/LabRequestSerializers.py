@@ -8,6 +8,9 @@ from Models.LabRequest import LabRequest
 
 
 class LabRequestSerializer(SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['test', 'patient', 'requester']
+    FAST_DUMP = True
+
     test = fields.Nested(LabTestSerializer, many=False)
     patient = fields.Nested(UserSchema, many=False)
     requester = fields.Nested(UserSchema, many=False)
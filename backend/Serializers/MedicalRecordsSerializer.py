@@ -3,6 +3,8 @@ from Serializers.UserSerializers import user_serializer
 from extensions import ma
 
 class MedicalRecordsSerializer(ma.SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['user']
+
     user = ma.Nested(user_serializer, dump_only=True)
 
     class Meta:
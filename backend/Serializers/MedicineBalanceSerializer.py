@@ -0,0 +1,16 @@
+from extensions import ma
+from Models.MedicineBalance import MedicineBalance
+from Serializers.MedicineSerializer import medicine_serializer
+
+class MedicineBalanceSerializer(ma.SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['medicine']
+
+    medicine = ma.Nested(medicine_serializer, dump_only=True)
+
+    class Meta:
+        model = MedicineBalance
+        load_instance = True
+        include_fk = True
+
+medicine_balance_serializer = MedicineBalanceSerializer()
+medicine_balance_serializers = MedicineBalanceSerializer(many=True)
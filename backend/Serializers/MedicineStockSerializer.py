@@ -3,6 +3,8 @@ from Models.MedicineStock import MedicineStock
 from Serializers.MedicineSerializer import medicine_serializer
 
 class MedicineStockSerializer(ma.SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['medicine']
+
     medicine = ma.Nested(medicine_serializer, dump_only=True)
 
     class Meta:
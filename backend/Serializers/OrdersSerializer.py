@@ -4,6 +4,8 @@ from Serializers.UserSerializers import user_serializer
 from extensions import ma
 
 class OrdersSerializer(ma.SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['user', 'items']
+
     user = ma.Nested(user_serializer, dump_only=True)
     items = ma.Nested(purchase_order_serializer, many=True, dump_only=True)  # <-- include items here
     # purchase_orders = ma.Nested(purchase_order_serializer, many=True, dump_only=True)
@@ -3,6 +3,8 @@ from Models.PurchaseOrder import PurchaseOrder
 from Serializers.MedicineSerializer import medicine_serializer
 
 class PurchaseOrderSerializer(ma.SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['medicine']
+
     medicine = ma.Nested(medicine_serializer, dump_only=True)
 
     class Meta:
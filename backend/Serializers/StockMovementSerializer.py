@@ -0,0 +1,11 @@
+from extensions import ma
+from Models.StockMovement import StockMovement
+
+class StockMovementSerializer(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = StockMovement
+        load_instance = True
+        include_fk = True
+
+stock_movement_serializer = StockMovementSerializer()
+stock_movement_serializers = StockMovementSerializer(many=True)
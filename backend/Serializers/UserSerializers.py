@@ -13,6 +13,9 @@ class UserExtraFieldsSchema(SQLAlchemyAutoSchema):
         include_fk = True
 
 class UserSchema(SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['user_type', 'extra_fields']
+    FAST_DUMP = True
+
     extra_fields = fields.Nested(UserExtraFieldsSchema, many=False)
     user_type = fields.Nested(UserTypeSerializer, many=False)
 
@@ -20,6 +23,7 @@ class UserSchema(SQLAlchemyAutoSchema):
         model = User
         load_instance = True
         include_fk = True
+        load_only = ('password',)
 
 user_serializer = UserSchema()
 user_serializers = UserSchema(many=True)
@@ -4,6 +4,8 @@ from Serializers.DepartmentSerializers import department_serializer
 from Serializers.UserSerializers import user_serializer
 
 class WardSerializer(ma.SQLAlchemyAutoSchema):
+    EAGER_LOAD = ['creator', 'department']
+
     class Meta:
         model = Ward
         load_instance = True
@@ -0,0 +1,154 @@
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from Models.Admissions import Admission, AdmissionEvent, AdmissionEventTypeEnum
+from Models.Beds import Bed
+from Models.Users import User
+from Models.Wards import Ward
+from extensions import db
+
+
+class NoFreeBed(ValueError):
+    pass
+
+
+def _take_bed(ward_id):
+    """
+    Count one more patient in the ward. Check and increment are a single
+    UPDATE, so concurrent admissions can not push a ward over its capacity.
+    """
+    taken = db.session.execute(
+        update(Ward)
+        .where(Ward.id == ward_id, Ward.occupied < Ward.capacity)
+        .values(occupied=Ward.occupied + 1)
+        .returning(Ward.id)
+    ).scalar()
+    if taken is None:
+        if db.session.execute(select(Ward.id).where(Ward.id == ward_id)).scalar() is None:
+            raise LookupError("Ward not found")
+        raise NoFreeBed("Ward is full")
+
+
+def _free_bed(ward_id):
+    db.session.execute(
+        update(Ward)
+        .where(Ward.id == ward_id, Ward.occupied > 0)
+        .values(occupied=Ward.occupied - 1)
+    )
+
+
+def _check_bed(bed_id, ward_id, admission_id=None):
+    if bed_id is None:
+        return
+    bed = db.session.execute(select(Bed.ward_id, Bed.is_active).where(Bed.id == bed_id)).first()
+    if not bed:
+        raise LookupError("Bed not found")
+    if bed.ward_id != ward_id:
+        raise ValueError("Bed does not belong to the ward")
+    if not bed.is_active:
+        raise ValueError("Bed is not in use")
+
+    # friendly message for the common case, the partial unique index settles races
+    query = select(Admission.id).where(Admission.bed_id == bed_id, Admission.discharged_at.is_(None))
+    if admission_id:
+        query = query.where(Admission.id != admission_id)
+    if db.session.execute(query).first():
+        raise NoFreeBed("Bed is already occupied")
+
+
+def _open_admission(admission_id):
+    # the row lock serializes transfers and discharges of one admission
+    admission = db.session.execute(
+        select(Admission).where(Admission.id == admission_id).with_for_update()
+    ).scalar_one_or_none()
+    if not admission:
+        raise LookupError("Admission not found")
+    if admission.discharged_at:
+        raise ValueError("Admission is already discharged")
+    return admission
+
+
+def _event(admission, event_type, from_ward_id=None, from_bed_id=None, performed_by=None, note=None):
+    discharged = event_type == AdmissionEventTypeEnum.DISCHARGE
+    db.session.add(AdmissionEvent(
+        admission=admission,
+        event_type=event_type,
+        from_ward_id=from_ward_id,
+        from_bed_id=from_bed_id,
+        to_ward_id=None if discharged else admission.ward_id,
+        to_bed_id=None if discharged else admission.bed_id,
+        performed_by=performed_by,
+        note=note,
+    ))
+
+
+def admit(patient_id, ward_id, bed_id=None, admitted_by=None, reason=None):
+    if db.session.execute(select(User.id).where(User.id == patient_id)).scalar() is None:
+        raise LookupError("Patient not found")
+    _check_bed(bed_id, ward_id)
+    _take_bed(ward_id)
+
+    admission = Admission(patient_id=patient_id, ward_id=ward_id, bed_id=bed_id,
+                          admitted_by=admitted_by, reason=reason)
+    db.session.add(admission)
+    _event(admission, AdmissionEventTypeEnum.ADMIT, performed_by=admitted_by, note=reason)
+    db.session.flush()
+    return admission
+
+
+def transfer(admission_id, ward_id=None, bed_id=None, performed_by=None, note=None):
+    admission = _open_admission(admission_id)
+    from_ward_id, from_bed_id = admission.ward_id, admission.bed_id
+    ward_id = ward_id or from_ward_id
+    if ward_id == from_ward_id and bed_id == from_bed_id:
+        raise ValueError("Patient is already in this ward and bed")
+    _check_bed(bed_id, ward_id, admission.id)
+
+    if ward_id != from_ward_id:
+        # touch the two ward rows in id order so crossing transfers can not deadlock
+        for changed_ward_id in sorted((ward_id, from_ward_id)):
+            if changed_ward_id == ward_id:
+                _take_bed(ward_id)
+            else:
+                _free_bed(from_ward_id)
+
+    admission.ward_id = ward_id
+    admission.bed_id = bed_id
+    _event(admission, AdmissionEventTypeEnum.TRANSFER, from_ward_id, from_bed_id, performed_by, note)
+    db.session.flush()
+    return admission
+
+
+def discharge(admission_id, performed_by=None, note=None):
+    admission = _open_admission(admission_id)
+    _free_bed(admission.ward_id)
+
+    admission.discharged_at = datetime.utcnow()
+    _event(admission, AdmissionEventTypeEnum.DISCHARGE, admission.ward_id, admission.bed_id, performed_by, note)
+    db.session.flush()
+    return admission
+
+
+def occupancy(department_id=None):
+    """
+    Free beds per ward and per department, read from the ward counters with
+    one query on ix_ward_department_id_occupancy.
+    """
+    query = select(Ward.id, Ward.name, Ward.department_id, Ward.capacity, Ward.occupied) \
+        .order_by(Ward.department_id, Ward.id)
+    if department_id is not None:
+        query = query.where(Ward.department_id == department_id)
+
+    wards, departments = [], {}
+    for row in db.session.execute(query):
+        wards.append({"ward_id": row.id, "name": row.name, "department_id": row.department_id,
+                      "capacity": row.capacity, "occupied": row.occupied,
+                      "free": row.capacity - row.occupied})
+        totals = departments.setdefault(row.department_id, {
+            "department_id": row.department_id, "capacity": 0, "occupied": 0, "free": 0})
+        totals["capacity"] += row.capacity
+        totals["occupied"] += row.occupied
+        totals["free"] += row.capacity - row.occupied
+
+    return {"wards": wards, "departments": list(departments.values())}
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import or_, select
+
+from Models.DepartmentUsers import DepartmentUser
+from Models.TimeTable import TimeTable
+from Models.Users import User
+from Models.WardUsers import WardUser
+from Utils.ReferenceCache import shifts
+from extensions import db
+
+CACHE_TTL_SECONDS = 300
+MAX_CACHED_DAYS = 14
+
+OnDutyUser = namedtuple('OnDutyUser', ['id', 'name', 'user_type_id', 'shift_id'])
+
+
+class DutyRoster:
+    """
+    In memory "who works when" index.
+
+    Every cached day maps shift_id -> users working that shift, taken from the
+    TimeTable roster with the user's default shift as fallback. Ward and
+    department memberships are kept as user id sets. Writers invalidate a
+    single day (roster uploads) or the memberships (ward/department users);
+    everything also expires after CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._days = OrderedDict()
+        self._members = None
+
+    def _expired(self, loaded_at):
+        return time.monotonic() - loaded_at > CACHE_TTL_SECONDS
+
+    def _load_day(self, day):
+        rostered = {row.user_id: row.shift_id for row in db.session.execute(
+            select(TimeTable.user_id, TimeTable.shift_id).where(TimeTable.date == day))}
+
+        # staff with a default shift or a roster entry that day, patients have neither
+        by_shift = {}
+        for row in db.session.execute(
+                select(User.id, User.name, User.user_type_id, User.shift_id)
+                .where(User.is_active.is_(True),
+                       or_(User.shift_id.isnot(None),
+                           User.id.in_(select(TimeTable.user_id).where(TimeTable.date == day))))):
+            shift_id = rostered.get(row.id, row.shift_id)
+            if shift_id:
+                by_shift.setdefault(shift_id, []).append(OnDutyUser(row.id, row.name, row.user_type_id, shift_id))
+        return by_shift
+
+    def _load_members(self):
+        wards, departments = {}, {}
+        for ward_id, user_id in db.session.execute(select(WardUser.ward_id, WardUser.user_id)):
+            wards.setdefault(ward_id, set()).add(user_id)
+        for department_id, user_id in db.session.execute(select(DepartmentUser.department_id, DepartmentUser.user_id)):
+            departments.setdefault(department_id, set()).add(user_id)
+        return {"wards": wards, "departments": departments}
+
+    def _day(self, day):
+        with self._lock:
+            cached = self._days.get(day)
+            if cached and not self._expired(cached[0]):
+                self._days.move_to_end(day)
+                return cached[1]
+
+        by_shift = self._load_day(day)
+        with self._lock:
+            self._days[day] = (time.monotonic(), by_shift)
+            self._days.move_to_end(day)
+            while len(self._days) > MAX_CACHED_DAYS:
+                self._days.popitem(last=False)
+        return by_shift
+
+    def _memberships(self):
+        with self._lock:
+            if self._members and not self._expired(self._members[0]):
+                return self._members[1]
+
+        members = self._load_members()
+        with self._lock:
+            self._members = (time.monotonic(), members)
+        return members
+
+    def on_duty(self, at, ward_id=None, department_id=None):
+        """
+        Users whose shift covers the datetime `at`, optionally limited to a ward
+        and/or department.
+        """
+        by_shift = self._day(at.date())
+        moment = at.time()
+
+        users = []
+        for shift_id, shift_users in by_shift.items():
+            shift = shifts.get(shift_id)
+            if shift and shift.start_time <= moment < shift.end_time:
+                users.extend(shift_users)
+
+        if ward_id is not None or department_id is not None:
+            members = self._memberships()
+            if ward_id is not None:
+                allowed = members["wards"].get(ward_id, set())
+                users = [user for user in users if user.id in allowed]
+            if department_id is not None:
+                allowed = members["departments"].get(department_id, set())
+                users = [user for user in users if user.id in allowed]
+
+        return sorted(users, key=lambda user: user.id)
+
+    def invalidate_days(self, days=None):
+        with self._lock:
+            if days is None:
+                self._days.clear()
+            for day in days or []:
+                self._days.pop(day, None)
+
+    def invalidate_members(self):
+        with self._lock:
+            self._members = None
+
+
+duty_roster = DutyRoster()
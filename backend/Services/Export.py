@@ -0,0 +1,114 @@
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from Models.Invoice import Invoice
+from Models.LabRequest import LabRequest
+from Models.MedicalRecords import MedicalRecords
+from Models.Orders import Orders
+from Utils.Pagination import apply_filters, parse_range
+from extensions import db
+
+EXPORTS = {
+    'invoices': Invoice,
+    'orders': Orders,
+    'lab-requests': LabRequest,
+    'medical-records': MedicalRecords,
+}
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+YIELD_PER = 2000
+FLUSH_BYTES = 64 * 1024
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _csv_value(value):
+    value = _plain(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return '' if value is None else value
+
+
+def export_query(model, args):
+    """
+    Every column of the model's table ordered by id, narrowed by the model's
+    FILTER_FIELDS and a from/to range on its DATE_RANGE_FIELD (created_at by default).
+    """
+    query = apply_filters(select(*model.__table__.columns), model, args)
+    column = getattr(model, getattr(model, 'DATE_RANGE_FIELD', 'created_at'))
+    start, end = parse_range(args, 'from'), parse_range(args, 'to')
+    if start:
+        query = query.where(column >= start)
+    if end:
+        query = query.where(column < end)
+    return query.order_by(model.id)
+
+
+def _lines(model, query, data_format):
+    columns = [column.key for column in model.__table__.columns]
+
+    if data_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+    else:
+        buffer, writer = None, None
+
+    # server side cursor, only YIELD_PER rows are held in memory at a time
+    result = db.session.execute(query.execution_options(stream_results=True, yield_per=YIELD_PER))
+    for partition in result.partitions():
+        if writer:
+            writer.writerows([_csv_value(value) for value in row] for row in partition)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        else:
+            yield ''.join(json.dumps({key: _plain(value) for key, value in zip(columns, row)}) + '\n'
+                          for row in partition)
+    if writer and buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_export(model, args, data_format='csv', compress=False):
+    """
+    Generator of the export body as bytes, chunks of roughly FLUSH_BYTES,
+    gzip compressed on the fly when `compress` is set.
+    """
+    query = export_query(model, args)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    pending, size = [], 0
+    for text in _lines(model, query, data_format):
+        data = text.encode('utf-8')
+        if compressor:
+            data = compressor.compress(data)
+        if not data:
+            continue
+        pending.append(data)
+        size += len(data)
+        if size >= FLUSH_BYTES:
+            yield b''.join(pending)
+            pending, size = [], 0
+
+    if compressor:
+        pending.append(compressor.flush())
+    if pending:
+        yield b''.join(pending)
@@ -0,0 +1,191 @@
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from Models.DepartmentUsers import DepartmentUser
+from Models.FinanceReport import FinanceReport
+from Models.FinanceRollup import FinanceRollup, PERIODS
+from Models.Invoice import Invoice
+from extensions import db
+
+DEFAULT_STATUS = "pending"
+
+
+def department_for(user_id):
+    """
+    Department an invoice raised by user_id is booked to (their first one).
+    """
+    if not user_id:
+        return None
+    return db.session.execute(
+        select(func.min(DepartmentUser.department_id)).where(DepartmentUser.user_id == user_id)
+    ).scalar()
+
+
+def invoice_snapshot(invoice):
+    """
+    The values of an invoice (object or row) the rollups depend on.
+    """
+    return {
+        "day": (invoice.created_at or datetime.utcnow()).date(),
+        "status": invoice.status or DEFAULT_STATUS,
+        "created_by": invoice.created_by,
+        "department_id": invoice.department_id,
+        "total_amount": invoice.total_amount or 0,
+    }
+
+
+def _period_start(period, day):
+    return day if period == 'day' else day.replace(day=1)
+
+
+def _buckets(snapshot):
+    for period in PERIODS:
+        period_start = _period_start(period, snapshot["day"])
+        yield period, period_start, 'all', ''
+        yield period, period_start, 'status', snapshot["status"]
+        yield period, period_start, 'creator', str(snapshot["created_by"] or '')
+        if snapshot["department_id"]:
+            yield period, period_start, 'department', str(snapshot["department_id"])
+
+
+def record_invoice_changes(changes):
+    """
+    Apply invoice changes to the rollups in the caller's transaction.
+
+    `changes` is a list of (before, after) snapshots, before is None for a new
+    invoice and after is None for a deleted one. The old values are taken out
+    of their buckets and the new ones added with one INSERT ... ON CONFLICT.
+    """
+    deltas = {}
+    for before, after in changes:
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if not snapshot:
+                continue
+            for bucket in _buckets(snapshot):
+                count, total = deltas.get(bucket, (0, 0))
+                deltas[bucket] = (count + sign, total + sign * snapshot["total_amount"])
+
+    deltas = {bucket: delta for bucket, delta in deltas.items() if delta[0] or round(delta[1], 2)}
+    if not deltas:
+        return
+
+    now = datetime.utcnow()
+    # sorted so concurrent writers lock the rollup rows in the same order
+    statement = pg_insert(FinanceRollup).values([
+        {"period": period, "period_start": period_start, "dimension": dimension, "dimension_key": key,
+         "invoice_count": count, "total_amount": round(total, 2), "updated_at": now}
+        for (period, period_start, dimension, key), (count, total) in sorted(deltas.items())
+    ])
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=['period', 'period_start', 'dimension', 'dimension_key'],
+        set_={
+            "invoice_count": FinanceRollup.invoice_count + statement.excluded.invoice_count,
+            "total_amount": FinanceRollup.total_amount + statement.excluded.total_amount,
+            "updated_at": statement.excluded.updated_at,
+        },
+    ))
+
+
+def set_order_total(order_id, total_amount):
+    """
+    Change the total of an order's invoices and move the difference into the rollups.
+    """
+    invoices = db.session.execute(
+        select(Invoice).where(Invoice.order_id == order_id).with_for_update()
+    ).scalars().all()
+
+    changes = []
+    for invoice in invoices:
+        before = invoice_snapshot(invoice)
+        invoice.total_amount = total_amount
+        changes.append((before, invoice_snapshot(invoice)))
+    record_invoice_changes(changes)
+
+
+def rebuild(start=None, end=None):
+    """
+    Recompute the rollups of the days start <= day < end (everything when not
+    given) from the invoices, e.g. after a backfill or a manual data fix.
+    Whole months are rebuilt so the month buckets stay complete.
+    """
+    if start:
+        start = start.replace(day=1)
+    if end and end.day != 1:
+        end = (end.replace(day=1) + timedelta(days=32)).replace(day=1)
+    conditions = []
+    if start:
+        conditions.append(Invoice.created_at >= datetime.combine(start, time.min))
+    if end:
+        conditions.append(Invoice.created_at < datetime.combine(end, time.min))
+
+    rollups = delete(FinanceRollup)
+    if start:
+        rollups = rollups.where(FinanceRollup.period_start >= start)
+    if end:
+        rollups = rollups.where(FinanceRollup.period_start < end)
+    db.session.execute(rollups)
+
+    invoices = db.session.execute(
+        select(Invoice.created_at, Invoice.status, Invoice.created_by,
+               Invoice.department_id, Invoice.total_amount).where(*conditions)
+        .execution_options(yield_per=1000)
+    )
+    count, batch = 0, []
+    for row in invoices:
+        batch.append((None, invoice_snapshot(row)))
+        count += 1
+        if len(batch) >= 1000:
+            record_invoice_changes(batch)
+            batch = []
+    record_invoice_changes(batch)
+    return count
+
+
+def rollups(period, start=None, end=None, dimension=None):
+    # buckets emptied by deletes or status changes are kept but not reported
+    query = select(FinanceRollup).where(FinanceRollup.period == period, FinanceRollup.invoice_count != 0)
+    if dimension:
+        query = query.where(FinanceRollup.dimension == dimension)
+    if start:
+        query = query.where(FinanceRollup.period_start >= start)
+    if end:
+        query = query.where(FinanceRollup.period_start < end)
+    return db.session.execute(
+        query.order_by(FinanceRollup.period_start, FinanceRollup.dimension, FinanceRollup.dimension_key)
+    ).scalars().all()
+
+
+def build_summary(period, period_start):
+    summary = {"period": period, "period_start": period_start.isoformat(),
+               "total_invoices": 0, "total_amount": 0.0,
+               "by_status": {}, "by_creator": {}, "by_department": {}}
+    for rollup in rollups(period, period_start, period_start + timedelta(days=1)):
+        values = {"count": rollup.invoice_count, "total": float(rollup.total_amount)}
+        if rollup.dimension == 'all':
+            summary["total_invoices"], summary["total_amount"] = values["count"], values["total"]
+        else:
+            summary[f"by_{rollup.dimension}"][rollup.dimension_key] = values
+    return summary
+
+
+def generate_report(period, day):
+    """
+    Create or refresh the FinanceReport of the period containing `day` from
+    the rollups; reads a few dozen rows however many invoices there are.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"period must be one of {list(PERIODS)}")
+    period_start = _period_start(period, day)
+    report_date = datetime.combine(period_start, time.min)
+    summary = build_summary(period, period_start)
+
+    report = FinanceReport.query.filter_by(period=period, report_date=report_date).first()
+    if report:
+        report.summary = summary
+    else:
+        report = FinanceReport(period=period, report_date=report_date, summary=summary)
+        db.session.add(report)
+    db.session.flush()
+    return report
@@ -0,0 +1,115 @@
+from datetime import date, datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from Models.MedicineBalance import MedicineBalance
+from Models.MedicineStock import MedicineStock
+from Models.StockMovement import MovementTypeEnum, StockMovement
+from extensions import db
+
+MOVEMENT_FIELDS = ('medicine_id', 'medicine_stock_id', 'purchase_order_id', 'batch_no',
+                   'movement_type', 'quantity', 'note')
+
+
+def record_movements(movements):
+    """
+    Append movements to the ledger and apply them to the per medicine balances.
+
+    Each movement is a dict with movement_type, quantity (signed) and
+    medicine_stock_id and/or medicine_id; medicine_id and batch_no are looked
+    up from the batch when missing. Runs in the caller's transaction with one
+    INSERT for the ledger and one INSERT ... ON CONFLICT for the balances.
+    """
+    movements = [movement for movement in movements if movement["quantity"]]
+    if not movements:
+        return []
+
+    missing = {movement["medicine_stock_id"] for movement in movements
+               if not movement.get("medicine_id") or not movement.get("batch_no")}
+    batches = {}
+    if missing:
+        batches = {row.id: row for row in db.session.execute(
+            select(MedicineStock.id, MedicineStock.medicine_id, MedicineStock.batch_no)
+            .where(MedicineStock.id.in_(missing)))}
+
+    now = datetime.utcnow()
+    rows = []
+    for movement in movements:
+        row = {field: movement.get(field) for field in MOVEMENT_FIELDS}
+        batch = batches.get(row["medicine_stock_id"])
+        if batch:
+            row["medicine_id"] = row["medicine_id"] or batch.medicine_id
+            row["batch_no"] = row["batch_no"] or batch.batch_no
+        row["created_at"] = now
+        rows.append(row)
+
+    db.session.execute(insert(StockMovement), rows)
+    apply_to_balances(rows, now)
+    return rows
+
+
+def apply_to_balances(rows, now=None):
+    deltas = {}
+    for row in rows:
+        deltas[row["medicine_id"]] = deltas.get(row["medicine_id"], 0) + row["quantity"]
+
+    # sorted so concurrent writers lock the balance rows in the same order
+    statement = pg_insert(MedicineBalance).values([
+        {"medicine_id": medicine_id, "on_hand": delta, "updated_at": now or datetime.utcnow()}
+        for medicine_id, delta in sorted(deltas.items())
+    ])
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=[MedicineBalance.medicine_id],
+        set_={"on_hand": MedicineBalance.on_hand + statement.excluded.on_hand,
+              "updated_at": statement.excluded.updated_at},
+    ))
+    for obj in list(db.session.identity_map.values()):
+        if isinstance(obj, MedicineBalance) and obj.medicine_id in deltas:
+            db.session.expire(obj, ['on_hand', 'updated_at'])
+
+
+def adjust_stock(medicine_stock_id, quantity, note=None):
+    """
+    Manually change a batch's quantity by a signed amount (stock take, damage).
+    """
+    stock = db.session.execute(
+        select(MedicineStock).where(MedicineStock.id == medicine_stock_id).with_for_update()
+    ).scalar_one_or_none()
+    if not stock:
+        raise LookupError(f"Stock ID {medicine_stock_id} not found")
+    if stock.quantity + quantity < 0:
+        raise ValueError(f"Stock ID {medicine_stock_id} only has {stock.quantity} units")
+
+    stock.quantity += quantity
+    db.session.flush()
+    record_movements([{
+        "medicine_id": stock.medicine_id, "medicine_stock_id": stock.id, "batch_no": stock.batch_no,
+        "movement_type": MovementTypeEnum.ADJUSTMENT, "quantity": quantity, "note": note,
+    }])
+    return stock
+
+
+def write_off_expired(as_of=None):
+    """
+    Zero every batch that expired before as_of (today by default) and record
+    an EXPIRY_WRITE_OFF movement for what was left of it.
+    """
+    as_of = as_of or date.today()
+    expired = db.session.execute(
+        select(MedicineStock.id, MedicineStock.medicine_id, MedicineStock.batch_no, MedicineStock.quantity)
+        .where(MedicineStock.expiry_date < as_of, MedicineStock.quantity > 0)
+        .order_by(MedicineStock.id)
+        .with_for_update()
+    ).all()
+    if not expired:
+        return []
+
+    db.session.execute(update(MedicineStock)
+                       .where(MedicineStock.id.in_([row.id for row in expired]))
+                       .values(quantity=0)
+                       .execution_options(synchronize_session=False))
+    return record_movements([{
+        "medicine_id": row.medicine_id, "medicine_stock_id": row.id, "batch_no": row.batch_no,
+        "movement_type": MovementTypeEnum.EXPIRY_WRITE_OFF, "quantity": -row.quantity,
+    } for row in expired])
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+from Models.LabRequest import PENDING, LabRequest
+from Models.LabTest import LabTest
+from Models.Users import User
+from Utils.EagerLoading import eager_load_options
+from extensions import db
+
+MAX_PANEL_REQUESTS = 1000
+
+
+def _ids(value, key):
+    values = value if isinstance(value, list) else [value]
+    if not values or not all(isinstance(item, int) and not isinstance(item, bool) for item in values):
+        raise ValueError(f"{key} must be a number or a list of numbers")
+    return values
+
+
+def parse_panel(data):
+    """
+    Turn a lab order into [(patient_id, test_id)].
+
+    Accepted shapes, all with requested_by:
+      {"patient_id": 1, "test_id": 3}                         one test (legacy)
+      {"patient_id": 1, "test_id": [3, 4]}                    a panel (legacy)
+      {"patient_ids": [1, 2], "test_ids": [3, 4]}             same panel for many patients
+      {"orders": [{"patient_id": 1, "test_ids": [3, 4]}]}     a panel per patient
+    Duplicate patient/test pairs are ordered once.
+    """
+    if "orders" in data:
+        if not isinstance(data["orders"], list) or not data["orders"]:
+            raise ValueError("orders must be a non empty list")
+        groups = []
+        for order in data["orders"]:
+            if not isinstance(order, dict):
+                raise ValueError("each order must be an object")
+            groups.append((_ids(order.get("patient_id"), "patient_id"),
+                           _ids(order.get("test_ids", order.get("test_id")), "test_ids")))
+    else:
+        patients = data.get("patient_ids", data.get("patient_id"))
+        tests = data.get("test_ids", data.get("test_id"))
+        if patients is None or tests is None:
+            raise ValueError("Missing required fields: patient_id, test_id")
+        groups = [(_ids(patients, "patient_ids"), _ids(tests, "test_ids"))]
+
+    pairs = list(dict.fromkeys((patient_id, test_id)
+                               for patient_ids, test_ids in groups
+                               for patient_id in patient_ids for test_id in test_ids))
+    if len(pairs) > MAX_PANEL_REQUESTS:
+        raise ValueError(f"At most {MAX_PANEL_REQUESTS} requests can be ordered at once")
+    return pairs
+
+
+def check_references(requested_by, pairs):
+    """
+    Check the requester, patients and tests exist with one query for users
+    and one for tests.
+    """
+    user_ids = {requested_by} | {patient_id for patient_id, _ in pairs}
+    found_users = set(db.session.execute(select(User.id).where(User.id.in_(user_ids))).scalars())
+    if requested_by not in found_users:
+        raise LookupError("Requester not found")
+    for patient_id in sorted({patient_id for patient_id, _ in pairs}):
+        if patient_id not in found_users:
+            raise LookupError(f"Patient ID {patient_id} not found")
+
+    test_ids = {test_id for _, test_id in pairs}
+    found_tests = set(db.session.execute(select(LabTest.id).where(LabTest.id.in_(test_ids))).scalars())
+    for test_id in sorted(test_ids):
+        if test_id not in found_tests:
+            raise LookupError(f"LabTest ID {test_id} not found")
+
+
+def create_requests(requested_by, pairs, serializer):
+    """
+    Insert every request of the order with one multi-row INSERT and return
+    them loaded for `serializer`, in the order they were given.
+    """
+    if not isinstance(requested_by, int):
+        raise ValueError("requested_by must be a number")
+    check_references(requested_by, pairs)
+
+    now = datetime.utcnow()
+    request_ids = db.session.execute(
+        insert(LabRequest).returning(LabRequest.id, sort_by_parameter_order=True),
+        [{"patient_id": patient_id, "test_id": test_id, "requested_by": requested_by,
+          "status": PENDING, "created_at": now, "updated_at": now} for patient_id, test_id in pairs],
+    ).scalars().all()
+
+    return LabRequest.query.options(*eager_load_options(serializer, LabRequest)) \
+        .filter(LabRequest.id.in_(request_ids)).order_by(LabRequest.id).all()
@@ -0,0 +1,137 @@
+import re
+from datetime import datetime
+
+from sqlalchemy import delete, exists, insert, select
+
+from Models.LabReport import LabReport
+from Models.LabRequest import LabRequest
+from Models.LabResult import LabResult
+from extensions import db
+
+BACKFILL_BATCH_SIZE = 500
+
+# "1.2", "-3", "1.2 mg/dL", "<0.5 ng/mL"
+NUMERIC_VALUE = re.compile(r'^\s*[<>]?=?\s*(-?\d+(?:\.\d+)?)\s*(.*?)\s*$')
+
+
+def normalize_analyte(name):
+    return ' '.join(str(name).split()).lower()[:100]
+
+
+def parse_value(value):
+    """
+    (value_numeric, value_text, unit) for one reported value.
+    """
+    if value is None:
+        return None, None, None
+    if isinstance(value, bool):
+        return None, str(value).lower(), None
+    if isinstance(value, (int, float)):
+        return float(value), str(value), None
+    if isinstance(value, dict):
+        numeric, text, unit = parse_value(value.get('value'))
+        return numeric, text, value.get('unit') or unit
+
+    text = str(value).strip()
+    match = NUMERIC_VALUE.match(text)
+    if match:
+        return float(match.group(1)), text[:255], match.group(2)[:50] or None
+    return None, text[:255], None
+
+
+def extract_results(report_data):
+    """
+    [(name, value)] from a report_data of the form {"data": {analyte: value}}.
+    Free text reports ({"data": "..."}) have no analytes.
+    """
+    data = report_data.get('data') if isinstance(report_data, dict) else None
+    if not isinstance(data, dict):
+        return []
+    return [(str(name).strip(), value) for name, value in data.items() if str(name).strip()]
+
+
+def sync_results(reports):
+    """
+    Replace the extracted results of the given reports (objects or rows with
+    id, request_id, report_data, created_at and updated_at) in the caller's
+    transaction: one DELETE, one request lookup and one multi-row INSERT.
+    """
+    if not reports:
+        return 0
+    now = datetime.utcnow()
+    report_ids = [report.id for report in reports]
+    db.session.execute(delete(LabResult).where(LabResult.report_id.in_(report_ids)))
+
+    requests = {row.id: row for row in db.session.execute(
+        select(LabRequest.id, LabRequest.patient_id, LabRequest.test_id)
+        .where(LabRequest.id.in_({report.request_id for report in reports})))}
+
+    rows = []
+    for report in reports:
+        lab_request = requests.get(report.request_id)
+        if not lab_request:
+            continue
+        # created_at is nullable on legacy reports, observed_at is not
+        observed_at = report.created_at or report.updated_at or now
+        for name, value in extract_results(report.report_data):
+            value_numeric, value_text, unit = parse_value(value)
+            rows.append({
+                "report_id": report.id,
+                "patient_id": lab_request.patient_id,
+                "test_id": lab_request.test_id,
+                "analyte": normalize_analyte(name),
+                "name": name[:100],
+                "value_numeric": value_numeric,
+                "value_text": value_text,
+                "unit": unit,
+                "observed_at": observed_at,
+            })
+    if rows:
+        db.session.execute(insert(LabResult), rows)
+    return len(rows)
+
+
+def backfill(only_missing=True, batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Extract the results of existing reports, committing every batch_size
+    reports. With only_missing, reports that already have results are skipped.
+    """
+    last_id, reports_done, results_done = 0, 0, 0
+    while True:
+        query = (select(LabReport.id, LabReport.request_id, LabReport.report_data,
+                        LabReport.created_at, LabReport.updated_at)
+                 .where(LabReport.id > last_id).order_by(LabReport.id).limit(batch_size))
+        if only_missing:
+            query = query.where(~exists().where(LabResult.report_id == LabReport.id))
+        reports = db.session.execute(query).all()
+        if not reports:
+            break
+
+        results_done += sync_results(reports)
+        db.session.commit()
+        reports_done += len(reports)
+        last_id = reports[-1].id
+
+    return {"reports": reports_done, "results": results_done}
+
+
+def trend(patient_id, analyte, start=None, end=None):
+    """
+    Time series of one analyte for a patient, oldest first.
+    """
+    query = (select(LabResult.observed_at, LabResult.value_numeric, LabResult.value_text,
+                    LabResult.unit, LabResult.report_id)
+             .where(LabResult.patient_id == patient_id, LabResult.analyte == normalize_analyte(analyte))
+             .order_by(LabResult.observed_at))
+    if start:
+        query = query.where(LabResult.observed_at >= start)
+    if end:
+        query = query.where(LabResult.observed_at < end)
+
+    return [{
+        "observed_at": row.observed_at.isoformat(),
+        "value": row.value_numeric,
+        "value_text": row.value_text,
+        "unit": row.unit,
+        "report_id": row.report_id,
+    } for row in db.session.execute(query)]
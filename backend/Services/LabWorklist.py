@@ -0,0 +1,99 @@
+from datetime import datetime
+
+from sqlalchemy import and_, or_, select, update
+
+from Models.LabRequest import IN_PROGRESS, PENDING, LabRequest
+from Models.LabTest import LabTest
+from Models.Users import User
+from Utils.Pagination import apply_filters, coerce_value, decode_cursor, encode_cursor, parse_limit
+from extensions import db
+
+MAX_CLAIM = 50
+
+
+def _projection():
+    # flat rows with names only, no nested users
+    return (select(LabRequest.id, LabRequest.status, LabRequest.created_at,
+                   LabRequest.patient_id, User.name.label('patient_name'),
+                   LabRequest.test_id, LabTest.name.label('test_name'),
+                   LabRequest.requested_by, LabRequest.claimed_by, LabRequest.claimed_at)
+            .join(User, User.id == LabRequest.patient_id)
+            .join(LabTest, LabTest.id == LabRequest.test_id))
+
+
+def _row(row):
+    return {
+        "id": row.id,
+        "status": row.status,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "patient_id": row.patient_id,
+        "patient_name": row.patient_name,
+        "test_id": row.test_id,
+        "test_name": row.test_name,
+        "requested_by": row.requested_by,
+        "claimed_by": row.claimed_by,
+        "claimed_at": row.claimed_at.isoformat() if row.claimed_at else None,
+    }
+
+
+def worklist(args):
+    """
+    Oldest first page of the queue (status defaults to pending), keyset
+    paginated on (created_at, id) so pending pages come from ix_lab_request_pending.
+    """
+    args = args.copy()
+    args.setdefault('status', PENDING)
+    limit = parse_limit(args)
+
+    query = apply_filters(_projection(), LabRequest, args)
+    if args.get('cursor'):
+        values = decode_cursor(args['cursor'])
+        if len(values) != 2:
+            raise ValueError("cursor is not valid")
+        last_created = coerce_value(LabRequest.created_at, values[0])
+        last_id = coerce_value(LabRequest.id, values[1])
+        query = query.where(or_(LabRequest.created_at > last_created,
+                                and_(LabRequest.created_at == last_created, LabRequest.id > last_id)))
+
+    rows = db.session.execute(query.order_by(LabRequest.created_at, LabRequest.id).limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].created_at, rows[-1].id])
+    return {"items": [_row(row) for row in rows], "next_cursor": next_cursor, "limit": limit}
+
+
+def claim(technician_id, count=1, test_ids=None):
+    """
+    Move up to `count` of the oldest pending requests to in_progress for one
+    technician. Rows locked by another bench's claim are skipped rather than
+    waited for, so concurrent benches never get the same request.
+    """
+    if not isinstance(count, int) or count < 1 or count > MAX_CLAIM:
+        raise ValueError(f"count must be between 1 and {MAX_CLAIM}")
+    if db.session.execute(select(User.id).where(User.id == technician_id)).scalar() is None:
+        raise LookupError("Technician not found")
+
+    candidates = (select(LabRequest.id)
+                  .where(LabRequest.status == PENDING)
+                  .order_by(LabRequest.created_at, LabRequest.id)
+                  .limit(count)
+                  .with_for_update(skip_locked=True))
+    if test_ids:
+        candidates = candidates.where(LabRequest.test_id.in_(test_ids))
+
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        update(LabRequest)
+        .where(LabRequest.id.in_(candidates.scalar_subquery()), LabRequest.status == PENDING)
+        .values(status=IN_PROGRESS, claimed_by=technician_id, claimed_at=now, updated_at=now)
+        .returning(LabRequest.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    if not claimed:
+        return []
+
+    rows = db.session.execute(
+        _projection().where(LabRequest.id.in_(claimed)).order_by(LabRequest.created_at, LabRequest.id)
+    ).all()
+    return [_row(row) for row in rows]
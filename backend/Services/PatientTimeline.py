@@ -0,0 +1,139 @@
+from sqlalchemy import Float, Integer, String, and_, cast, literal, null, or_, select, union_all
+from sqlalchemy.orm import aliased
+
+from Models.Appointments import Appointment
+from Models.Invoice import Invoice
+from Models.LabReport import LabReport
+from Models.LabRequest import LabRequest
+from Models.LabTest import LabTest
+from Models.MedicalRecords import MedicalRecords
+from Models.Orders import Orders
+from Models.Users import User
+from Utils.Pagination import coerce_value, decode_cursor, encode_cursor, parse_limit
+from extensions import db
+
+EVENT_TYPES = ('appointment', 'lab_report', 'lab_request', 'medical_record', 'order')
+
+
+def _sources(patient_id):
+    """
+    One select per event type, each with the same columns and each served by
+    a (patient, time) index. Returns {type: (select, time column, id column)}.
+    """
+    doctor = aliased(User)
+    return {
+        'medical_record': (
+            select(MedicalRecords.id, MedicalRecords.created_at.label('at'),
+                   MedicalRecords.notes.label('title'), cast(null(), String).label('status'),
+                   cast(null(), Integer).label('reference_id'), cast(null(), Float).label('amount'))
+            .where(MedicalRecords.user_id == patient_id),
+            MedicalRecords.created_at, MedicalRecords.id),
+        'lab_request': (
+            select(LabRequest.id, LabRequest.created_at.label('at'),
+                   LabTest.name.label('title'), LabRequest.status.label('status'),
+                   LabRequest.test_id.label('reference_id'), cast(null(), Float).label('amount'))
+            .join(LabTest, LabTest.id == LabRequest.test_id)
+            .where(LabRequest.patient_id == patient_id),
+            LabRequest.created_at, LabRequest.id),
+        'lab_report': (
+            select(LabReport.id, LabReport.created_at.label('at'),
+                   LabTest.name.label('title'), literal('reported', String).label('status'),
+                   LabReport.request_id.label('reference_id'), cast(null(), Float).label('amount'))
+            .join(LabRequest, LabRequest.id == LabReport.request_id)
+            .join(LabTest, LabTest.id == LabRequest.test_id)
+            .where(LabRequest.patient_id == patient_id),
+            LabReport.created_at, LabReport.id),
+        'order': (
+            select(Orders.id, Orders.created_at.label('at'),
+                   literal('Order', String).label('title'), Invoice.status.label('status'),
+                   Invoice.id.label('reference_id'), Invoice.total_amount.label('amount'))
+            .outerjoin(Invoice, Invoice.order_id == Orders.id)
+            .where(Orders.user_id == patient_id),
+            Orders.created_at, Orders.id),
+        'appointment': (
+            select(Appointment.id, Appointment.appointment_date.label('at'),
+                   doctor.name.label('title'), Appointment.status.label('status'),
+                   Appointment.doctor_id.label('reference_id'), cast(null(), Float).label('amount'))
+            .join(doctor, doctor.id == Appointment.doctor_id)
+            .where(Appointment.patient_id == patient_id),
+            Appointment.appointment_date, Appointment.id),
+    }
+
+
+def _after(event_type, at_column, id_column, cursor):
+    # rows after the cursor in (at DESC NULLS FIRST, type DESC, id DESC) order;
+    # the type is constant per source so the condition stays a plain range on
+    # its index. Legacy rows without a time come first, as Postgres sorts them.
+    last_at, last_type, last_id = cursor
+    if last_at is None:
+        if event_type < last_type:
+            return None
+        if event_type > last_type:
+            return at_column.isnot(None)
+        return or_(at_column.isnot(None), and_(at_column.is_(None), id_column < last_id))
+    if event_type < last_type:
+        return at_column <= last_at
+    if event_type > last_type:
+        return at_column < last_at
+    return or_(at_column < last_at, and_(at_column == last_at, id_column < last_id))
+
+
+def _parse_cursor(raw):
+    values = decode_cursor(raw)
+    if len(values) != 3 or values[1] not in EVENT_TYPES:
+        raise ValueError("cursor is not valid")
+    last_at = None if values[0] is None else coerce_value(MedicalRecords.created_at, values[0])
+    return last_at, values[1], coerce_value(MedicalRecords.id, values[2])
+
+
+def timeline(patient_id, args):
+    """
+    Newest first page of everything that happened to a patient.
+
+    Every source is read with its own LIMIT from its (patient, time) index and
+    the branches are merged by one UNION ALL ... ORDER BY ... LIMIT, so a page
+    is a single round trip however long the history is.
+    """
+    limit = parse_limit(args)
+    cursor = _parse_cursor(args['cursor']) if args.get('cursor') else None
+
+    types = args.get('types')
+    types = [value for value in types.split(',') if value] if types else list(EVENT_TYPES)
+    unknown = [value for value in types if value not in EVENT_TYPES]
+    if unknown:
+        raise ValueError(f"types must be among {list(EVENT_TYPES)}")
+
+    branches = []
+    for event_type, (query, at_column, id_column) in _sources(patient_id).items():
+        if event_type not in types:
+            continue
+        condition = _after(event_type, at_column, id_column, cursor) if cursor else None
+        if condition is not None:
+            query = query.where(condition)
+        branch = query.order_by(at_column.desc().nulls_first(), id_column.desc()).limit(limit + 1).subquery()
+        branches.append(select(literal(event_type, String).label('type'), *branch.c))
+
+    merged = union_all(*branches).subquery()
+    rows = db.session.execute(
+        select(merged).order_by(merged.c.at.desc().nulls_first(), merged.c.type.desc(), merged.c.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].at, rows[-1].type, rows[-1].id])
+
+    return {
+        "patient_id": patient_id,
+        "items": [{
+            "type": row.type,
+            "id": row.id,
+            "at": row.at.isoformat() if row.at else None,
+            "title": row.title,
+            "status": row.status,
+            "reference_id": row.reference_id,
+            "amount": row.amount,
+        } for row in rows],
+        "next_cursor": next_cursor,
+        "limit": limit,
+    }
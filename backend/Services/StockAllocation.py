@@ -0,0 +1,159 @@
+from datetime import date
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+
+from Models.MedicineStock import MedicineStock
+from Models.PurchaseOrder import PurchaseOrder
+from Models.StockAllocation import StockAllocation
+from Models.StockMovement import MovementTypeEnum
+from Services.InventoryLedger import record_movements
+from extensions import db
+
+class InsufficientStock(ValueError):
+    pass
+
+
+def _next_batch(medicine_id, exclude_ids, skip_locked):
+    """
+    Lock the next FEFO batch of a medicine, one row at a time so only the
+    batches actually consumed stay locked until commit. With skip_locked,
+    batches held by other transactions are passed over instead of waited on.
+    """
+    query = (select(MedicineStock.id, MedicineStock.quantity)
+             .where(MedicineStock.medicine_id == medicine_id,
+                    MedicineStock.quantity > 0,
+                    MedicineStock.expiry_date >= date.today())
+             .order_by(MedicineStock.expiry_date, MedicineStock.id)
+             .limit(1)
+             .with_for_update(skip_locked=skip_locked))
+    if exclude_ids:
+        query = query.where(MedicineStock.id.notin_(exclude_ids))
+    return db.session.execute(query).first()
+
+
+def _take(medicine_id, needed):
+    """
+    Return [(stock_id, quantity)] covering needed units, first expiry first out.
+    Unlocked batches are tried first; only when they run short do we wait for
+    the batches other terminals are holding.
+    """
+    taken, seen = [], []
+    for skip_locked in (True, False):
+        while needed > 0:
+            row = _next_batch(medicine_id, seen, skip_locked)
+            if not row:
+                break
+            stock_id, available = row
+            seen.append(stock_id)
+            quantity = min(available, needed)
+            taken.append((stock_id, quantity))
+            needed -= quantity
+        if not needed:
+            return taken
+    raise InsufficientStock(f"Insufficient stock for medicine ID {medicine_id}")
+
+
+def allocate(lines):
+    """
+    Allocate stock for (purchase_order_id, medicine_id, quantity) lines.
+
+    Medicines are processed in id order so concurrent orders lock batches in
+    the same order. The batches are decremented with one executemany UPDATE
+    and the allocations written with one multi-row INSERT, all in the
+    caller's transaction.
+    """
+    allocations = []
+    for medicine_id in sorted({line[1] for line in lines}):
+        medicine_lines = [line for line in lines if line[1] == medicine_id]
+        taken = _take(medicine_id, sum(line[2] for line in medicine_lines))
+
+        # split the batches taken for the medicine over its lines
+        for purchase_order_id, _, quantity in medicine_lines:
+            while quantity:
+                stock_id, available = taken[0]
+                used = min(available, quantity)
+                allocations.append({"purchase_order_id": purchase_order_id, "medicine_id": medicine_id,
+                                    "medicine_stock_id": stock_id, "quantity": used})
+                quantity -= used
+                if used == available:
+                    taken.pop(0)
+                else:
+                    taken[0] = (stock_id, available - used)
+
+    if allocations:
+        _adjust_stock(allocations, -1)
+        db.session.execute(insert(StockAllocation), [
+            {key: allocation[key] for key in ('purchase_order_id', 'medicine_stock_id', 'quantity')}
+            for allocation in allocations
+        ])
+        record_movements([{**allocation, "movement_type": MovementTypeEnum.DISPENSE,
+                           "quantity": -allocation["quantity"]} for allocation in allocations])
+    return allocations
+
+
+def release(purchase_order_ids):
+    """
+    Return the stock allocated to the given purchase order lines and remove
+    their allocations.
+    """
+    if not purchase_order_ids:
+        return []
+
+    allocations = [dict(row._mapping) for row in db.session.execute(
+        select(StockAllocation.purchase_order_id, StockAllocation.medicine_stock_id,
+               func.sum(StockAllocation.quantity).label('quantity'))
+        .where(StockAllocation.purchase_order_id.in_(purchase_order_ids))
+        .group_by(StockAllocation.purchase_order_id, StockAllocation.medicine_stock_id)
+        .order_by(StockAllocation.medicine_stock_id)
+    )]
+    if allocations:
+        _adjust_stock(allocations, 1)
+        record_movements([{**allocation, "movement_type": MovementTypeEnum.RETURN} for allocation in allocations])
+        db.session.execute(delete(StockAllocation)
+                           .where(StockAllocation.purchase_order_id.in_(purchase_order_ids))
+                           .execution_options(synchronize_session=False))
+    return allocations
+
+
+def allocate_items(purchase_order_ids):
+    """
+    Allocate stock for existing purchase order lines.
+    """
+    if not purchase_order_ids:
+        return []
+    lines = db.session.execute(
+        select(PurchaseOrder.id, PurchaseOrder.medicine_id, PurchaseOrder.quantity)
+        .where(PurchaseOrder.id.in_(purchase_order_ids))
+    ).all()
+    return allocate([tuple(line) for line in lines])
+
+
+def allocated_cost(order_id):
+    """
+    Total price of the stock allocated to an order's lines.
+    """
+    return db.session.execute(
+        select(func.coalesce(func.sum(StockAllocation.quantity * func.coalesce(MedicineStock.price, 0)), 0))
+        .join(MedicineStock, MedicineStock.id == StockAllocation.medicine_stock_id)
+        .join(PurchaseOrder, PurchaseOrder.id == StockAllocation.purchase_order_id)
+        .where(PurchaseOrder.order_id == order_id)
+    ).scalar()
+
+
+def _adjust_stock(allocations, sign):
+    # one executemany UPDATE, relative to the current quantity so it stays atomic
+    totals = {}
+    for allocation in allocations:
+        stock_id = allocation["medicine_stock_id"]
+        totals[stock_id] = totals.get(stock_id, 0) + allocation["quantity"]
+
+    table = MedicineStock.__table__
+    db.session.execute(
+        update(table)
+        .where(table.c.id == bindparam('stock_id'))
+        .values(quantity=table.c.quantity + bindparam('delta')),
+        [{"stock_id": stock_id, "delta": sign * quantity} for stock_id, quantity in sorted(totals.items())],
+    )
+    for obj in list(db.session.identity_map.values()):
+        if isinstance(obj, MedicineStock) and obj.id in totals:
+            db.session.expire(obj, ['quantity', 'updated_at'])
@@ -0,0 +1,189 @@
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, exists, func, insert, or_, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from Models.Medicine import Medicine
+from Models.MedicineBalance import MedicineBalance
+from Models.MedicineStock import MedicineStock
+from Models.Notification import Notification
+from Models.StockScan import StockAlert, StockScanState
+from Models.Users import User
+from Utils.ReferenceCache import user_types
+from extensions import db
+
+SCANNER_NAME = 'stock_alerts'
+LOW_STOCK = 'LOW_STOCK'
+NEAR_EXPIRY = 'NEAR_EXPIRY'
+
+# Rows committed late by long transactions can carry an updated_at just below
+# the watermark, so every scan looks back a little; open alerts dedupe them.
+WATERMARK_OVERLAP = timedelta(minutes=1)
+
+DEFAULT_CONFIG = {
+    'STOCK_LOW_THRESHOLD': 10,
+    'STOCK_EXPIRY_WARNING_DAYS': 30,
+    'STOCK_ALERT_USER_TYPES': ['pharmacist'],
+    'STOCK_SCAN_INTERVAL_SECONDS': 0,
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _config(key):
+    return current_app.config.get(key, DEFAULT_CONFIG[key])
+
+
+def _state():
+    state = db.session.execute(
+        select(StockScanState).where(StockScanState.name == SCANNER_NAME).with_for_update()
+    ).scalar_one_or_none()
+    if not state:
+        state = StockScanState(name=SCANNER_NAME)
+        db.session.add(state)
+        db.session.flush()
+    return state
+
+
+def _open_alerts(alert_type, reference_ids):
+    """
+    Insert alerts that are not open yet and return the reference ids that are new.
+    """
+    if not reference_ids:
+        return []
+    statement = pg_insert(StockAlert).values([
+        {"alert_type": alert_type, "reference_id": reference_id, "created_at": datetime.utcnow()}
+        for reference_id in sorted(reference_ids)
+    ]).on_conflict_do_nothing(index_elements=['alert_type', 'reference_id'])
+    return list(db.session.execute(statement.returning(StockAlert.reference_id)).scalars())
+
+
+def _low_stock(state):
+    # only medicines whose balance moved since the last run
+    threshold = _config('STOCK_LOW_THRESHOLD')
+    query = select(MedicineBalance.medicine_id, MedicineBalance.on_hand, MedicineBalance.updated_at)
+    if state.last_balance_updated_at:
+        query = query.where(MedicineBalance.updated_at > state.last_balance_updated_at - WATERMARK_OVERLAP)
+    rows = db.session.execute(query).all()
+    if not rows:
+        return []
+
+    state.last_balance_updated_at = max(row.updated_at for row in rows)
+
+    recovered = [row.medicine_id for row in rows if row.on_hand > threshold]
+    if recovered:
+        db.session.execute(delete(StockAlert).where(StockAlert.alert_type == LOW_STOCK,
+                                                    StockAlert.reference_id.in_(recovered)))
+
+    low = {row.medicine_id: row.on_hand for row in rows if row.on_hand <= threshold}
+    new_ids = _open_alerts(LOW_STOCK, low.keys())
+    if not new_ids:
+        return []
+
+    names = dict(db.session.execute(select(Medicine.id, Medicine.name).where(Medicine.id.in_(new_ids))).all())
+    return [("Low stock", f"{names.get(medicine_id)} is down to {low[medicine_id]} units "
+                          f"(threshold {threshold}).") for medicine_id in sorted(new_ids)]
+
+
+def _near_expiry(state):
+    # batches that came inside the warning window since the last run, or changed since then
+    today = date.today()
+    horizon = today + timedelta(days=_config('STOCK_EXPIRY_WARNING_DAYS'))
+
+    last_updated = db.session.execute(select(func.max(MedicineStock.updated_at))).scalar()
+
+    conditions = [MedicineStock.expiry_date > state.expiry_horizon] if state.expiry_horizon else [true()]
+    if state.last_stock_updated_at:
+        conditions.append(MedicineStock.updated_at > state.last_stock_updated_at - WATERMARK_OVERLAP)
+
+    rows = db.session.execute(
+        select(MedicineStock.id, MedicineStock.batch_no, MedicineStock.expiry_date,
+               MedicineStock.quantity, Medicine.name)
+        .join(Medicine, Medicine.id == MedicineStock.medicine_id)
+        .where(MedicineStock.expiry_date <= horizon, MedicineStock.expiry_date >= today,
+               MedicineStock.quantity > 0, or_(*conditions))
+    ).all()
+
+    state.last_stock_updated_at = last_updated or state.last_stock_updated_at
+    state.expiry_horizon = horizon
+
+    # close alerts of batches no longer in the window (sold out, written off, expiry
+    # corrected) so they alert again when they come back into it
+    db.session.execute(delete(StockAlert).where(
+        StockAlert.alert_type == NEAR_EXPIRY,
+        ~exists().where(MedicineStock.id == StockAlert.reference_id,
+                        MedicineStock.expiry_date <= horizon, MedicineStock.expiry_date >= today,
+                        MedicineStock.quantity > 0),
+    ).execution_options(synchronize_session=False))
+
+    batches = {row.id: row for row in rows}
+    new_ids = _open_alerts(NEAR_EXPIRY, batches.keys())
+    return [("Batch near expiry", f"{batches[stock_id].name} batch {batches[stock_id].batch_no} "
+                                  f"({batches[stock_id].quantity} units) expires on "
+                                  f"{batches[stock_id].expiry_date.isoformat()}.") for stock_id in sorted(new_ids)]
+
+
+def _recipients():
+    type_names = {name.lower() for name in _config('STOCK_ALERT_USER_TYPES')}
+    type_ids = [ref.id for ref in user_types.all() if ref.is_active and ref.type.lower() in type_names]
+    if not type_ids:
+        return []
+    return list(db.session.execute(
+        select(User.id).where(User.user_type_id.in_(type_ids), User.is_active.is_(True))
+    ).scalars())
+
+
+def scan():
+    """
+    Run one incremental scan: look only at balances and batches changed since
+    the stored watermarks, open alerts for new low stock / near expiry
+    conditions and notify the pharmacy users with one bulk INSERT.
+    The scanner row is locked so concurrent runs do not double notify.
+    """
+    state = _state()
+    messages = _low_stock(state) + _near_expiry(state)
+    state.last_run_at = datetime.utcnow()
+
+    recipients = _recipients() if messages else []
+    if recipients:
+        now = datetime.utcnow()
+        db.session.execute(insert(Notification), [
+            {"title": title, "message": message, "user_id": user_id, "is_read": False,
+             "created_at": now, "updated_at": now}
+            for title, message in messages for user_id in recipients
+        ])
+    db.session.commit()
+
+    return {"alerts": len(messages), "notifications": len(messages) * len(recipients)}
+
+
+def _run_forever(app, interval):
+    while True:
+        with app.app_context():
+            try:
+                result = scan()
+                if result["alerts"]:
+                    logger.info("Stock scan opened %s alerts", result["alerts"])
+            except Exception:
+                db.session.rollback()
+                logger.exception("Stock scan failed")
+            finally:
+                db.session.remove()
+        time.sleep(interval)
+
+
+def start_scanner(app):
+    """
+    Run the scanner on a daemon thread every STOCK_SCAN_INTERVAL_SECONDS.
+    Disabled when the interval is 0, e.g. when stock_scanner.py runs from cron.
+    """
+    interval = app.config.get('STOCK_SCAN_INTERVAL_SECONDS', DEFAULT_CONFIG['STOCK_SCAN_INTERVAL_SECONDS'])
+    if not interval:
+        return None
+    thread = threading.Thread(target=_run_forever, args=(app, interval), daemon=True, name='stock-scanner')
+    thread.start()
+    return thread
@@ -0,0 +1,180 @@
+import logging
+import threading
+import uuid
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import case, cast, exists, func, insert, null, select, update
+
+from Models.UserExtraFields import UserExtraFields
+from Models.Users import User
+from extensions import db
+
+# Types with more active users than this are migrated in the background.
+BACKGROUND_THRESHOLD = 20000
+CHUNK_SIZE = 5000
+
+logger = logging.getLogger(__name__)
+
+_migrations = {}
+_migrations_lock = threading.Lock()
+
+
+def _fields_data():
+    return func.coalesce(UserExtraFields.fields_data, func.jsonb_build_object())
+
+
+def _key(name):
+    return cast(name, db.Text)
+
+
+def _type_users(user_type_id, id_range=None):
+    query = select(User.id).where(User.user_type_id == user_type_id, User.is_active.is_(True))
+    if id_range:
+        query = query.where(User.id.between(*id_range))
+    return query
+
+
+def _add_key(user_type_id, field_name, id_range=None):
+    # existing values win over the new null default
+    db.session.execute(
+        update(UserExtraFields)
+        .where(UserExtraFields.user_id.in_(_type_users(user_type_id, id_range)))
+        .values(fields_data=func.jsonb_build_object(_key(field_name), null()).op('||')(_fields_data()))
+        .execution_options(synchronize_session=False)
+    )
+    _insert_missing_rows(user_type_id, field_name, id_range)
+
+
+def _rename_key(user_type_id, old_name, new_name, id_range=None):
+    fields_data = _fields_data()
+    db.session.execute(
+        update(UserExtraFields)
+        .where(UserExtraFields.user_id.in_(_type_users(user_type_id, id_range)))
+        .values(fields_data=case(
+            (fields_data.has_key(old_name),
+             fields_data.op('-')(_key(old_name)).op('||')(
+                 func.jsonb_build_object(_key(new_name), fields_data.op('->')(_key(old_name))))),
+            else_=func.jsonb_build_object(_key(new_name), null()).op('||')(fields_data),
+        ))
+        .execution_options(synchronize_session=False)
+    )
+    _insert_missing_rows(user_type_id, new_name, id_range)
+
+
+def _remove_key(user_type_id, field_name, id_range=None):
+    db.session.execute(
+        update(UserExtraFields)
+        .where(UserExtraFields.user_id.in_(_type_users(user_type_id, id_range)),
+               UserExtraFields.fields_data.has_key(field_name))
+        .values(fields_data=UserExtraFields.fields_data.op('-')(_key(field_name)))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _insert_missing_rows(user_type_id, field_name, id_range=None):
+    users = _type_users(user_type_id, id_range).add_columns(func.jsonb_build_object(_key(field_name), null()))
+    users = users.where(~exists().where(UserExtraFields.user_id == User.id))
+    db.session.execute(insert(UserExtraFields).from_select(['user_id', 'fields_data'], users))
+
+
+OPERATIONS = {
+    'add': _add_key,
+    'rename': _rename_key,
+    'remove': _remove_key,
+}
+
+
+def field_has_values(user_type_id, field_name):
+    """
+    True when any user of the type has a non null value for the field.
+    """
+    query = select(exists().where(
+        UserExtraFields.user_id.in_(select(User.id).where(User.user_type_id == user_type_id)),
+        UserExtraFields.fields_data[field_name].astext.isnot(None),
+    ))
+    return db.session.execute(query).scalar()
+
+
+def count_type_users(user_type_id):
+    return db.session.execute(
+        select(func.count()).select_from(_type_users(user_type_id).subquery())
+    ).scalar()
+
+
+def apply_field_change(user_type_id, operation, *args):
+    """
+    Apply an add/rename/remove of a user field to the extra fields of every
+    active user of the type with one set based statement (plus one INSERT ...
+    SELECT for users without a row). Runs in the caller's transaction.
+    """
+    OPERATIONS[operation](user_type_id, *args)
+
+
+def start_background_migration(user_type_id, operation, *args):
+    """
+    Apply the change in chunks of user ids, committing each chunk, on a
+    background thread. Returns the migration status, see get_migration.
+    """
+    migration_id = uuid.uuid4().hex
+    status = {
+        "id": migration_id,
+        "user_type": user_type_id,
+        "operation": operation,
+        "arguments": list(args),
+        "status": "pending",
+        "total": count_type_users(user_type_id),
+        "processed": 0,
+        "started_at": datetime.utcnow().isoformat(),
+        "finished_at": None,
+        "error": None,
+    }
+    with _migrations_lock:
+        _migrations[migration_id] = status
+
+    app = current_app._get_current_object()
+    thread = threading.Thread(target=_run_chunks, args=(app, migration_id, user_type_id, operation, args), daemon=True)
+    thread.start()
+    return dict(status)
+
+
+def _run_chunks(app, migration_id, user_type_id, operation, args):
+    with app.app_context():
+        status = _migrations[migration_id]
+        status["status"] = "running"
+        try:
+            bounds = db.session.execute(
+                select(func.min(User.id), func.max(User.id))
+                .where(User.user_type_id == user_type_id, User.is_active.is_(True))
+            ).one()
+            if bounds[0] is not None:
+                for start in range(bounds[0], bounds[1] + 1, CHUNK_SIZE):
+                    id_range = (start, start + CHUNK_SIZE - 1)
+                    OPERATIONS[operation](user_type_id, *args, id_range=id_range)
+                    db.session.commit()
+
+                    processed = db.session.execute(
+                        select(func.count()).select_from(_type_users(user_type_id).where(User.id <= id_range[1]).subquery())
+                    ).scalar()
+                    with _migrations_lock:
+                        status["processed"] = processed
+            status["status"] = "completed"
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("User field migration %s failed", migration_id)
+            status["status"] = "failed"
+            status["error"] = str(e)
+        finally:
+            status["finished_at"] = datetime.utcnow().isoformat()
+            db.session.remove()
+
+
+def get_migration(migration_id):
+    with _migrations_lock:
+        status = _migrations.get(migration_id)
+        return dict(status) if status else None
+
+
+def list_migrations():
+    with _migrations_lock:
+        return [dict(status) for status in _migrations.values()]
@@ -0,0 +1,188 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from sqlalchemy import String, insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from Models.UserExtraFields import UserExtraFields
+from Models.UserField import UserField
+from Models.Users import User
+from extensions import db
+
+CHUNK_SIZE = 1000
+DEFAULT_PASSWORD = "Password124"
+
+USER_COLUMNS = [column.key for column in User.__table__.columns if column.key != 'id']
+JSON_COLUMNS = ('address', 'extra_fields')
+# checked per row, a value too long for its column would fail the whole chunk's INSERT
+STRING_LENGTHS = {column.key: column.type.length for column in User.__table__.columns
+                  if isinstance(column.type, String) and column.type.length}
+
+
+def read_rows(stream, data_format):
+    """
+    Yield (row_number, dict) from a CSV or NDJSON byte stream without reading
+    it all into memory. Lines that cannot be parsed are yielded as errors.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+
+    if data_format == 'csv':
+        for row_number, row in enumerate(csv.DictReader(text), start=1):
+            yield row_number, _csv_row(row)
+        return
+
+    for row_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = ValueError("Row is not valid JSON")
+        if not isinstance(row, (dict, ValueError)):
+            row = ValueError("Row must be a JSON object")
+        yield row_number, row
+
+
+def _csv_row(row):
+    data, extra_fields = {}, {}
+    for key, value in row.items():
+        if key is None or value is None or value == '':
+            continue
+        if key in JSON_COLUMNS:
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return ValueError(f"{key} must be valid JSON")
+        if key == 'extra_fields' and isinstance(value, dict):
+            extra_fields.update(value)
+        elif key in USER_COLUMNS:
+            data[key] = value
+        else:
+            extra_fields[key] = value
+    data['extra_fields'] = extra_fields
+    return data
+
+
+class UserImporter:
+    """
+    Validate and insert users chunk by chunk.
+
+    User types and shifts come from the reference cache, the UserField
+    definitions are loaded once, and username/email uniqueness is checked
+    with one query per chunk plus the values already seen in this import.
+    Every chunk is written with two multi-row INSERTs and committed on its own.
+    """
+
+    def __init__(self):
+        self.inserted = 0
+        self.errors = []
+        self.seen_usernames = set()
+        self.seen_emails = set()
+
+        self.fields_by_type = {}
+        for field in UserField.query.all():
+            self.fields_by_type.setdefault(field.user_type, []).append(field)
+
+    def run(self, rows):
+        chunk = []
+        for row_number, row in rows:
+            chunk.append((row_number, row))
+            if len(chunk) >= CHUNK_SIZE:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+
+        return {
+            "inserted": self.inserted,
+            "failed": len(self.errors),
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+        }
+
+    def _fail(self, row_number, error):
+        self.errors.append({"row": row_number, "error": error})
+
+    def _build(self, row):
+        if isinstance(row, ValueError):
+            raise row
+
+        row = dict(row)
+        extra_fields = row.pop('extra_fields', None) or {}
+        if not isinstance(extra_fields, dict):
+            raise ValueError("extra_fields must be a JSON object")
+        extra_fields = dict(extra_fields)
+        row['password'] = row.get('password') or DEFAULT_PASSWORD
+
+        unknown = [key for key in row if key not in USER_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        user = User(**row)
+
+        for field in self.fields_by_type.get(user.user_type_id, []):
+            if field.is_mandatory and not extra_fields.get(field.field_name):
+                raise ValueError(f"{field.field_name} is missing in extra fields.")
+            extra_fields.setdefault(field.field_name, None)
+
+        now = datetime.utcnow()
+        values = {key: getattr(user, key) for key in USER_COLUMNS}
+        for key, length in STRING_LENGTHS.items():
+            if isinstance(values[key], str) and len(values[key]) > length:
+                raise ValueError(f"{key} must be at most {length} characters")
+        values['is_active'] = True if values['is_active'] is None else values['is_active']
+        values['created_at'] = values['created_at'] or now
+        values['updated_at'] = values['updated_at'] or now
+        return values, extra_fields
+
+    def _import_chunk(self, chunk):
+        candidates = []
+        for row_number, row in chunk:
+            try:
+                candidates.append((row_number, *self._build(row)))
+            except (ValueError, TypeError) as ve:
+                self._fail(row_number, str(ve))
+
+        taken_usernames, taken_emails = User.find_taken_identities(
+            [values['username'] for _, values, _ in candidates],
+            [values['email'] for _, values, _ in candidates],
+        )
+
+        valid = []
+        for row_number, values, extra_fields in candidates:
+            if values['username'] in taken_usernames or values['username'] in self.seen_usernames:
+                self._fail(row_number, "username must be unique")
+                continue
+            if values['email'] in taken_emails or values['email'] in self.seen_emails:
+                self._fail(row_number, "email must be unique")
+                continue
+            self.seen_usernames.add(values['username'])
+            self.seen_emails.add(values['email'])
+            valid.append((row_number, values, extra_fields))
+
+        if not valid:
+            return
+
+        try:
+            user_ids = db.session.execute(
+                insert(User).returning(User.id, sort_by_parameter_order=True),
+                [values for _, values, _ in valid],
+            ).scalars().all()
+
+            db.session.execute(insert(UserExtraFields), [
+                {"user_id": user_id, "fields_data": extra_fields}
+                for user_id, (_, _, extra_fields) in zip(user_ids, valid)
+            ])
+            db.session.commit()
+            self.inserted += len(valid)
+        except IntegrityError as ie:
+            db.session.rollback()
+            for row_number, _, _ in valid:
+                self._fail(row_number, "Database integrity error: " + str(ie.orig))
+        except SQLAlchemyError as e:
+            # e.g. a DataError the row checks did not catch; earlier chunks stay committed
+            db.session.rollback()
+            error = str(getattr(e, 'orig', None) or e)
+            for row_number, _, _ in valid:
+                self._fail(row_number, "Database error: " + error)
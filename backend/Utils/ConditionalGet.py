@@ -0,0 +1,130 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import Response, current_app, request
+from sqlalchemy import distinct, func, inspect, select
+from sqlalchemy.orm import aliased
+from werkzeug.http import http_date, quote_etag
+
+from Utils.Instrumentation import measure_serialization
+from Utils.JsonResponse import encode
+from extensions import db
+
+MAX_CACHED_BODIES = 128
+
+_queries = {}
+_bodies = OrderedDict()
+_lock = threading.Lock()
+
+
+def _watermark_query(model, schema):
+    """
+    One aggregate over the model and every relationship its serializer nests
+    (outer joined on their keys): row count, max(id) and max(updated_at) per
+    table. Any insert, update or delete that shows up in the body moves it.
+    """
+    key = (model, schema)
+    if key in _queries:
+        return _queries[key]
+
+    root = aliased(model)
+    entities, joins = [(root, model)], []
+    pending = [(root, model, schema)]
+    while pending:
+        entity, entity_model, entity_schema = pending.pop(0)
+        for name in getattr(entity_schema, 'EAGER_LOAD', []):
+            if name not in entity_schema.fields:
+                continue
+            target_model = inspect(entity_model).relationships[name].mapper.class_
+            target = aliased(target_model)
+            joins.append(getattr(entity, name).of_type(target))
+            entities.append((target, target_model))
+            pending.append((target, target_model, entity_schema.fields[name].schema))
+
+    columns = []
+    for entity, entity_model in entities:
+        columns += [func.count(distinct(entity.id)), func.max(entity.id)]
+        if hasattr(entity_model, 'updated_at'):
+            columns.append(func.max(entity.updated_at))
+
+    query = select(*columns).select_from(root)
+    for join in joins:
+        query = query.outerjoin(join)
+    _queries[key] = query
+    return query
+
+
+def _not_modified(etag, last_modified):
+    # If-None-Match wins over If-Modified-Since when both are sent
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _cached_body(etag):
+    with _lock:
+        body = _bodies.get(etag)
+        if body is not None:
+            _bodies.move_to_end(etag)
+        return body
+
+
+def _cache_body(etag, body):
+    with _lock:
+        _bodies[etag] = body
+        while len(_bodies) > MAX_CACHED_BODIES:
+            _bodies.popitem(last=False)
+
+
+def conditional_get(model, serializer):
+    """
+    Answer a list GET with ETag/Last-Modified validators taken from the
+    tables' watermarks, without loading any row:
+
+    - 304 Not Modified when If-None-Match (or If-Modified-Since) still matches,
+    - otherwise the encoded body cached for that ETag when there is one,
+    - otherwise the resource's own response, encoded and cached.
+
+    The ETag covers the path and query string, so filters, sorting, paging
+    and projections each get their own. Error responses are passed through.
+    """
+    def decorator(get):
+        @wraps(get)
+        def wrapper(*args, **kwargs):
+            try:
+                watermark = tuple(db.session.execute(_watermark_query(model, serializer)).one())
+            except Exception as e:
+                print(e)
+                db.session.rollback()
+                return get(*args, **kwargs)
+
+            etag = hashlib.sha1(repr((request.full_path, watermark)).encode()).hexdigest()
+            modified = [value for value in watermark if isinstance(value, datetime)]
+            last_modified = max(modified).replace(microsecond=0, tzinfo=timezone.utc) if modified else None
+
+            headers = {'ETag': quote_etag(etag), 'Cache-Control': 'no-cache'}
+            if last_modified:
+                headers['Last-Modified'] = http_date(last_modified)
+
+            if _not_modified(etag, last_modified):
+                return Response(status=304, headers=headers)
+
+            body = _cached_body(etag)
+            if body is None:
+                response = get(*args, **kwargs)
+                data, code = response[:2] if isinstance(response, tuple) else (response, 200)
+                if code != 200:
+                    return response
+                with measure_serialization():
+                    body = encode(data, current_app.debug)
+                _cache_body(etag, body)
+            return body, 200, headers
+
+        return wrapper
+
+    return decorator
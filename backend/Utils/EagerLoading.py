@@ -0,0 +1,37 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+_options_cache = {}
+
+
+def eager_load_options(schema, model=None, cache=True):
+    """
+    Build loader options from the EAGER_LOAD relationships a serializer
+    declares, following its nested serializers.
+
+    Collections are loaded with selectinload (one extra query per level),
+    scalar relationships are joined into the parent query. Pass cache=False
+    for short lived schemas so they are not kept alive by the cache.
+    """
+    model = model or schema.opts.model
+    key = (schema, model)
+    if cache and key in _options_cache:
+        return _options_cache[key]
+
+    options = []
+    for name in getattr(schema, 'EAGER_LOAD', []):
+        if name not in schema.fields:
+            continue
+
+        relationship = inspect(model).relationships[name]
+        attribute = getattr(model, name)
+        loader = selectinload(attribute) if relationship.uselist else joinedload(attribute)
+
+        nested_options = eager_load_options(schema.fields[name].schema, relationship.mapper.class_, cache)
+        if nested_options:
+            loader = loader.options(*nested_options)
+        options.append(loader)
+
+    if cache:
+        _options_cache[key] = options
+    return options
@@ -0,0 +1,103 @@
+import datetime as dt
+import weakref
+
+from marshmallow import fields, missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+
+_compiled = weakref.WeakKeyDictionary()
+
+# field types whose marshmallow _serialize is a plain conversion of a non None value
+_CONVERTERS = {
+    fields.Integer: 'int',
+    fields.Float: 'float',
+    fields.String: 'str',
+    fields.Raw: None,
+}
+_ISO_FORMATS = (None, 'iso', 'iso8601')
+
+
+def _expression(name, field, namespace, value):
+    """
+    Python source computing the dumped value of one field from `value`,
+    or None when the field has to go through marshmallow.
+    """
+    field_type = type(field)
+    if field_type in _CONVERTERS:
+        converter = _CONVERTERS[field_type]
+        if converter is None:
+            return value
+        if field_type in (fields.Integer, fields.Float) and field.as_string:
+            return None
+        return f"None if {value} is None else {converter}({value})"
+
+    if field_type in (fields.DateTime, fields.Date) and field.format in _ISO_FORMATS:
+        function = 'datetime_isoformat' if field_type is fields.DateTime else 'date_isoformat'
+        return f"None if {value} is None else {function}({value})"
+
+    if field_type is fields.Nested:
+        dumper = f"dump_{name}"
+        namespace[dumper] = compile_dumper(field.schema)
+        if field.many:
+            return f"None if {value} is None else [{dumper}(item) for item in {value}]"
+        return f"None if {value} is None else {dumper}({value})"
+
+    # anything else (enums, booleans, custom fields) keeps marshmallow's own conversion
+    serializer = f"serialize_{name}"
+    namespace[serializer] = field._serialize
+    return f"{serializer}({value}, {name!r}, obj)"
+
+
+def compile_dumper(schema):
+    """
+    Compile a schema into one generated function obj -> dict producing the
+    same dict as schema.dump(obj) for a single object, without marshmallow's
+    per field dispatch. Fields are emitted in dump order, so the encoded JSON
+    is byte for byte the same.
+    """
+    dumper = _compiled.get(schema)
+    if dumper:
+        return dumper
+
+    if schema._hooks[PRE_DUMP] or schema._hooks[POST_DUMP]:
+        # dump processors work on marshmallow's own output, leave those schemas alone
+        dumper = _compiled[schema] = lambda obj: schema.dump(obj, many=False)
+        return dumper
+
+    namespace = {
+        'datetime_isoformat': dt.datetime.isoformat,
+        'date_isoformat': dt.date.isoformat,
+        'missing': missing,
+    }
+    lines, items, absent = [], [], []
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        attribute = field.attribute or name
+        key = field.data_key or name
+        value = f"v{index}"
+        expression = None if '.' in attribute else _expression(f"f{index}", field, namespace, value)
+        if expression is None:
+            namespace[f"field{index}"] = field
+            lines.append(f"    {value} = field{index}.serialize({name!r}, obj)")
+            items.append(f"        {key!r}: {value},")
+            absent.append(f"    if {value} is missing:\n        del data[{key!r}]")
+            continue
+        lines.append(f"    {value} = obj.{attribute}")
+        items.append(f"        {key!r}: {expression},")
+
+    source = "\n".join(["def dump(obj):", *lines, "    data = {", *items, "    }", *absent, "    return data", ""])
+    exec(compile(source, f"<fast dump {type(schema).__name__}>", "exec"), namespace)
+    dumper = namespace['dump']
+    _compiled[schema] = dumper
+    return dumper
+
+
+def dump(schema, data):
+    """
+    schema.dump(data) through the compiled dumper, for schemas that opt in
+    with FAST_DUMP = True; other schemas go through marshmallow as usual.
+    """
+    if not getattr(schema, 'FAST_DUMP', False):
+        return schema.dump(data)
+    dumper = compile_dumper(schema)
+    if schema.many:
+        return [dumper(obj) for obj in data]
+    return dumper(data)
@@ -0,0 +1,185 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500)
+
+METRICS_PATH = '/metrics'
+SLOW_STATEMENT_SECONDS = 0.5
+
+logger = logging.getLogger(__name__)
+
+# name -> (help text, buckets)
+HISTOGRAMS = {
+    'hms_request_duration_seconds': ("Total time spent handling the request", DURATION_BUCKETS),
+    'hms_db_duration_seconds': ("Time spent executing SQL statements per request", DURATION_BUCKETS),
+    'hms_db_slowest_statement_seconds': ("Slowest SQL statement per request", DURATION_BUCKETS),
+    'hms_db_statements': ("Number of SQL statements executed per request", STATEMENT_BUCKETS),
+    'hms_serialization_duration_seconds': ("Time spent serializing response data per request", DURATION_BUCKETS),
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    def render(self, name, route):
+        lines = []
+        for bound, count in zip(self.buckets, self.counts):
+            lines.append(f'{name}_bucket{{route="{route}",le="{bound}"}} {count}')
+        lines.append(f'{name}_bucket{{route="{route}",le="+Inf"}} {self.count}')
+        lines.append(f'{name}_sum{{route="{route}"}} {self.sum}')
+        lines.append(f'{name}_count{{route="{route}"}} {self.count}')
+        return lines
+
+
+class RouteMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def _histogram(self, name, route):
+        key = (name, route)
+        if key not in self._histograms:
+            self._histograms[key] = Histogram(HISTOGRAMS[name][1])
+        return self._histograms[key]
+
+    def observe(self, route, values):
+        with self._lock:
+            for name, value in values.items():
+                self._histogram(name, route).observe(value)
+
+    def render(self, routes):
+        lines = []
+        with self._lock:
+            for name, (help_text, _) in HISTOGRAMS.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for route in routes:
+                    lines.extend(self._histogram(name, route).render(name, route))
+        return '\n'.join(lines) + '\n'
+
+
+metrics = RouteMetrics()
+
+
+def _request_stats():
+    if not has_request_context():
+        return None
+    return g.get('sql_stats')
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append((context, time.perf_counter()))
+
+
+@event.listens_for(Engine, 'handle_error')
+def _handle_error(exception_context):
+    # a failed statement never reaches after_cursor_execute, drop its start time
+    # so the stack on the pooled connection does not grow with every error
+    connection = exception_context.connection
+    if connection is None or connection.closed:
+        return
+    started = connection.info.get('query_start_time')
+    if started and started[-1][0] is exception_context.execution_context:
+        started.pop()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start_time'].pop()[1]
+    stats = _request_stats()
+    if stats is None:
+        return
+
+    stats['statements'] += 1
+    stats['db_time'] += elapsed
+    if elapsed > stats['slowest']:
+        stats['slowest'] = elapsed
+        stats['slowest_statement'] = statement
+
+
+@contextmanager
+def measure_serialization():
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _request_stats()
+        if stats is not None:
+            stats['serialization_time'] += time.perf_counter() - started
+
+
+def _route():
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+
+def _start_request():
+    g.sql_stats = {
+        'started': time.perf_counter(),
+        'statements': 0,
+        'db_time': 0.0,
+        'slowest': 0.0,
+        'slowest_statement': None,
+        'serialization_time': 0.0,
+    }
+
+
+def _finish_request(response):
+    stats = g.pop('sql_stats', None)
+    if stats is None or request.path == METRICS_PATH:
+        return response
+
+    total = time.perf_counter() - stats['started']
+    if stats['slowest'] >= SLOW_STATEMENT_SECONDS:
+        logger.warning("Slow statement on %s (%.3fs): %s", request.path, stats['slowest'], stats['slowest_statement'])
+
+    response.headers['Server-Timing'] = ', '.join([
+        f'db;dur={stats["db_time"] * 1000:.2f};desc="{stats["statements"]} statements"',
+        f'db-slowest;dur={stats["slowest"] * 1000:.2f}',
+        f'serialize;dur={stats["serialization_time"] * 1000:.2f}',
+        f'total;dur={total * 1000:.2f}',
+    ])
+
+    metrics.observe(_route(), {
+        'hms_request_duration_seconds': total,
+        'hms_db_duration_seconds': stats['db_time'],
+        'hms_db_slowest_statement_seconds': stats['slowest'],
+        'hms_db_statements': stats['statements'],
+        'hms_serialization_duration_seconds': stats['serialization_time'],
+    })
+    return response
+
+
+def init_instrumentation(app):
+    """
+    Record SQL statement count/time and serialization time for every request,
+    report them in a Server-Timing header and expose per route histograms on
+    /metrics in the Prometheus text format.
+    """
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+    def metrics_view():
+        routes = sorted({rule.rule for rule in app.url_map.iter_rules()
+                         if rule.endpoint != 'static' and rule.rule != METRICS_PATH})
+        return Response(metrics.render(routes + ['unmatched']), mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule(METRICS_PATH, 'metrics', metrics_view)
@@ -0,0 +1,75 @@
+import enum
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from flask import Response, current_app, make_response
+
+from Utils.Instrumentation import measure_serialization
+
+try:
+    import orjson
+except ImportError:  # fall back to the standard library encoder
+    orjson = None
+
+# lists with at least this many items are sent as a stream of encoded chunks
+STREAM_MIN_ITEMS = 2000
+STREAM_CHUNK_ITEMS = 500
+
+
+class Encoded(bytes):
+    """
+    A JSON body encoded ahead of time (see encode()). Resources can return it
+    instead of data, e.g. from a cache, and it is sent without re-encoding.
+    """
+
+
+def _default(value):
+    # orjson handles datetimes and enums itself, the stdlib encoder needs all of these
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode(data, indent=False):
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return Encoded(orjson.dumps(data, default=_default, option=option))
+    if indent:
+        return Encoded(json.dumps(data, default=_default, indent=2).encode())
+    return Encoded(json.dumps(data, default=_default, separators=(',', ':')).encode())
+
+
+def _stream(items, indent):
+    # one JSON array built from arrays of STREAM_CHUNK_ITEMS, without their brackets
+    yield b'['
+    for start in range(0, len(items), STREAM_CHUNK_ITEMS):
+        chunk = encode(items[start:start + STREAM_CHUNK_ITEMS], indent)
+        yield (b',' if start else b'') + chunk[1:-1]
+    yield b']\n'
+
+
+def output_json(data, code, headers=None):
+    """
+    JSON representation for the Api: orjson when installed (stdlib json
+    otherwise), large lists streamed in chunks and Encoded bodies passed
+    through as they are.
+    """
+    indent = current_app.debug
+    if isinstance(data, Encoded):
+        response = make_response(bytes(data), code)
+    elif isinstance(data, list) and len(data) >= STREAM_MIN_ITEMS:
+        response = Response(_stream(data, indent), code)
+    else:
+        with measure_serialization():
+            body = encode(data, indent)
+        response = make_response(body + b'\n', code)
+
+    response.headers.extend(headers or {})
+    return response
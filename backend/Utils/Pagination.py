@@ -0,0 +1,231 @@
+import base64
+import enum
+import json
+from datetime import date, datetime, time, timedelta
+
+from flask import request
+from sqlalchemy import and_, inspect, or_
+
+from Utils.EagerLoading import eager_load_options
+from Utils.FastSerializer import dump
+from Utils.Instrumentation import measure_serialization
+from Utils.Projection import projection
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+PAGINATION_ARGS = ('limit', 'cursor')
+
+
+def encode_cursor(values):
+    raw = json.dumps([value.isoformat() if isinstance(value, (datetime, date, time)) else value
+                      for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        raise ValueError("cursor is not valid")
+    if not isinstance(values, list):
+        raise ValueError("cursor is not valid")
+    return values
+
+
+def coerce_value(column, raw):
+    """
+    Convert a query string value into the python type of the given column.
+    """
+    python_type = column.type.python_type
+    try:
+        if python_type is bool:
+            if str(raw).lower() in ('true', '1', 'yes'):
+                return True
+            if str(raw).lower() in ('false', '0', 'no'):
+                return False
+            raise ValueError()
+        if issubclass(python_type, enum.Enum):
+            return python_type[str(raw).upper()]
+        if python_type is datetime:
+            return datetime.fromisoformat(raw)
+        if python_type is date:
+            return date.fromisoformat(raw[:10])
+        if python_type is time:
+            return time.fromisoformat(raw)
+        return python_type(raw)
+    except Exception:
+        raise ValueError(f"{column.key} has an invalid value '{raw}'")
+
+
+def parse_limit(args):
+    limit = args.get('limit', DEFAULT_LIMIT)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be greater than 0")
+    return min(limit, MAX_LIMIT)
+
+
+def apply_filters(query, model, args=None):
+    """
+    Apply the model's whitelisted FILTER_FIELDS from the query string.
+    Comma separated values are turned into an IN (...) filter.
+    """
+    args = request.args if args is None else args
+    for field in getattr(model, 'FILTER_FIELDS', []):
+        raw = args.get(field)
+        if raw is None or raw == '':
+            continue
+        column = getattr(model, field)
+        values = [coerce_value(column, value) for value in raw.split(',')]
+        query = query.filter(column == values[0] if len(values) == 1 else column.in_(values))
+    return query
+
+
+def parse_range(args, field='from'):
+    """
+    Parse a from/to query string value. A bare date given as `to` covers the whole day.
+    """
+    raw = args.get(field)
+    if not raw:
+        return None
+    try:
+        value = datetime.fromisoformat(raw)
+    except ValueError:
+        raise ValueError(f"{field} must be an ISO date or datetime")
+    if field == 'to' and len(raw) == 10:
+        value += timedelta(days=1)
+    return value
+
+
+def apply_range(query, model, args=None):
+    """
+    Restrict the model's DATE_RANGE_FIELD to from <= value < to.
+    """
+    args = request.args if args is None else args
+    field = getattr(model, 'DATE_RANGE_FIELD', None)
+    if not field:
+        return query
+    column = getattr(model, field)
+    start, end = parse_range(args, 'from'), parse_range(args, 'to')
+    if start:
+        query = query.filter(column >= start)
+    if end:
+        query = query.filter(column < end)
+    return query
+
+
+def parse_sort(model, args=None):
+    args = request.args if args is None else args
+    sort = args.get('sort') or 'id'
+    descending = sort.startswith('-')
+    field = sort.lstrip('-')
+
+    if field not in getattr(model, 'SORT_FIELDS', ['id']):
+        raise ValueError(f"sort must be one of {getattr(model, 'SORT_FIELDS', ['id'])}")
+    return field, descending
+
+
+def apply_sort(query, model, field, descending):
+    # NULLs sort as the largest value (last ascending, first descending), the
+    # Postgres default, so the (field, id) indexes still serve both directions
+    column = getattr(model, field)
+    order = column.desc() if descending else column.asc()
+    if inspect(model).columns[field].nullable:
+        order = order.nulls_first() if descending else order.nulls_last()
+    columns = [order]
+    if field != 'id':
+        columns.append(model.id.desc() if descending else model.id.asc())
+    return query.order_by(*columns)
+
+
+def apply_cursor(query, model, field, descending, cursor):
+    values = decode_cursor(cursor)
+    column = getattr(model, field)
+
+    if field == 'id':
+        if len(values) != 1:
+            raise ValueError("cursor is not valid")
+        last_id = coerce_value(model.id, values[0])
+        return query.filter(model.id < last_id if descending else model.id > last_id)
+
+    if len(values) != 2:
+        raise ValueError("cursor is not valid")
+    last_id = coerce_value(model.id, values[1])
+
+    # a page ending on a NULL continues within the NULLs, see apply_sort for their place
+    if values[0] is None:
+        if descending:
+            return query.filter(or_(column.isnot(None), and_(column.is_(None), model.id < last_id)))
+        return query.filter(column.is_(None), model.id > last_id)
+
+    last_value = coerce_value(column, values[0])
+    if descending:
+        return query.filter(or_(column < last_value, and_(column == last_value, model.id < last_id)))
+    return query.filter(or_(column > last_value, and_(column == last_value, model.id > last_id),
+                            column.is_(None)))
+
+
+def paginate(query, model, args=None):
+    """
+    Keyset paginate a query on the requested sort field (id as tie breaker).
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    args = request.args if args is None else args
+    limit = parse_limit(args)
+    field, descending = parse_sort(model, args)
+
+    if args.get('cursor'):
+        query = apply_cursor(query, model, field, descending, args.get('cursor'))
+
+    rows = apply_sort(query, model, field, descending).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.id] if field == 'id' else [getattr(last, field), last.id])
+
+    return rows, next_cursor
+
+
+def list_response(model, serializer, query=None, args=None):
+    """
+    Build the body of a list GET.
+
+    Filters and sorting are always applied and the serializer's EAGER_LOAD
+    relationships are loaded up front. With ?fields=/&expand= only those
+    columns are loaded and dumped and nested relationships are left out
+    unless expanded. When the client asks for a page (limit or cursor given)
+    the rows are keyset paginated and wrapped in an envelope with
+    next_cursor, otherwise the plain list is returned as before. Serializers
+    with FAST_DUMP = True are dumped through their compiled dumper.
+    """
+    args = request.args if args is None else args
+    query = apply_filters(model.query if query is None else query, model, args)
+    query = apply_range(query, model, args)
+
+    projected = projection(serializer, model, args)
+    if projected:
+        serializer = projected.serializer
+        query = query.options(*projected.options(model, parse_sort(model, args)[0]))
+    else:
+        query = query.options(*eager_load_options(serializer, model))
+
+    if not any(arg in args for arg in PAGINATION_ARGS):
+        field, descending = parse_sort(model, args)
+        rows = apply_sort(query, model, field, descending).all()
+        with measure_serialization():
+            return dump(serializer, rows)
+
+    rows, next_cursor = paginate(query, model, args)
+    with measure_serialization():
+        items = dump(serializer, rows)
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "limit": parse_limit(args),
+    }
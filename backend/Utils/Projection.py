@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict
+
+from marshmallow import fields as ma_fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import ColumnProperty, load_only
+
+from Utils.EagerLoading import eager_load_options
+
+MAX_CACHED_PROJECTIONS = 256
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def parse_names(args, key):
+    raw = args.get(key)
+    if not raw:
+        return None
+    return frozenset(name.strip() for name in raw.split(',') if name.strip())
+
+
+class Projection:
+    """
+    A serializer narrowed to the requested fields, with the loader options
+    that go with it: load_only on the selected columns and eager loading of
+    the expanded relationships only.
+    """
+
+    def __init__(self, serializer, model, names, expand):
+        declared = serializer.fields
+        nested = {name for name, field in declared.items() if isinstance(field, ma_fields.Nested)}
+
+        unknown = sorted((names or frozenset()) - set(declared)) + sorted((expand or frozenset()) - nested)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+        # nested relationships are left out unless expanded (or named in fields=)
+        expand = (expand or frozenset()) | ((names or frozenset()) & nested)
+        if names:
+            only = (names - nested) | expand | ({'id'} & set(declared))
+        else:
+            only = (set(declared) - nested) | expand
+
+        self.serializer = type(serializer)(only=tuple(sorted(only)), many=serializer.many)
+
+        mapper = inspect(model)
+        self.columns = {name for name in only if isinstance(mapper.attrs.get(name), ColumnProperty)}
+        self.eager_options = eager_load_options(self.serializer, model, cache=False)
+
+    def options(self, model, sort_field):
+        columns = self.columns | {sort_field, 'id'}
+        attributes = [getattr(model, name) for name in sorted(columns) if hasattr(model, name)]
+        return [load_only(*attributes), *self.eager_options]
+
+
+def projection(serializer, model, args):
+    """
+    The Projection for `?fields=a,b&expand=rel` or None when neither is given,
+    cached per serializer and field set.
+    """
+    names, expand = parse_names(args, 'fields'), parse_names(args, 'expand')
+    if names is None and expand is None:
+        return None
+
+    key = (id(serializer), model, names, expand)
+    with _lock:
+        cached = _cache.get(key)
+        if cached:
+            _cache.move_to_end(key)
+            return cached
+
+    projected = Projection(serializer, model, names, expand)
+    with _lock:
+        _cache[key] = projected
+        while len(_cache) > MAX_CACHED_PROJECTIONS:
+            _cache.popitem(last=False)
+    return projected
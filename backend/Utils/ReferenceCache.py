@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import namedtuple
+
+from flask import g, has_request_context
+
+from Models.Shifts import Shifts
+from Models.UserType import UserType
+from extensions import db
+
+CACHE_TTL_SECONDS = 300
+
+UserTypeRef = namedtuple('UserTypeRef', ['id', 'type', 'is_active'])
+ShiftRef = namedtuple('ShiftRef', ['id', 'name', 'start_time', 'end_time'])
+
+
+class ReferenceCache:
+    """
+    Small, rarely changing tables (user types, shifts) kept in memory as plain
+    tuples so validators do not hit the database on every assignment.
+
+    The process level copy is reloaded after CACHE_TTL_SECONDS or when
+    invalidate() is called by the resource that changed the table. Within a
+    request the first snapshot taken is reused so lookups stay consistent.
+    """
+
+    def __init__(self, name, loader):
+        self.name = name
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._entries = None
+        self._loaded_at = 0
+
+    def _load(self):
+        with db.session.no_autoflush:
+            entries = {ref.id: ref for ref in self._loader()}
+        self._entries = entries
+        self._loaded_at = time.monotonic()
+        return entries
+
+    def _process_entries(self, reload=False):
+        with self._lock:
+            if reload or self._entries is None or time.monotonic() - self._loaded_at > CACHE_TTL_SECONDS:
+                return self._load()
+            return self._entries
+
+    def _snapshot(self, reload=False):
+        if not has_request_context():
+            return self._process_entries(reload)
+
+        key = f'reference_cache_{self.name}'
+        snapshots = g.setdefault(key, {})
+        if reload and not snapshots.get('reloaded'):
+            snapshots['entries'] = self._process_entries(reload=True)
+            snapshots['reloaded'] = True
+        elif 'entries' not in snapshots:
+            snapshots['entries'] = self._process_entries()
+        return snapshots['entries']
+
+    def get(self, ref_id):
+        if ref_id is None:
+            return None
+        entries = self._snapshot()
+        if ref_id not in entries:
+            # Possibly created by another process since the last load, reload once per request.
+            entries = self._snapshot(reload=True)
+        return entries.get(ref_id)
+
+    def all(self):
+        return list(self._snapshot().values())
+
+    def invalidate(self):
+        with self._lock:
+            self._entries = None
+        if has_request_context():
+            g.pop(f'reference_cache_{self.name}', None)
+
+
+def _load_user_types():
+    return [UserTypeRef(*row) for row in db.session.query(UserType.id, UserType.type, UserType.is_active)]
+
+
+def _load_shifts():
+    return [ShiftRef(*row) for row in
+            db.session.query(Shifts.id, Shifts.name, Shifts.start_time, Shifts.end_time)]
+
+
+user_types = ReferenceCache('user_types', _load_user_types)
+shifts = ReferenceCache('shifts', _load_shifts)
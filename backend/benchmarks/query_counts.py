@@ -0,0 +1,99 @@
+"""
+Check that the list endpoints run a fixed number of SQL statements however
+many rows they return (nested relationships eager loaded, no N+1).
+
+The tables are created in, and dropped from, a scratch Postgres database,
+so never point this at a real one. Run from backend/:
+
+    python -m benchmarks.query_counts --database-url postgresql://localhost/hms_check
+"""
+import argparse
+import os
+import re
+
+# statements per request, counted by Utils/Instrumentation (Server-Timing)
+EXPECTED_STATEMENTS = {
+    '/users': 1,
+    '/orders': 2,
+    '/invoice-details': 2,
+    '/lab-requests': 1,
+}
+SIZES = (5, 30)
+
+STATEMENTS = re.compile(r'desc="(\d+) statements"')
+
+
+def _post(client, path, body):
+    response = client.post(path, json=body)
+    if response.status_code != 201:
+        raise SystemExit(f"POST {path} failed with {response.status_code}: {response.get_json()}")
+    return response.get_json()
+
+
+def seed(client, start, end):
+    """Create patients start..end-1, each with one order (and invoice) and one lab request."""
+    for index in range(start, end):
+        patient = _post(client, '/users', {
+            "name": f"Patient {index}", "phone_no": 9000000000 + index, "date_of_birth": "1990-01-01",
+            "age": 35, "gender": "MALE", "address": {"city": "Check"}, "username": f"patient{index}",
+            "email": f"patient{index}@example.com", "user_type_id": 1,
+        })
+        _post(client, '/orders', {"user_id": patient["id"], "created_by": patient["id"],
+                                  "items": [{"medicine_id": 1, "quantity": 1, "order_date": "2025-01-01"}]})
+        _post(client, '/lab-requests', {"patient_id": patient["id"], "requested_by": patient["id"], "test_id": 1})
+
+
+def statements(client, path):
+    response = client.get(path)
+    if response.status_code != 200:
+        raise SystemExit(f"GET {path} failed with {response.status_code}: {response.get_json()}")
+    return int(STATEMENTS.search(response.headers['Server-Timing']).group(1)), len(response.get_json())
+
+
+def check(client):
+    """Seed the reference rows, then count statements per list at every size."""
+    _post(client, '/user-types', {"type": "patient", "description": "Patients"})
+    _post(client, '/medicines', {"name": "Paracetamol"})
+    _post(client, '/medicine-stock', {"medicine_id": 1, "quantity": 1000, "batch_no": "CHECK",
+                                      "expiry_date": "2099-12-31", "price": 2.5})
+    _post(client, '/lab-tests', {"name": "CBC", "price": 10.0, "is_available": True})
+
+    failures, seeded = [], 0
+    for size in SIZES:
+        seed(client, seeded, size)
+        seeded = size
+        for path, expected in EXPECTED_STATEMENTS.items():
+            count, rows = statements(client, path)
+            print(f"{path:<18} {rows:3d} rows  {count} statements")
+            if count != expected:
+                failures.append(f"{path} ran {count} statements for {rows} rows, expected {expected}")
+    return failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check the statement count of the list endpoints.")
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'),
+                        help="scratch Postgres database, its tables are dropped afterwards (default: $DATABASE_URL)")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("a scratch database is required, pass --database-url")
+    os.environ['DATABASE_URL'] = args.database_url
+
+    from sqlalchemy import inspect
+
+    from app import app
+    from extensions import db
+
+    with app.app_context():
+        if inspect(db.engine).get_table_names():
+            raise SystemExit("the database is not empty, use a scratch database")
+        db.create_all()
+        try:
+            failures = check(app.test_client())
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+    if failures:
+        raise SystemExit("\n".join(failures))
+    print("statement counts do not depend on the number of rows")
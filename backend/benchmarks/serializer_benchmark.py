@@ -0,0 +1,73 @@
+"""
+Compare the compiled fast-path dumper with the Marshmallow dump of the same
+schema. Run from backend/:
+
+    python -m benchmarks.serializer_benchmark --rows 10000
+"""
+import argparse
+import decimal
+import json
+import timeit
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from marshmallow import fields
+
+from Serializers.LabRequestSerializers import LabRequestSerializer
+from Serializers.UserSerializers import UserSchema
+from Utils.FastSerializer import dump
+
+START = datetime(2024, 1, 1, 8, 30)
+
+
+def fake_value(field, index):
+    if isinstance(field, fields.Nested):
+        return fake_row(field.schema, index)
+    if isinstance(field, fields.Enum):
+        members = list(field.enum)
+        return members[index % len(members)]
+    if isinstance(field, fields.Boolean):
+        return index % 2 == 0
+    if isinstance(field, fields.Integer):
+        return index
+    if isinstance(field, fields.Decimal):
+        return decimal.Decimal(index) / 4
+    if isinstance(field, fields.Float):
+        return index / 4
+    if isinstance(field, fields.DateTime):
+        return START + timedelta(minutes=index)
+    if isinstance(field, fields.Date):
+        return date(2024, 1, 1) + timedelta(days=index % 365)
+    if isinstance(field, fields.String):
+        return None if index % 7 == 0 else f"value {index}"
+    return {"index": index, "tags": ["a", "b"]}
+
+
+def fake_row(schema, index):
+    """An object shaped like the schema's model, nested relationships included."""
+    return SimpleNamespace(**{field.attribute or name: fake_value(field, index)
+                              for name, field in schema.dump_fields.items()})
+
+
+def benchmark(schema_class, rows, repeat):
+    schema = schema_class(many=True)
+    data = [fake_row(schema, index) for index in range(rows)]
+
+    expected = json.dumps(schema.dump(data))
+    if json.dumps(dump(schema, data)) != expected:
+        raise SystemExit(f"{schema_class.__name__}: fast path output differs from marshmallow")
+
+    marshmallow = min(timeit.repeat(lambda: schema.dump(data), number=1, repeat=repeat))
+    fast = min(timeit.repeat(lambda: dump(schema, data), number=1, repeat=repeat))
+    print(f"{schema_class.__name__:<22} {rows} rows  marshmallow {marshmallow * 1000:8.1f} ms  "
+          f"fast {fast * 1000:8.1f} ms  {marshmallow / fast:5.1f}x")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the fast-path serializers against marshmallow.")
+    parser.add_argument('--rows', type=int, default=10000, help="rows per schema (default: 10000)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs, the best one is reported (default: 5)")
+    args = parser.parse_args()
+
+    for schema_class in (UserSchema, LabRequestSerializer):
+        benchmark(schema_class, args.rows, args.repeat)
@@ -0,0 +1,19 @@
+import argparse
+from datetime import date
+
+from app import app
+from Services.FinanceRollup import rebuild
+from extensions import db
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rebuild the finance rollups from the invoices.")
+    parser.add_argument('--from', dest='start', type=date.fromisoformat, default=None,
+                        help="first day to rebuild, YYYY-MM-DD (default: all history)")
+    parser.add_argument('--to', dest='end', type=date.fromisoformat, default=None,
+                        help="day to stop before, YYYY-MM-DD (default: today and later)")
+    args = parser.parse_args()
+
+    with app.app_context():
+        count = rebuild(args.start, args.end)
+        db.session.commit()
+    print(f"Rolled up {count} invoices")
@@ -0,0 +1,16 @@
+import argparse
+
+from app import app
+from Services.LabResults import BACKFILL_BATCH_SIZE, backfill
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Extract lab result analytes from existing lab reports.")
+    parser.add_argument('--all', action='store_true',
+                        help="rebuild the results of every report (default: only reports without results)")
+    parser.add_argument('--batch-size', type=int, default=BACKFILL_BATCH_SIZE,
+                        help=f"reports per transaction (default: {BACKFILL_BATCH_SIZE})")
+    args = parser.parse_args()
+
+    with app.app_context():
+        result = backfill(only_missing=not args.all, batch_size=args.batch_size)
+    print(f"Extracted {result['results']} results from {result['reports']} reports")
@@ -2,6 +2,7 @@ from flask_migrate import Migrate
 
 from app import app
 from extensions import db
+from Services.StockScanner import start_scanner
 from Models.UserType import UserType
 from Models.Shifts import Shifts
 from Models.Users import User
@@ -18,4 +19,5 @@ migrate = Migrate(app, db)
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+    start_scanner(app)
     app.run(debug=True)
@@ -0,0 +1,31 @@
+"""Added created_at indexes for list pagination
+
+Revision ID: 3c1f9a7d2e10
+Revises: 76b03943c5f4
+Create Date: 2026-10-18 10:12:41.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f9a7d2e10'
+down_revision = '76b03943c5f4'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ['user', 'appointment', 'lab_request', 'orders', 'invoice', 'medical_records', 'notification']
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(batch_op.f(f'ix_{table}_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{table}_created_at'))
@@ -0,0 +1,32 @@
+"""Added unique user date to time table
+
+Revision ID: 5b8e2f7a0d19
+Revises: 0a9d3e6c1b74
+Create Date: 2026-10-18 18:40:12.058371
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e2f7a0d19'
+down_revision = '0a9d3e6c1b74'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # keep the latest entry when a user was rostered twice on the same day
+    op.execute("""
+        DELETE FROM time_table a
+        USING time_table b
+        WHERE a.user_id = b.user_id AND a.date = b.date AND a.id < b.id
+    """)
+    with op.batch_alter_table('time_table', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_time_table_user_date', ['user_id', 'date'])
+
+
+def downgrade():
+    with op.batch_alter_table('time_table', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_time_table_user_date', type_='unique')
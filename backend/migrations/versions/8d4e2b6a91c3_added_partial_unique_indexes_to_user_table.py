@@ -0,0 +1,31 @@
+"""Added partial unique indexes to user table
+
+Revision ID: 8d4e2b6a91c3
+Revises: 3c1f9a7d2e10
+Create Date: 2026-10-18 11:02:17.518233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4e2b6a91c3'
+down_revision = '3c1f9a7d2e10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Active users with duplicate usernames/emails have to be cleaned up before this runs.
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_index('uq_user_username_active', ['username'], unique=True,
+                              postgresql_where=sa.text('is_active'))
+        batch_op.create_index('uq_user_email_active', ['email'], unique=True,
+                              postgresql_where=sa.text('is_active'))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index('uq_user_email_active', postgresql_where=sa.text('is_active'))
+        batch_op.drop_index('uq_user_username_active', postgresql_where=sa.text('is_active'))
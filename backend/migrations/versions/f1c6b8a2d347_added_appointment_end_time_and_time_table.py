@@ -0,0 +1,57 @@
+"""Added appointment end time and time table
+
+Revision ID: f1c6b8a2d347
+Revises: e7b3a9d40c52
+Create Date: 2026-10-18 17:21:06.482190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c6b8a2d347'
+down_revision = 'e7b3a9d40c52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('appointment', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('end_time', sa.DateTime(), nullable=True))
+
+    # Existing appointments get the default 30 minute length.
+    op.execute("UPDATE appointment SET end_time = appointment_date + interval '30 minutes'")
+
+    with op.batch_alter_table('appointment', schema=None) as batch_op:
+        batch_op.alter_column('end_time', existing_type=sa.DateTime(), nullable=False)
+
+    # Overlapping active appointments of a doctor have to be resolved before this runs.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.create_exclude_constraint(
+        'ex_appointment_doctor_overlap', 'appointment',
+        ('doctor_id', '='),
+        (sa.text('tsrange(appointment_date, end_time)'), '&&'),
+        using='gist',
+        where=sa.text("status <> 'Cancelled'"),
+    )
+
+    op.create_table('time_table',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('shift_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['shift_id'], ['shifts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('time_table')
+    op.drop_constraint('ex_appointment_doctor_overlap', 'appointment', type_='exclude')
+
+    with op.batch_alter_table('appointment', schema=None) as batch_op:
+        batch_op.drop_column('end_time')
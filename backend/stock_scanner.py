@@ -0,0 +1,19 @@
+import argparse
+import time
+
+from app import app
+from Services.StockScanner import scan
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Scan medicine stock for low stock and near expiry batches.")
+    parser.add_argument('--loop', type=int, default=0, metavar='SECONDS',
+                        help="keep running, scanning every SECONDS (default: scan once and exit)")
+    args = parser.parse_args()
+
+    while True:
+        with app.app_context():
+            result = scan()
+        print(f"Opened {result['alerts']} alerts, sent {result['notifications']} notifications")
+        if not args.loop:
+            break
+        time.sleep(args.loop)